@@ -0,0 +1,175 @@
+"""
+Compares the InstalledApp record against the plain dicts AppScanner used to
+produce: memory per app, parse time from registry values, and the time to
+build and refresh the app table model from each.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_app_record [app_count]
+"""
+import gc
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+from core.app_scanner import AppScanner
+from core.app_search import SEARCH_FIELDS
+from ui.app_model import InstalledAppsModel, COL_VERSION
+from benchmarks.bench_inventory import build_registry
+
+# app_search.date_key before InstalledApp: dates were strings in any of these forms
+LEGACY_DATE_FORMATS = (
+    re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$"),
+    re.compile(r"(\d{4})(\d{2})(\d{2})$"),
+    re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})$"),
+)
+_WORD = re.compile(r"\w+")
+
+
+def legacy_parse(values):
+    """The dict AppScanner._parse_values built before InstalledApp"""
+    display_name = values.get("DisplayName")
+    if not display_name:
+        return None
+    app_data = {"name": display_name}
+    app_data["version"] = values.get("DisplayVersion", "N/A")
+    app_data["publisher"] = values.get("Publisher", "Unknown")
+    install_date = values.get("InstallDate")
+    if install_date is None:
+        app_data["install_date"] = "Unknown"
+    else:
+        install_date = str(install_date)
+        if len(install_date) == 8:
+            install_date = f"{install_date[0:4]}-{install_date[4:6]}-{install_date[6:8]}"
+        app_data["install_date"] = install_date
+    app_data["uninstall_string"] = values.get("UninstallString", "")
+    size_kb = values.get("EstimatedSize")
+    app_data["size_mb"] = round(size_kb / 1024, 2) if size_kb is not None else 0
+    app_data["icon_path"] = values.get("DisplayIcon", "")
+    app_data["install_location"] = str(values.get("InstallLocation", "")).strip().strip('"')
+    app_data["icon_dir"] = AppScanner._icon_dir(app_data["icon_path"])
+    app_data["reg_key"] = "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{APP}"
+    return app_data
+
+
+class LegacyApp(dict):
+    """A legacy_parse dict, with the name attribute upsert() keys rows by"""
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self["name"]
+
+
+def legacy_date_key(install_date):
+    text = str(install_date or "").strip()
+    for i, pattern in enumerate(LEGACY_DATE_FORMATS):
+        m = pattern.match(text)
+        if m:
+            year, month, day = (m.group(3), m.group(1), m.group(2)) if i == 2 else m.groups()
+            return int(year) * 10000 + int(month) * 100 + int(day)
+    return 0
+
+
+def legacy_version_key(version):
+    parts = re.findall(r"\d+|[a-z]+", str(version or "").lower())
+    if parts == ["n", "a"]:
+        return ()
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in parts)
+
+
+def legacy_search_text(app):
+    words = []
+    for field in SEARCH_FIELDS:
+        words.extend(_WORD.findall(str(app.get(field) or "").lower()))
+    return " " + " ".join(words)
+
+
+class DictAppsModel(InstalledAppsModel):
+    """
+    InstalledAppsModel with the per-row work it did on dicts: display
+    strings, version, date and search keys all computed as each row is set.
+    Row bookkeeping, sorting and filtering are the current model's.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._versions = {}
+        self._dates = {}
+        self._icon_paths = {}
+
+    def _set_row(self, row, app, pids):
+        if pids is not None:
+            self._pids[row] = list(pids)
+        if app == self._apps[row]:
+            return
+        self._versions[row] = str(app.get('version', ''))
+        self._sizes[row] = float(app.get('size_mb', 0) or 0)
+        self._dates[row] = str(app.get('install_date', ''))
+        self._icon_paths[row] = app.get('icon_path', '')
+        self._apps[row] = app
+        self._name_keys[row] = self._names[row].casefold()
+        self._version_keys[row] = legacy_version_key(self._versions[row])
+        self._date_keys[row] = legacy_date_key(self._dates[row])
+        self._search[row] = legacy_search_text(app)
+
+
+def record_parse(values):
+    app = AppScanner._parse_values(values)
+    app.reg_key = "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall\\{APP}"
+    return app
+
+
+def measure_parse(label, parse, values):
+    """Parse time, and bytes allocated per app that are still alive afterwards"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    apps = [parse(v) for v in values]
+    elapsed = (time.perf_counter() - start) * 1000
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {elapsed:8.2f} ms parse  {size / len(apps):6.0f} B per app")
+    return apps
+
+
+def best_of(runs, fn):
+    best = None
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(app_count=10_000):
+    QApplication.instance() or QApplication(sys.argv)
+    source = build_registry(app_count)
+    values = [source.read_values(root, name) for root in source.roots() for name in source.list_subkeys(root)]
+    print(f"{len(values)} synthetic apps\n")
+
+    dicts = measure_parse("dict (before)", legacy_parse, values)
+    apps = measure_parse("InstalledApp", record_parse, values)
+    print()
+
+    dict_rows = [(LegacyApp(app), []) for app in dicts]
+    rows = [(app, []) for app in apps]
+    for label, model_class, model_rows in (("dict", DictAppsModel, dict_rows),
+                                           ("InstalledApp", InstalledAppsModel, rows)):
+        build = best_of(3, lambda: model_class().upsert(model_rows))
+        model = model_class()
+        model.upsert(model_rows)
+        refresh = best_of(3, lambda: model.upsert(model_rows))
+        first_sort = best_of(1, lambda: model.sort(COL_VERSION, Qt.AscendingOrder))
+        first_filter = best_of(1, lambda: model.set_filter('app 1'))
+        print(f"{label:<13} model build {build:8.2f} ms  refresh (unchanged) {refresh:7.2f} ms  "
+              f"first sort by version {first_sort:7.2f} ms  first filter {first_filter:6.2f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
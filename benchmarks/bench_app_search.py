@@ -0,0 +1,95 @@
+"""
+Times InstalledAppsModel filtering (per keystroke, typing queries one
+character at a time) and typed multi-key sorting on a synthetic inventory.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_app_search [app_count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QTableView
+from PySide6.QtCore import Qt
+from core.installed_app import InstalledApp, parse_install_date
+from ui.app_model import InstalledAppsModel, COL_DATE, COL_NAME, COL_SIZE, COL_VERSION
+
+WORDS = ("Microsoft", "Visual", "Studio", "Code", "Adobe", "Acrobat", "Reader", "Google", "Chrome",
+         "Mozilla", "Firefox", "Python", "Runtime", "Redistributable", "Driver", "Update", "Helper",
+         "NVIDIA", "Graphics", "Audio", "Steam", "Games", "Office", "Tools", "SDK", "Launcher")
+QUERIES = ("visual studio", "microsoft office 2", "nvidia driver", "zzz", "python 3.1")
+
+
+def synthetic_apps(count, seed=4):
+    rng = random.Random(seed)
+    apps = []
+    for i in range(count):
+        name = " ".join(rng.sample(WORDS, rng.randint(2, 4))) + f" {i}"
+        apps.append(InstalledApp(
+            name,
+            publisher=f"{rng.choice(WORDS)} Corporation",
+            version=f"{rng.randint(1, 30)}.{rng.randint(0, 12)}.{rng.randint(0, 999)}",
+            size_mb=round(rng.uniform(0, 5_000), 2),
+            install_date=parse_install_date(rng.choice((
+                f"20{rng.randint(10, 25)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+                f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/20{rng.randint(10, 25)}",
+                None))),
+        ))
+    return apps
+
+
+def type_queries(model):
+    """Worst and average ms per keystroke over QUERIES, plus the final match counts"""
+    times, counts = [], []
+    for query in QUERIES:
+        for i in range(1, len(query) + 1):
+            start = time.perf_counter()
+            model.set_filter(query[:i])
+            times.append((time.perf_counter() - start) * 1000)
+        counts.append(model.rowCount())
+        # Backspacing to empty is a non-narrowing change at every step
+        for i in range(len(query) - 1, -1, -1):
+            start = time.perf_counter()
+            model.set_filter(query[:i])
+            times.append((time.perf_counter() - start) * 1000)
+    return max(times), sum(times) / len(times), counts
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+
+def main(app_count=10_000):
+    QApplication.instance() or QApplication(sys.argv)
+    apps = synthetic_apps(app_count)
+    model = InstalledAppsModel()
+    timed(f"upsert {app_count} apps (builds keys)", lambda: model.upsert([(app, []) for app in apps]))
+
+    worst, avg, counts = type_queries(model)
+    print(f"{'filter per keystroke (model only)':<40} {avg:8.2f} ms avg  {worst:6.2f} ms worst")
+    view = QTableView()
+    view.setModel(model)
+    view.resize(900, 700)
+    view.show()
+    QApplication.processEvents()
+    worst, avg, counts = type_queries(model)
+    print(f"{'filter per keystroke (with view)':<40} {avg:8.2f} ms avg  {worst:6.2f} ms worst")
+    print(f"{'':<40} matches: {dict(zip(QUERIES, counts))}\n")
+
+    timed("sort by size", lambda: model.sort(COL_SIZE, Qt.DescendingOrder))
+    timed("sort by date (then size)", lambda: model.sort(COL_DATE, Qt.AscendingOrder))
+    timed("sort by version (then date, size)", lambda: model.sort(COL_VERSION, Qt.DescendingOrder))
+    top = [model.index(r, COL_VERSION).data() for r in range(3)]
+    print(f"{'':<40} newest versions first: {top}")
+    timed("sort by name, filtered to 'microsoft'",
+          lambda: (model.set_filter("microsoft"), model.sort(COL_NAME, Qt.AscendingOrder)))
+    print(f"{'':<40} sort keys: {[(c, o.name) for c, o in model.sort_keys()]}")
+    view.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
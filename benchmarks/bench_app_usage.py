@@ -0,0 +1,162 @@
+"""
+Compares AppUsageAggregator, which only places PIDs that appeared since the
+previous pass, with regrouping every process on every pass (an install-path
+lookup and a parent walk per PID), on 1,000 synthetic processes in app
+trees with jittering memory and CPU, and a few processes starting and
+exiting per tick. Also checks both give the same per-app totals.
+Run from the project root:
+    python -m benchmarks.bench_app_usage [ticks]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app_usage import AppUsageAggregator, DEFAULT_TREE_ROOTS, MAX_TREE_DEPTH
+from core.installed_app import InstalledApp
+from core.process_matcher import InstallPathIndex
+from core.process_sampler import ProcessSample, ProcessSnapshot
+
+PROCESS_COUNT = 1000
+APP_COUNT = 60
+CHURN_PER_TICK = 10
+MB = 1024 * 1024
+
+
+class SyntheticSystem:
+    """
+    A process table: system roots, APP_COUNT apps (a root launched by
+    explorer.exe plus helpers, some of whose exe paths are unreadable),
+    svchost.exe services and unowned tools with children.
+    """
+
+    def __init__(self, seed=11):
+        self.rng = random.Random(seed)
+        self.apps = [InstalledApp(f"Vendor {i} App", install_location=f"C:\\Program Files\\Vendor{i}\\App")
+                     for i in range(APP_COUNT)]
+        self.procs = {}  # pid -> [name, exe, rss, ppid, cpu_time]
+        self.next_pid = 1000
+        self.now = 0.0
+        self._add(4, "System", None, 4, 0)
+        self._add(500, "services.exe", None, 4)
+        self._add(600, "explorer.exe", "C:\\Windows\\explorer.exe", 4)
+        self.app_roots = []
+        for i in range(APP_COUNT):
+            exe = f"C:\\Program Files\\Vendor{i}\\App\\app{i}.exe"
+            self.app_roots.append(self._spawn(f"app{i}.exe", exe, 600))
+        self.tool_roots = [self._spawn(f"tool{i}.exe", None, 600) for i in range(40)]
+        for _ in range(80):
+            self._spawn("svchost.exe", None, 500)
+        while len(self.procs) < PROCESS_COUNT:
+            self._spawn_child()
+
+    def _add(self, pid, name, exe, ppid, rss_mb=None):
+        rss = (rss_mb if rss_mb is not None else self.rng.uniform(5, 400)) * MB
+        self.procs[pid] = [name, exe, int(rss), ppid, self.rng.uniform(0, 100)]
+
+    def _spawn(self, name, exe, ppid):
+        pid = self.next_pid
+        self.next_pid += 4
+        self._add(pid, name, exe, ppid)
+        return pid
+
+    def _spawn_child(self):
+        parent = self.rng.choice(self.app_roots + self.tool_roots)
+        name, exe = self.procs[parent][:2]
+        # Renderer/helper processes whose exe path cannot be read
+        child_exe = exe if self.rng.random() < 0.5 else None
+        pid = self._spawn(name, child_exe, parent)
+        if self.rng.random() < 0.2:
+            self._spawn(name, child_exe, pid)
+
+    def tick(self, interval=1.0):
+        self.now += interval
+        for proc in self.procs.values():
+            proc[2] = max(MB, int(proc[2] * self.rng.uniform(0.98, 1.02)))
+            if self.rng.random() < 0.3:
+                proc[4] += self.rng.uniform(0, 0.5)
+        roots = set(self.app_roots) | set(self.tool_roots) | {4, 500, 600}
+        parents = {p[3] for p in self.procs.values()}
+        leaves = [pid for pid in self.procs if pid not in roots and pid not in parents]
+        for pid in self.rng.sample(leaves, min(CHURN_PER_TICK, len(leaves))):
+            del self.procs[pid]
+        for _ in range(CHURN_PER_TICK):
+            self._spawn_child()
+
+    def snapshot(self):
+        samples = [ProcessSample(pid, name, exe, rss, ppid, cpu)
+                   for pid, (name, exe, rss, ppid, cpu) in self.procs.items()]
+        return ProcessSnapshot(samples, self.now, 0.0)
+
+
+def regroup_all(index, snapshot, previous, cpu_count):
+    """Groups every process from scratch: {key: (rss, cpu_percent, count)}"""
+    roots = {name.lower() for name in DEFAULT_TREE_ROOTS}
+    totals = {}
+    for sample in snapshot:
+        p, depth, key = sample, 0, None
+        while key is None:
+            owner = index.lookup(p.exe) if p.exe else None
+            if owner is not None:
+                key = ("app", owner)
+                break
+            parent = snapshot.get(p.ppid) if p.ppid != p.pid else None
+            depth += 1
+            if parent is None or parent.name.lower() in roots or depth >= MAX_TREE_DEPTH:
+                key = ("process", p.name.lower())
+                break
+            p = parent
+        prev = previous.get(sample.pid) if previous is not None else None
+        cpu = max(0.0, sample.cpu_time - prev.cpu_time) if prev is not None and prev.name == sample.name else 0.0
+        rss, cpu_total, count = totals.get(key, (0, 0.0, 0))
+        totals[key] = (rss + sample.rss, cpu_total + cpu, count + 1)
+    interval = snapshot.taken_at - previous.taken_at if previous is not None else 0.0
+    return {key: (rss, cpu / interval / cpu_count * 100 if interval else 0.0, count)
+            for key, (rss, cpu, count) in totals.items()}
+
+
+def main(ticks=200):
+    system = SyntheticSystem()
+    usage = AppUsageAggregator(cpu_count=8)
+    usage.set_apps(system.apps)
+    index = InstallPathIndex(system.apps)
+
+    snapshots = [system.snapshot()]
+    for _ in range(ticks):
+        system.tick()
+        snapshots.append(system.snapshot())
+    print(f"{len(snapshots[0])} processes, {ticks} ticks, {CHURN_PER_TICK} exits and starts per tick\n")
+
+    start = time.perf_counter()
+    previous = None
+    for snapshot in snapshots:
+        expected = regroup_all(index, snapshot, previous, 8)
+        previous = snapshot
+    full_ms = (time.perf_counter() - start) * 1000 / len(snapshots)
+
+    start = time.perf_counter()
+    for snapshot in snapshots:
+        usage.update(snapshot)
+    incremental_ms = (time.perf_counter() - start) * 1000 / len(snapshots)
+
+    got = {u.key: (u.rss, u.cpu_percent, u.count) for u in usage.top(len(expected) + 1)}
+    same = (got.keys() == expected.keys()
+            and all(got[k][0] == expected[k][0] and got[k][2] == expected[k][2]
+                    and abs(got[k][1] - expected[k][1]) < 1e-6 for k in got))
+
+    print(f"{'regroup every process per pass':<34} {full_ms:7.3f} ms per pass")
+    print(f"{'AppUsageAggregator.update':<34} {incremental_ms:7.3f} ms per pass "
+          f"({full_ms / incremental_ms:.1f}x)")
+    print(f"{'groups':<34} {len(got)} (same totals as regrouping: {same})")
+    for u in usage.top(5):
+        print(f"    {u.name:<20} {u.rss / MB:8,.0f} MB  {u.cpu_percent:5.1f}% CPU  {u.count:3} processes")
+
+    start = time.perf_counter()
+    usage.set_apps(system.apps)
+    print(f"\n{'set_apps (regroup after a scan)':<34} {(time.perf_counter() - start) * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
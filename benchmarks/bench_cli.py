@@ -0,0 +1,88 @@
+"""
+Times the headless dustoff CLI as separate processes, the way a fleet
+collector runs it: a warm inventory cache of synthetic apps, full and
+--since runs, and the import cost of each subcommand (Qt must never load).
+Run from the project root:
+    python -m benchmarks.bench_cli [app_count]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app_cache import AppCache
+from core.app_scanner import AppInventory, UNINSTALL_ROOTS
+from benchmarks.bench_inventory import build_registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "dustoff.py")
+RUNS = 5
+
+
+def run(args, stdout_path=None):
+    """Best-of-RUNS wall time (ms), the --timings report and the output lines"""
+    best, report, lines = None, None, []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        done = subprocess.run([sys.executable, CLI, "--timings", *args], capture_output=True, text=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if done.returncode != 0:
+            raise SystemExit(done.stderr)
+        best = elapsed if best is None else min(best, elapsed)
+        report = json.loads(done.stderr.strip().splitlines()[-1])
+        lines = done.stdout.splitlines()
+    if stdout_path:
+        with open(stdout_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return best, report, lines
+
+
+def show(label, result):
+    elapsed, report, lines = result
+    print(f"{label:<30} {elapsed:8.1f} ms wall  {report['import_ms']:6.1f} ms import  "
+          f"{report['run_ms']:7.1f} ms run  {len(lines):6d} records  qt loaded: {report['qt_loaded']}")
+
+
+def main(app_count=2_000):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+    print(f"{'bare interpreter start':<30} {(time.perf_counter() - start) * 1000 / RUNS:8.1f} ms wall\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = build_registry(app_count)
+        inventory = AppInventory(source)
+        inventory.refresh()
+        cache = AppCache(os.path.join(tmp, "app_inventory.cache"))
+        cache.save({"inventory": inventory.export_state()})
+        snapshot = os.path.join(tmp, "inventory.jsonl")
+
+        show("inventory (warm cache)", run(["inventory", "--cached", "--cache", cache.path], snapshot))
+
+        # A handful of installs, upgrades and removals since the snapshot
+        for i in range(5):
+            source.set_key(UNINSTALL_ROOTS[0], f"{{NEW-{i}}}", {"DisplayName": f"New App {i}"})
+            source.delete_key(UNINSTALL_ROOTS[i % len(UNINSTALL_ROOTS)], f"{{APP-{i * 7:06d}}}")
+        source.set_key(UNINSTALL_ROOTS[1], "{APP-000001}", {"DisplayName": "Synthetic App 1",
+                                                             "DisplayVersion": "99.0"})
+        inventory.refresh()
+        cache.save({"inventory": inventory.export_state()})
+        result = run(["inventory", "--cached", "--cache", cache.path, "--since", snapshot])
+        show("inventory --since", result)
+        changes = {}
+        for line in result[2]:
+            change = json.loads(line)["change"]
+            changes[change] = changes.get(change, 0) + 1
+        print(f"{'':<30} {changes}")
+
+        show("apps (warm cache)", run(["apps", "--cached", "--cache", cache.path]))
+    show("memory", run(["memory"]))
+    show("memory --top 20", run(["memory", "--top", "20"]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
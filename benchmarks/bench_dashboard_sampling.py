@@ -0,0 +1,62 @@
+"""
+GUI-thread time per Dashboard refresh: the old inline sampling versus
+applying a sample taken by DashboardSampler on its worker thread.
+Runs against the real process table.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_dashboard_sampling [ticks]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from PySide6.QtWidgets import QApplication
+from core.system_info import SystemInfo
+from ui.dashboard import Dashboard
+
+
+def legacy_tick():
+    """What refresh_stats used to do on the GUI thread before updating widgets"""
+    SystemInfo.get_memory_info()
+    procs = []
+    for p in psutil.process_iter(['name', 'memory_info'], ad_value=None):
+        mem_info = p.info.get('memory_info')
+        if mem_info is not None and p.info.get('name') and mem_info.rss > 10 * 1024 * 1024:
+            procs.append((p.info['name'], mem_info.rss / (1024 * 1024)))
+    procs.sort(key=lambda x: x[1], reverse=True)
+    return procs[:10]
+
+
+def main(ticks=20):
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{len(psutil.pids())} processes, {ticks} ticks\n")
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        legacy_tick()
+    legacy_ms = (time.perf_counter() - start) * 1000 / ticks
+    print(f"legacy: sampling on the GUI thread    {legacy_ms:7.2f} ms/tick (plus widget updates)")
+
+    dashboard = Dashboard()
+    dashboard.stats_sampler.stop()
+    dashboard.show()
+    gui_ms = []
+    for _ in range(ticks):
+        arrived = []
+        dashboard.stats_sampler.sample_ready.connect(arrived.append)
+        dashboard.refresh_stats()
+        while not arrived:
+            # The worker runs meanwhile; only the delivered sample costs GUI time
+            app.processEvents()
+        dashboard.stats_sampler.sample_ready.disconnect(arrived.append)
+        start = time.perf_counter()
+        dashboard._apply_sample(arrived[0])
+        gui_ms.append((time.perf_counter() - start) * 1000)
+    print(f"worker: applying a finished sample    {sum(gui_ms) / ticks:7.2f} ms/tick")
+    print(f"\n{dashboard.stats_sampler.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,108 @@
+"""
+Measures what USS/PSS cost with psutil on this machine (memory_full_info
+against memory_info per process), then compares reading every process on
+every 3-second Dashboard pass with FootprintSampler's budgeted rotation:
+on the live process table, and on 1,000 simulated processes that cost as
+much to read as the live ones did. Reports time per pass and how old the
+readings of the largest processes and of all processes get.
+Run from the project root:
+    python -m benchmarks.bench_footprint_sampler [passes]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from core.footprint_sampler import FootprintSampler, DEFAULT_BUDGET_MS, DEFAULT_TOP_N, read_footprint
+from core.process_sampler import ProcessSample, ProcessSampler, ProcessSnapshot
+
+PASS_INTERVAL_S = 3.0
+SIMULATED_PROCESSES = 1000
+
+
+def per_call_ms(procs, fn, rounds=5):
+    """Average ms of fn(proc) over the processes that allow it"""
+    calls, start = 0, time.perf_counter()
+    for _ in range(rounds):
+        for proc in procs:
+            try:
+                fn(proc)
+                calls += 1
+            except psutil.Error:
+                pass
+    return (time.perf_counter() - start) * 1000 / max(calls, 1)
+
+
+def read_all_ms(procs):
+    start = time.perf_counter()
+    for proc in procs:
+        try:
+            read_footprint(proc)
+        except psutil.Error:
+            pass
+    return (time.perf_counter() - start) * 1000
+
+
+def busy_reader(cost_ms):
+    def read(pid):
+        end = time.perf_counter() + cost_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        return (pid * 4096, pid * 4096, 10, 0)
+    return read
+
+
+def simulate(passes, cost_ms, seed=3):
+    """FootprintSampler on SIMULATED_PROCESSES processes under a virtual clock"""
+    rng = random.Random(seed)
+    clock = [0.0]
+    footprint = FootprintSampler(reader=busy_reader(cost_ms), clock=lambda: clock[0])
+    procs = [ProcessSample(1000 + 4 * i, f"proc{i}.exe", None, int(rng.lognormvariate(17, 1.5)), 4, 0.0)
+             for i in range(SIMULATED_PROCESSES)]
+    top = sorted(procs, key=lambda p: p.rss, reverse=True)[:DEFAULT_TOP_N]
+    pass_ms, top_ages, all_ages = [], [], []
+    for _ in range(passes):
+        clock[0] += PASS_INTERVAL_S
+        footprint.update(ProcessSnapshot(procs, clock[0], 0.0))
+        pass_ms.append(footprint.last_ms)
+        top_ages.append(max(footprint.get(p.pid).age for p in top))
+        ages = [footprint.get(p.pid) for p in procs]
+        all_ages.append(max(a.age for a in ages) if all(ages) else float("inf"))
+    covered = next((i + 1 for i, age in enumerate(all_ages) if age != float("inf")), None)
+    return pass_ms, top_ages, all_ages[covered:] if covered else [], covered
+
+
+def main(passes=40):
+    procs = list(psutil.process_iter())
+    basic = per_call_ms(procs, lambda p: p.memory_info())
+    full = per_call_ms(procs, lambda p: p.memory_full_info())
+    print(f"{len(procs)} live processes")
+    print(f"{'memory_info per process':<36} {basic:7.3f} ms")
+    print(f"{'memory_full_info per process':<36} {full:7.3f} ms ({full / basic:.1f}x)")
+    print(f"{'read_footprint, every process':<36} {read_all_ms(procs):7.2f} ms per pass\n")
+
+    sampler = ProcessSampler()
+    footprint = FootprintSampler()
+    sampler.subscribe(footprint.update)
+    for _ in range(3):
+        sampler.sample()
+    print(f"{'live, budgeted (per pass)':<36} {footprint.stats()['avg_ms']:7.2f} ms "
+          f"({footprint.stats()['readings']} of {len(sampler.latest())} processes read)\n")
+
+    cost = max(full, 0.05)
+    print(f"{SIMULATED_PROCESSES} simulated processes at {cost:.3f} ms per read, "
+          f"a pass every {PASS_INTERVAL_S:.0f} s, {DEFAULT_BUDGET_MS} ms budget:")
+    print(f"{'read every process (per pass)':<36} {SIMULATED_PROCESSES * cost:7.2f} ms")
+    pass_ms, top_ages, all_ages, covered = simulate(passes, cost)
+    print(f"{'budgeted (per pass)':<36} {sum(pass_ms) / len(pass_ms):7.2f} ms avg  {max(pass_ms):6.2f} ms worst")
+    print(f"{'top ' + str(DEFAULT_TOP_N) + ' readings, oldest':<36} {max(top_ages):7.1f} s")
+    print(f"{'every process read after':<36} {covered} passes")
+    if all_ages:
+        print(f"{'any reading, oldest after that':<36} {max(all_ages):7.1f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
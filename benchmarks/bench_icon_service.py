@@ -0,0 +1,68 @@
+"""
+Exercises IconService scheduling and its LRU with a stub decoder, so it runs
+without Win32. Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_icon_service [requests]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImage, QColor
+from core.icon_service import IconService
+
+DECODE_MS = 2.0
+
+
+def stub_decoder(icon_path):
+    """Pretends to be ExtractIconEx: a little latency, a 32x32 image, some failures"""
+    time.sleep(DECODE_MS / 1000)
+    if "missing.exe" in icon_path:
+        return QImage()
+    image = QImage(32, 32, QImage.Format_ARGB32)
+    image.fill(QColor(hash(icon_path) & 0xFFFFFF))
+    return image
+
+
+def run(requests, paths, max_threads, max_bytes):
+    service = IconService(decoder=stub_decoder, max_bytes=max_bytes, max_threads=max_threads)
+    arrived = []
+    service.icon_ready.connect(lambda path, icon: arrived.append(path))
+    start = time.perf_counter()
+    for path in requests:
+        service.icon(path)
+    while service.stats()["pending"]:
+        QApplication.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    # Second pass: everything that survived in the LRU is a hit
+    for path in paths:
+        service.icon(path)
+    stats = service.stats()
+    service.cancel_pending()
+    service.wait()
+    return elapsed, len(arrived), stats
+
+
+def main(request_count=2_000):
+    QApplication.instance() or QApplication(sys.argv)
+    rng = random.Random(1)
+    paths = [f"C:\\Apps\\App{i}\\{'missing' if i % 20 == 0 else 'app'}.exe,0" for i in range(request_count // 2)]
+    # Every path requested twice, interleaved, to exercise de-duplication
+    requests = paths + rng.sample(paths, len(paths))
+    print(f"{len(requests)} requests over {len(paths)} paths, stub decode {DECODE_MS} ms\n")
+
+    for threads in (1, 4, 8):
+        elapsed, arrived, stats = run(requests, paths, threads, 16 * 1024 * 1024)
+        print(f"{threads} thread(s): {elapsed:8.1f} ms, {arrived} icons delivered, "
+              f"{stats['decodes']} decodes, {stats['deduplicated']} deduplicated, "
+              f"{stats['failures']} failures, {stats['hits']} hits on second pass")
+
+    elapsed, arrived, stats = run(requests, paths, 4, 200 * 4096)
+    print(f"\nsmall LRU (200 icons): {stats}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,74 @@
+"""
+Cold vs warm icon loading through IconService backed by the on-disk IconStore.
+A stub decoder stands in for ExtractIconEx; the "executables" are real temp
+files so the store can key records by file size and mtime.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_icon_store [icons]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from core.icon_service import IconService
+from core.icon_store import IconStore
+from benchmarks.bench_icon_service import stub_decoder, DECODE_MS
+
+
+def load_all(store, paths):
+    extracted = []
+
+    def decoder(path):
+        extracted.append(path)
+        return stub_decoder(path)
+
+    service = IconService(decoder=store.cached_decoder(decoder), max_threads=4)
+    start = time.perf_counter()
+    for path in paths:
+        service.request(path)
+    while service.stats()["pending"]:
+        QApplication.processEvents()
+    store.flush()
+    return (time.perf_counter() - start) * 1000, len(extracted)
+
+
+def main(icon_count=500):
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(icon_count):
+            exe = os.path.join(tmp, "apps", f"app{i}.exe")
+            os.makedirs(os.path.dirname(exe), exist_ok=True)
+            with open(exe, "wb") as f:
+                f.write(b"MZ" + bytes(i % 251))
+            paths.append(f'"{exe}",0')
+        store_dir = os.path.join(tmp, "store")
+        print(f"{icon_count} icons, stub extraction {DECODE_MS} ms each, 4 decode threads\n")
+
+        elapsed, extracted = load_all(IconStore(store_dir), paths)
+        print(f"cold start   {elapsed:8.1f} ms  {extracted} extractions")
+
+        store = IconStore(store_dir)
+        elapsed, extracted = load_all(store, paths)
+        print(f"warm start   {elapsed:8.1f} ms  {extracted} extractions  {store.stats()}")
+
+        # Rebuild a tenth of the executables: only those are extracted again
+        for path in paths[::10]:
+            exe = path.split('"')[1]
+            with open(exe, "ab") as f:
+                f.write(b"v2")
+        store = IconStore(store_dir)
+        elapsed, extracted = load_all(store, paths)
+        print(f"after update {elapsed:8.1f} ms  {extracted} extractions  {store.stats()}")
+
+        # A tight cap forces compaction down to the most recently used records
+        store = IconStore(store_dir, max_bytes=store.stats()["live_bytes"] // 2)
+        store.compact()
+        print(f"capped       {store.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,65 @@
+"""
+Benchmark for the incremental AppInventory against a synthetic in-memory registry.
+Run from the project root: python -m benchmarks.bench_inventory
+"""
+import random
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.app_scanner import AppInventory, MemoryRegistrySource, UNINSTALL_ROOTS
+
+
+def build_registry(key_count, seed=1):
+    rng = random.Random(seed)
+    source = MemoryRegistrySource()
+    for i in range(key_count):
+        root = UNINSTALL_ROOTS[i % len(UNINSTALL_ROOTS)]
+        source.set_key(root, f"{{APP-{i:06d}}}", {
+            "DisplayName": f"Synthetic App {i}",
+            "DisplayVersion": f"{rng.randint(1, 20)}.{rng.randint(0, 9)}",
+            "Publisher": f"Vendor {rng.randint(1, 200)}",
+            "InstallDate": f"20{rng.randint(10, 25)}0{rng.randint(1, 9)}1{rng.randint(0, 9)}",
+            "UninstallString": f"C:\\Program Files\\App{i}\\uninstall.exe",
+            "EstimatedSize": rng.randint(100, 2_000_000),
+            "DisplayIcon": f"C:\\Program Files\\App{i}\\app.exe,0",
+        })
+    return source
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:8.2f} ms  {result}")
+    return result
+
+
+def main(key_count=10_000):
+    source = build_registry(key_count)
+    inventory = AppInventory(source)
+
+    timed(f"full scan ({key_count} keys)", inventory.refresh)
+    timed("refresh, no changes", inventory.refresh)
+
+    # Touch 1% of keys: add, remove and update in equal measure
+    rng = random.Random(2)
+    churn = max(3, key_count // 100)
+    for i in range(churn // 3):
+        source.set_key(UNINSTALL_ROOTS[0], f"{{NEW-{i}}}", {"DisplayName": f"New App {i}"})
+    for root in UNINSTALL_ROOTS:
+        names = list(source.data[root])
+        for name in rng.sample(names, churn // 9):
+            source.delete_key(root, name)
+        for name in rng.sample(list(source.data[root]), churn // 9):
+            values = source.read_values(root, name)
+            values["DisplayVersion"] = "99.0"
+            source.set_key(root, name, values)
+
+    timed(f"refresh, ~{churn} changes", inventory.refresh)
+    print(f"apps in snapshot: {len(inventory.apps())}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
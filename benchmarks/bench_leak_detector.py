@@ -0,0 +1,166 @@
+"""
+Replays a synthetic two-hour RSS trace through LeakDetector: steady leaks
+(some below the threshold), one-off jumps, startup growth, sawtooth
+garbage-collection patterns and flat noise, plus thousands of short-lived
+PIDs. Reports which processes were flagged against the truth, how soon
+leaks were caught, the per-pass cost and the number of series kept, and
+how soon a process that was leaking before observation began is flagged.
+Run from the project root:
+    python -m benchmarks.bench_leak_detector [--write trace.jsonl]
+The written trace can be replayed headless with
+    python dustoff.py growth --replay trace.jsonl
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.leak_detector import LeakDetector, DEFAULT_RATE_MB_MIN
+
+MB = 1024 * 1024
+INTERVAL_S = 5.0
+DURATION_S = 2 * 3600
+LONG_LIVED = 200
+SHORT_LIVED_PER_PASS = 5
+
+
+def leak(rate_mb_min, start):
+    return lambda t, base, rng: base + max(0.0, t - start) / 60 * rate_mb_min + rng.gauss(0, 4)
+
+
+def step(size_mb, at):
+    return lambda t, base, rng: base + (size_mb if t >= at else 0.0) + rng.gauss(0, 3)
+
+
+def warmup(size_mb, seconds):
+    return lambda t, base, rng: base + size_mb * min(1.0, t / seconds) + rng.gauss(0, 3)
+
+
+def sawtooth(rate_mb_min, period_s):
+    return lambda t, base, rng: base + (t % period_s) / 60 * rate_mb_min + rng.gauss(0, 3)
+
+
+def flat():
+    return lambda t, base, rng: base * (1 + rng.gauss(0, 0.01))
+
+
+def build_processes(rng):
+    """
+    ({pid: (name, base_mb, shape, kind)}, {pid: time the leak starts});
+    kind "leak" marks the true leaks
+    """
+    shapes = []
+    starts = []
+    for _ in range(5):
+        starts.append(rng.uniform(0, DURATION_S / 2))
+        shapes.append(("leak", leak(rng.uniform(6, 30), starts[-1])))
+    shapes.append(("slow", leak(DEFAULT_RATE_MB_MIN * 0.4, 0)))
+    for _ in range(10):
+        shapes.append(("step", step(rng.uniform(300, 800), rng.uniform(600, DURATION_S))))
+    for _ in range(10):
+        shapes.append(("warmup", warmup(rng.uniform(200, 600), rng.uniform(60, 240))))
+    for _ in range(10):
+        shapes.append(("sawtooth", sawtooth(rng.uniform(10, 40), rng.uniform(120, 600))))
+    while len(shapes) < LONG_LIVED:
+        shapes.append(("flat", flat()))
+    procs = {1000 + 4 * i: (f"{kind}{i}.exe", rng.uniform(20, 800), shape, kind)
+             for i, (kind, shape) in enumerate(shapes)}
+    return procs, dict(zip(sorted(procs), starts))
+
+
+def trace(seed=5):
+    """Yields (t, [(pid, name, rss_bytes), ...]) per pass"""
+    rng = random.Random(seed)
+    procs, _ = build_processes(rng)
+    short = {}  # pid -> (name, rss, passes left)
+    next_pid = 100_000
+    t = 0.0
+    while t <= DURATION_S:
+        batch = [(pid, name, int(max(1.0, shape(t, base, rng)) * MB)) for pid, (name, base, shape, _) in procs.items()]
+        for _ in range(SHORT_LIVED_PER_PASS):
+            short[next_pid] = (f"short{next_pid % 7}.exe", int(rng.uniform(2, 60) * MB), rng.randint(1, 6))
+            next_pid += 4
+        for pid, (name, rss, left) in list(short.items()):
+            batch.append((pid, name, rss))
+            if left <= 1:
+                del short[pid]
+            else:
+                short[pid] = (name, rss, left - 1)
+        yield t, batch
+        t += INTERVAL_S
+
+
+def write_trace(path):
+    with open(path, "w", encoding="utf-8") as f:
+        for t, batch in trace():
+            for pid, name, rss in batch:
+                f.write(json.dumps({"t": t, "key": pid, "name": name, "rss": rss}) + "\n")
+
+
+def already_running(started):
+    """Seconds until a process leaking 10 MB/min since long before observation began is flagged"""
+    detector = LeakDetector()
+    rng = random.Random(7)
+    t = 0.0
+    while t <= DURATION_S:
+        rss = int((500 + (t + 3 * 3600) / 60 * 10 + rng.gauss(0, 4)) * MB)
+        detector.observe(t, [(1, "old.exe", rss, started)])
+        if detector.leaks():
+            return t
+        t += INTERVAL_S
+    return None
+
+
+def main(argv):
+    if argv[:1] == ["--write"] and len(argv) > 1:
+        write_trace(argv[1])
+        print(f"wrote {argv[1]}")
+        return
+
+    procs, leak_started = build_processes(random.Random(5))
+    kinds = {pid: kind for pid, (_, _, _, kind) in procs.items()}
+    detector = LeakDetector()
+    first_flagged = {}
+    max_tracked = passes = samples = 0
+    seen = set()
+    elapsed = 0.0
+    for t, batch in trace():
+        start = time.perf_counter()
+        detector.observe(t, batch)
+        elapsed += time.perf_counter() - start
+        passes += 1
+        samples += len(batch)
+        seen.update(pid for pid, _, _ in batch)
+        max_tracked = max(max_tracked, detector.stats()["tracked"])
+        for trend in detector.leaks():
+            first_flagged.setdefault(trend.key, t)
+    pids = len(seen)
+
+    print(f"{passes} passes over {DURATION_S // 3600} h, {pids} PIDs ({LONG_LIVED} long-lived)\n")
+    print(f"{'per pass':<26} {elapsed * 1000 / passes:7.3f} ms  ({elapsed * 1e6 / samples:5.2f} us per sample)")
+    print(f"{'series kept, at most':<26} {max_tracked:7}  (evicted {detector.stats()['evicted']})\n")
+
+    for kind in ("leak", "slow", "step", "warmup", "sawtooth", "flat"):
+        members = [pid for pid, k in kinds.items() if k == kind]
+        flagged = [pid for pid in members if pid in first_flagged]
+        print(f"{kind:<10} {len(flagged):3} of {len(members):3} flagged")
+    short_flagged = sum(1 for pid in first_flagged if pid not in kinds)
+    print(f"{'short':<10} {short_flagged:3} of {pids - LONG_LIVED:3} flagged")
+    delays = [first_flagged[pid] - leak_started[pid] for pid in first_flagged if kinds.get(pid) == "leak"]
+    if delays:
+        print(f"\nleaks flagged {min(delays) / 60:.1f}-{max(delays) / 60:.1f} min after they started")
+    for trend in detector.leaks():
+        print(f"    {trend.name:<14} {trend.rate_mb_min:6.1f} MB/min  R² {trend.r2:.2f}  "
+              f"for {trend.growing_s / 60:.0f} min")
+
+    # Observation starting while a process has been leaking for hours
+    for label, started in (("start time known", -3 * 3600.0), ("start time unknown", None)):
+        flagged = already_running(started)
+        print(f"{'already leaking, ' + label:<36} flagged after {flagged / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
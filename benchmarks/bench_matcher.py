@@ -0,0 +1,105 @@
+"""
+Benchmarks MatchIndex against the per-app ProcessMatcher.find_pids_for_app
+heuristic and checks that both attribute exactly the same pids, first on
+hand-written edge cases, then on the synthetic inventory.
+Run from the project root: python -m benchmarks.bench_matcher [apps] [procs]
+Edge cases only, no timing: python -m benchmarks.bench_matcher --check
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.process_matcher import ProcessMatcher, APP_PROCESS_MAPPINGS
+
+WORDS = ["studio", "player", "update", "helper", "code", "office", "reader", "service",
+         "driver", "client", "agent", "launcher", "runtime", "tools", "sync", "manager"]
+
+
+def synthetic_inventory(app_count, proc_count, seed=1):
+    rng = random.Random(seed)
+    vendors = [f"vendor{i}" for i in range(300)]
+    names = [k.title() for k in APP_PROCESS_MAPPINGS]
+    while len(names) < app_count:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        names.append(" ".join([rng.choice(vendors)] + words + [str(len(names))]).title())
+
+    procs = {}
+    candidates = list(APP_PROCESS_MAPPINGS.values()) + WORDS + vendors
+    for pid in range(proc_count):
+        name = rng.choice(candidates) if rng.random() < 0.6 else f"proc{rng.randint(0, 5000)}"
+        procs.setdefault(name, []).append(4 + pid * 4)
+    return names, procs
+
+
+# (app names, running processes) pairs covering each rule of the heuristic
+EQUIVALENCE_CASES = [
+    # Mapping rules: a hit wins over word matches; a rule whose process is
+    # not running falls through; one name can hit several rules
+    (["Google Chrome", "Firefox Developer Tools", "Notepad Calculator Pack", "Spotify"],
+     {"chrome": [10, 11], "firefox": [12], "tools": [13], "notepad": [14], "calculator": [15]}),
+    (["Visual Studio Code", "Microsoft Edge WebView2 Runtime", "VLC media player"],
+     {"code": [20], "runtime": [21], "vlc": [22]}),
+    # Multi-word names: every word that is a process name, repeated words once
+    (["Slack Helper Tools", "Sync Sync Manager", "Agent", "Reader Service Agent"],
+     {"slack": [30], "helper": [31, 32], "sync": [33], "manager": [34], "agent": [35], "service": [36]}),
+    # Names that differ only in spaces, case and whitespace runs
+    (["Note Pad", "Power Toys", "PowerToys", "Open  Office", "open office", "Open\tOffice",
+      "  Leading Space", "My App"],
+     {"notepad": [40], "powertoys": [41], "openoffice": [42], "leadingspace": [43], "my app": [44]}),
+    # Degenerate names
+    (["", "   ", "x"], {"": [50], "x": [51]}),
+]
+
+
+def check_equivalence(cases=EQUIVALENCE_CASES):
+    """Mismatches as [(app name, find_pids_for_app pids, MatchIndex pids), ...]"""
+    mismatches = []
+    for names, procs in cases:
+        indexed = ProcessMatcher.match_all(names, procs)
+        for name in names:
+            legacy = ProcessMatcher.find_pids_for_app(name, procs)
+            if set(legacy) != set(indexed[name]):
+                mismatches.append((name, sorted(legacy), sorted(indexed[name])))
+    return mismatches
+
+
+def main(app_count=2_000, proc_count=500):
+    mismatches = check_equivalence()
+    print(f"edge cases: {sum(len(names) for names, _ in EQUIVALENCE_CASES)} names, "
+          f"mismatches: {len(mismatches)}")
+    if mismatches:
+        sys.exit(f"MatchIndex disagrees with find_pids_for_app for: {mismatches}")
+
+    names, procs = synthetic_inventory(app_count, proc_count)
+    print(f"{len(names)} apps x {sum(len(p) for p in procs.values())} processes "
+          f"({len(procs)} distinct names)")
+
+    start = time.perf_counter()
+    legacy = {name: ProcessMatcher.find_pids_for_app(name, procs) for name in names}
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    indexed = ProcessMatcher.match_all(names, procs)
+    indexed_ms = (time.perf_counter() - start) * 1000
+
+    mismatches = [n for n in names if set(legacy[n]) != set(indexed[n])]
+    matched = sum(1 for pids in indexed.values() if pids)
+    print(f"find_pids_for_app per app  {legacy_ms:9.2f} ms")
+    print(f"match_all (MatchIndex)     {indexed_ms:9.2f} ms  ({legacy_ms / max(indexed_ms, 1e-6):.0f}x)")
+    print(f"apps with pids: {matched}, mismatches: {len(mismatches)}")
+    if mismatches:
+        sys.exit(f"MatchIndex disagrees with find_pids_for_app for: {mismatches[:10]}")
+
+
+if __name__ == "__main__":
+    if "--check" in sys.argv[1:]:
+        mismatches = check_equivalence()
+        if mismatches:
+            sys.exit(f"MatchIndex disagrees with find_pids_for_app for: {mismatches}")
+        print(f"MatchIndex matches find_pids_for_app on "
+              f"{sum(len(names) for names, _ in EQUIVALENCE_CASES)} edge-case names")
+    else:
+        main(*[int(a) for a in sys.argv[1:3]])
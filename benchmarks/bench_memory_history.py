@@ -0,0 +1,72 @@
+"""
+MemoryHistory append cost and footprint, downsampling cost for short and
+long windows, and Sparkline full versus incremental redraws.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_memory_history
+"""
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from core.memory_history import MemoryHistory, DEFAULT_CAPACITY
+from ui.sparkline import Sparkline
+
+
+def synthetic_samples(count, process_count=200, seed=3):
+    rng = random.Random(seed)
+    for i in range(count):
+        percent = 55 + 20 * math.sin(i / 300) + rng.uniform(-3, 3)
+        memory = {"percent": percent, "available": (100 - percent) * 160 * 1024 * 1024}
+        procs = [(1000 + (j + i // 600) % 400, f"proc{j}.exe", rng.uniform(10, 900))
+                 for j in range(process_count)]
+        yield float(i), memory, procs
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    history = MemoryHistory()
+    samples = list(synthetic_samples(2 * DEFAULT_CAPACITY))
+
+    start = time.perf_counter()
+    for t, memory, procs in samples:
+        history.record(t, memory, procs)
+    per_sample = (time.perf_counter() - start) * 1e6 / len(samples)
+    print(f"{len(samples)} samples (ring holds {DEFAULT_CAPACITY}), "
+          f"{per_sample:.1f} us per record() incl. top-N of 200 processes")
+    print(f"footprint: {history.nbytes / 1024:.0f} KB total (2 system series, "
+          f"{len(history.processes())} process series)\n")
+
+    for span in (60, 600, DEFAULT_CAPACITY):
+        start = time.perf_counter()
+        for _ in range(200):
+            factor, _, _, _, avgs = history.percent.downsample(300, span)
+        elapsed = (time.perf_counter() - start) * 1e6 / 200
+        print(f"downsample {span:5d} samples -> {len(avgs):3d} points (x{factor:<2d}) {elapsed:7.1f} us")
+
+    spark = Sparkline(history.percent, value_range=(0, 100))
+    spark.resize(300, 40)
+    spark.show()
+    app.processEvents()
+    full_start = time.perf_counter()
+    for _ in range(50):
+        spark._pixmap = None
+        spark.refresh()
+    full_ms = (time.perf_counter() - full_start) * 1000 / 50
+
+    more = synthetic_samples(600, seed=4)
+    inc_start = time.perf_counter()
+    for t, memory, procs in more:
+        history.percent.append(t + 1e6, memory["percent"])
+        spark.refresh()
+    inc_ms = (time.perf_counter() - inc_start) * 1000 / 600
+    print(f"\nsparkline full redraw {full_ms:.3f} ms, per-sample refresh {inc_ms:.3f} ms "
+          f"({spark.incremental_redraws} incremental, {spark.full_redraws} full)")
+
+
+if __name__ == "__main__":
+    main()
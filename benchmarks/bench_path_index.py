@@ -0,0 +1,56 @@
+"""
+Exercises InstallPathIndex against the real process table (via psutil) and a
+fake install-directory table built from the directories those processes run
+from. Run from the project root: python -m benchmarks.bench_path_index [lookups]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.installed_app import InstalledApp
+from core.process_matcher import InstallPathIndex, ProcessMatcher
+
+
+def fake_apps(process_exes, extra=2_000):
+    """One fake app per distinct exe directory, plus unrelated noise entries"""
+    apps = []
+    for directory in sorted({os.path.dirname(exe) for exe in process_exes.values()}):
+        apps.append(InstalledApp(f"App at {directory}", install_location=directory))
+    for i in range(extra):
+        apps.append(InstalledApp(f"Noise {i}", install_location=f"C:\\Program Files\\Noise{i}",
+                                 icon_dir=f"C:\\Program Files\\Noise{i}\\bin"))
+    return apps
+
+
+def main(lookups=10_000):
+    process_exes = ProcessMatcher.get_process_exes()
+    if not process_exes:
+        sys.exit("no readable process exe paths on this machine")
+    apps = fake_apps(process_exes)
+
+    start = time.perf_counter()
+    index = InstallPathIndex(apps)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    paths = list(process_exes.values())
+    paths = (paths * (lookups // len(paths) + 1))[:lookups]
+    start = time.perf_counter()
+    hits = sum(1 for p in paths if index.lookup(p) is not None)
+    lookup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    owned = index.attribute(process_exes)
+    attribute_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(apps)} apps -> {len(index)} indexed dirs, built in {build_ms:.2f} ms")
+    print(f"{lookups} lookups in {lookup_ms:.2f} ms ({hits} hits; generic dirs are never indexed)")
+    print(f"attributed {sum(len(p) for p in owned.values())}/{len(process_exes)} processes "
+          f"to {len(owned)} apps in {attribute_ms:.2f} ms")
+    print(f"unmatched lookup: {index.lookup('C:/Elsewhere/tool.exe')!r}, "
+          f"noise lookup: {index.lookup('c:/program files/noise7/bin/x.exe')!r}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,116 @@
+"""
+Stops spawned dummy process trees (a root Python process with children)
+the old way, terminate() on each PID in turn with no wait, and with
+ProcessTerminator. Trees: "plain" (everything exits on SIGTERM),
+"stubborn" (children ignore SIGTERM) and "supervisor" (the root ignores
+SIGTERM and respawns children as they exit). Reports what each way claimed
+and how many processes were still running a second later.
+Run from the project root (Linux or macOS):
+    python -m benchmarks.bench_process_terminator [children]
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from core.process_terminator import ProcessTerminator
+
+SCENARIOS = ("plain", "stubborn", "supervisor")
+TIMEOUT_S = 1.0
+KILL_TIMEOUT_S = 1.0
+
+DUMMY = """
+import signal, subprocess, sys, time
+role, mode, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+ignore = (mode, role) in (("stubborn", "child"), ("supervisor", "root"))
+# Set either way: an ignored signal stays ignored in the children
+signal.signal(signal.SIGTERM, signal.SIG_IGN if ignore else signal.SIG_DFL)
+if role == "child":
+    time.sleep(600)
+    sys.exit()
+children = [subprocess.Popen([sys.executable, __file__, "child", mode, "0"]) for _ in range(count)]
+while True:
+    for i, child in enumerate(children):
+        if child.poll() is not None and mode == "supervisor":
+            children[i] = subprocess.Popen([sys.executable, __file__, "child", mode, "0"])
+    time.sleep(0.05)
+"""
+
+
+def spawn_tree(script, mode, children):
+    """(Popen of the root, [psutil.Process, ...] for the whole tree once it is up)"""
+    root = subprocess.Popen([sys.executable, script, "root", mode, str(children)])
+    proc = psutil.Process(root.pid)
+    deadline = time.monotonic() + 10
+    while len(proc.children()) < children and time.monotonic() < deadline:
+        time.sleep(0.02)
+    # Let the interpreters start and install their signal handlers
+    time.sleep(0.5)
+    return root, [proc] + proc.children()
+
+
+def running(procs, root_pid):
+    """Processes of the tree, respawned children included, still running"""
+    pids = set()
+    for proc in procs + [psutil.Process(root_pid)] if psutil.pid_exists(root_pid) else procs:
+        try:
+            if proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE:
+                pids.add(proc.pid)
+                pids.update(c.pid for c in proc.children(recursive=True))
+        except psutil.Error:
+            pass
+    return len(pids)
+
+
+def old_kill(pids):
+    """AppList.kill_app before: terminate each PID, count what did not raise"""
+    killed = 0
+    for pid in pids:
+        try:
+            psutil.Process(pid).terminate()
+            killed += 1
+        except Exception:
+            pass
+    return killed
+
+
+def main(children=4):
+    with tempfile.TemporaryDirectory() as tmp:
+        script = os.path.join(tmp, "dummy.py")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(DUMMY)
+
+        print(f"root + {children} children per tree; ProcessTerminator waits {TIMEOUT_S:.0f} s, "
+              f"then {KILL_TIMEOUT_S:.0f} s after kill\n")
+        print(f"{'tree':<11} {'method':<18} {'time':>9}  {'claimed':<34} running 1 s later")
+        for mode in SCENARIOS:
+            root, tree = spawn_tree(script, mode, children)
+            start = time.perf_counter()
+            claimed = old_kill([p.pid for p in tree])
+            elapsed = (time.perf_counter() - start) * 1000
+            time.sleep(1.0)
+            print(f"{mode:<11} {'serial terminate':<18} {elapsed:7.1f} ms  "
+                  f"{f'stopped {claimed} of {len(tree)}':<34} {running(tree, root.pid)}")
+            ProcessTerminator.terminate([p.pid for p in tree], timeout_s=0.1, kill_timeout_s=2)
+            root.wait()
+
+            root, tree = spawn_tree(script, mode, children)
+            report = ProcessTerminator.terminate([root.pid], timeout_s=TIMEOUT_S, kill_timeout_s=KILL_TIMEOUT_S)
+            statuses = Counter(p.status for p in report.processes)
+            time.sleep(1.0)
+            claimed = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+            print(f"{'':<11} {'ProcessTerminator':<18} {report.duration_ms:7.1f} ms  {claimed:<34} "
+                  f"{running(tree, root.pid)}")
+            if root.poll() is None:
+                root.send_signal(signal.SIGKILL)
+            root.wait()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,102 @@
+"""
+Measures how fast the app list notices a program starting and exiting:
+an AppList over a synthetic registry, with one app installed in a temp
+directory whose executable (a copy of sleep) is spawned and then killed.
+Compares the old way of updating the Status column after a kill (a full
+load_apps() refresh) with ProcessWatcher.refresh(), and counts the cells
+each one repaints.
+Run headless from the project root (Linux or macOS):
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_process_watcher [apps]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from benchmarks.bench_inventory import build_registry
+from core.app_cache import AppCache
+from core.app_scanner import AppInventory, UNINSTALL_ROOTS
+from core.icon_store import IconStore
+from ui.app_list import AppList
+
+APP_NAME = "Sleeper"
+
+
+def wait_for(app, condition, timeout_s=10.0):
+    """ms until condition() held, processing events meanwhile"""
+    start = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - start > timeout_s:
+            raise TimeoutError("condition not met")
+        app.processEvents()
+        time.sleep(0.0005)
+    return (time.perf_counter() - start) * 1000
+
+
+def count_cells(model):
+    cells = [0]
+
+    def on_changed(top_left, bottom_right, roles=()):
+        cells[0] += (bottom_right.row() - top_left.row() + 1) * (bottom_right.column() - top_left.column() + 1)
+    model.dataChanged.connect(on_changed)
+    return cells
+
+
+def main(app_count=2000):
+    sleep = shutil.which("sleep")
+    if sleep is None:
+        print("needs a sleep executable")
+        return
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        install_dir = os.path.join(tmp, "Programs", APP_NAME)
+        os.makedirs(install_dir)
+        exe = shutil.copy(sleep, os.path.join(install_dir, "sleeper"))
+        source = build_registry(app_count)
+        source.set_key(UNINSTALL_ROOTS[0], "{SLEEPER}", {"DisplayName": APP_NAME, "InstallLocation": install_dir})
+
+        view = AppList(AppInventory(source), AppCache(os.path.join(tmp, "apps.json")),
+                       IconStore(os.path.join(tmp, "icons")))
+        view.show()
+        wait_for(app, lambda: "app_count" in view.load_stats)
+        model = view.model
+        row = model._row_of[APP_NAME]
+        print(f"{model.rowCount()} apps listed\n")
+
+        procs = [subprocess.Popen([exe, "60"]) for _ in range(2)]
+        ms = wait_for(app, lambda: len(model._pids[row]) == len(procs))
+        print(f"{'start noticed (polling)':<30} {ms:8.1f} ms  (probe every "
+              f"{view.watcher.timer.interval()} ms)")
+
+        # Old: kill_app() ended with a full refresh to update the Status column
+        cells = count_cells(model)
+        start = time.perf_counter()
+        view.load_apps()
+        wait_for(app, lambda: "app_count" in view.load_stats)
+        print(f"{'full load_apps() refresh':<30} {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"{cells[0]:6} cells repainted")
+
+        # New: the processes exit, the watcher is asked to probe at once
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+        cells[0] = 0
+        probes = view.watcher.probes
+        start = time.perf_counter()
+        view.watcher.refresh()
+        wait_for(app, lambda: not model._pids[row])
+        print(f"{'kill -> watcher.refresh()':<30} {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"{cells[0]:6} cells repainted  ({view.watcher.probes - probes} probe)")
+
+        view.watcher.set_active(False)
+        view.watcher.wait()
+        view.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
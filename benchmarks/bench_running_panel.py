@@ -0,0 +1,106 @@
+"""
+Compares rebuilding the running-apps rows on every change (the old
+Dashboard._update_running_apps) with the recycled RunningAppsPanel, on a
+synthetic process list whose memory jitters every tick.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_running_panel [ticks]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PySide6.QtCore import QObject, QEvent
+from ui.running_apps import RunningAppsPanel, TopProcessTracker, TOP_N
+
+
+class PaintCounter(QObject):
+    """Counts paint events delivered to widgets inside root"""
+
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self.paints = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and obj.isWidgetType() and self.root.isAncestorOf(obj):
+            self.paints += 1
+        return False
+
+
+def synthetic_ticks(ticks, process_count=150, seed=7):
+    """Yields per-tick [(pid, name, mb)]: a random walk of about +-1.5% per tick"""
+    rng = random.Random(seed)
+    procs = [(1000 + i, f"proc{i % 60}.exe", rng.uniform(11, 1500)) for i in range(process_count)]
+    for _ in range(ticks):
+        procs = [(pid, name, max(11.0, mb * rng.uniform(0.985, 1.015))) for pid, name, mb in procs]
+        yield procs
+
+
+def legacy_update(layout, snapshot, samples):
+    """The old rebuild: returns (new snapshot, widgets created)"""
+    top = sorted(samples, key=lambda p: p[2], reverse=True)[:TOP_N]
+    new_snapshot = [(name, round(mb, 1)) for _, name, mb in top]
+    if new_snapshot == snapshot:
+        return snapshot, 0
+    while layout.count():
+        child = layout.takeAt(0)
+        if child.widget():
+            child.widget().deleteLater()
+    for _, name, mb in top:
+        row = QWidget()
+        row_layout = QHBoxLayout(row)
+        row_layout.addWidget(QLabel(name))
+        row_layout.addWidget(QLabel(f"{mb:,.0f} MB"))
+        layout.addWidget(row)
+    layout.addStretch()
+    return new_snapshot, len(top) * 3
+
+
+def run(label, ticks, container, step):
+    app = QApplication.instance()
+    counter = PaintCounter(container)
+    app.installEventFilter(counter)
+    container.resize(300, 400)
+    container.show()
+    created = 0
+    start = time.perf_counter()
+    for samples in synthetic_ticks(ticks):
+        created += step(samples)
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    app.removeEventFilter(counter)
+    container.close()
+    print(f"{label:<8} {elapsed / ticks:7.2f} ms/tick  {created / ticks:6.1f} widgets/tick  "
+          f"{counter.paints / ticks:6.1f} paints/tick")
+
+
+def main(ticks=100):
+    QApplication.instance() or QApplication(sys.argv)
+    print(f"{ticks} ticks, top {TOP_N} of 150 jittering processes\n")
+
+    legacy = QWidget()
+    legacy_layout = QVBoxLayout(legacy)
+    state = {"snapshot": None}
+
+    def legacy_step(samples):
+        state["snapshot"], created = legacy_update(legacy_layout, state["snapshot"], samples)
+        return created
+    run("legacy", ticks, legacy, legacy_step)
+
+    panel = RunningAppsPanel()
+    tracker = TopProcessTracker()
+
+    def pooled_step(samples):
+        panel.set_rows(tracker.update(samples))
+        return 0
+    run("pooled", ticks, panel, pooled_step)
+    print(f"\npooled panel: {panel.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,39 @@
+"""
+Times main.py startup phases in separate processes, with the app list
+built after the first paint (default) and before it (--eager).
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_startup [runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+PHASES = ("import ui", "main window", "first paint", "first scan")
+
+
+def startup(extra, path):
+    subprocess.run([sys.executable, MAIN, "--exit-after-startup", "--profile-out", path, *extra],
+                   check=True, stderr=subprocess.DEVNULL)
+    with open(path, encoding="utf-8") as f:
+        return {p["name"]: p for p in json.load(f)["phases"]}
+
+
+def main(runs=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.json")
+        for label, extra in (("deferred app list", []), ("eager (--eager)", ["--eager"])):
+            results = [startup(extra, path) for _ in range(runs)]
+            best = {}
+            for name in PHASES:
+                # Instants are reported by when they happened, phases by when they ended
+                best[name] = min(r[name]["end_ms"] for r in results)
+            print(f"{label:<20} " + "  ".join(f"{name} {best[name]:6.1f} ms" for name in PHASES))
+    print("\n(milliseconds since main.py started, best of", runs, "runs)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,50 @@
+"""
+Compares AppList startup with and without the persisted inventory cache.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_startup_cache
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from core.app_cache import AppCache
+from core.app_scanner import AppInventory
+from ui.app_list import AppList
+from benchmarks.bench_inventory import build_registry
+
+
+def startup(source, cache):
+    start = time.perf_counter()
+    widget = AppList(inventory=AppInventory(source), cache=cache)
+    elapsed = (time.perf_counter() - start) * 1000
+    # Let the background refresh finish so the cache is (re)written
+    while widget.pipeline.is_running():
+        QApplication.processEvents()
+    return elapsed, widget.timings
+
+
+def main(key_count=2_000):
+    QApplication.instance() or QApplication(sys.argv)
+    source = build_registry(key_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AppCache(os.path.join(tmp, "app_inventory.cache"))
+
+        elapsed, timings = startup(source, cache)
+        print(f"cold start (no cache)  {elapsed:8.2f} ms  {timings}")
+        print(f"cache file size        {os.path.getsize(cache.path) / 1024:8.1f} KB")
+
+        elapsed, timings = startup(source, cache)
+        print(f"warm start (cache)     {elapsed:8.2f} ms  {timings}")
+
+        with open(cache.path, "r+b") as f:
+            f.seek(-4, os.SEEK_END)
+            f.write(b"\0\0\0\0")
+        print(f"corrupted cache loads  {cache.load()!r}, file kept: {os.path.exists(cache.path)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
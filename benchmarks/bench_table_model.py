@@ -0,0 +1,100 @@
+"""
+Compares the legacy QTableWidget + per-row button widgets against
+InstalledAppsModel + ActionButtonDelegate.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_table_model [app_count]
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from PySide6.QtWidgets import (QApplication, QTableWidget, QTableWidgetItem, QTableView,
+                               QPushButton, QWidget, QHBoxLayout, QStyle)
+from PySide6.QtCore import Qt
+from core.app_scanner import AppScanner
+from ui.app_model import InstalledAppsModel, ActionButtonDelegate, COL_SIZE, COL_STOP, COL_UNINSTALL
+from benchmarks.bench_inventory import build_registry
+
+
+def legacy_build(table, rows):
+    """The pre-model AppList.load_apps widget building, minus icons"""
+    table.setSortingEnabled(False)
+    table.setRowCount(0)
+    table.setRowCount(len(rows))
+    for row, (app, pids) in enumerate(rows):
+        name_item = QTableWidgetItem(app.name)
+        name_item.setData(Qt.UserRole, app)
+        table.setItem(row, 0, name_item)
+        status_item = QTableWidgetItem("🟢 Running ({})".format(len(pids)) if pids else "")
+        table.setItem(row, 1, status_item)
+        table.setItem(row, 2, QTableWidgetItem(app.version or "N/A"))
+        size_item = QTableWidgetItem()
+        size_item.setData(Qt.DisplayRole, app.size_mb or 0)
+        table.setItem(row, 3, size_item)
+        table.setItem(row, 4, QTableWidgetItem(app.install_date.isoformat() if app.install_date else "Unknown"))
+        cells = [(5, QStyle.SP_MediaStop)] if pids else []
+        for col, icon_type in cells + [(6, QStyle.SP_TrashIcon)]:
+            btn = QPushButton()
+            btn.setIcon(table.style().standardIcon(icon_type))
+            btn.setFixedSize(30, 24)
+            btn.setStyleSheet("QPushButton { border: 1px solid #ddd; border-radius: 4px; }")
+            w = QWidget()
+            l = QHBoxLayout(w)
+            l.setContentsMargins(0, 0, 0, 0)
+            l.addWidget(btn)
+            table.setCellWidget(row, col, w)
+    table.setSortingEnabled(True)
+
+
+def model_build(model, rows):
+    model.upsert(rows)
+
+
+def measure(label, fn):
+    gc.collect()
+    rss = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+    fn()
+    QApplication.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000
+    grown = (psutil.Process().memory_info().rss - rss) / 1024
+    print(f"{label:<34} {elapsed:9.2f} ms  {grown:9.0f} KB rss")
+    return grown
+
+
+def main(app_count=2_000):
+    QApplication.instance() or QApplication(sys.argv)
+    apps = AppScanner.get_installed_apps(build_registry(app_count))
+    rows = [(a, [1000 + i] if i % 10 == 0 else []) for i, a in enumerate(apps)]
+    print(f"{len(rows)} apps, {sum(1 for _, p in rows if p)} running\n")
+
+    table = QTableWidget(0, 7)
+    table.resize(900, 700)
+    table.show()
+    grown = measure("legacy: build", lambda: legacy_build(table, rows))
+    print(f"{'legacy: per row':<34} {grown * 1024 / len(rows):9.0f} B")
+    measure("legacy: refresh (rebuild)", lambda: legacy_build(table, rows))
+    measure("legacy: sort by size", lambda: table.sortItems(3, Qt.DescendingOrder))
+    table.close()
+    print()
+
+    model = InstalledAppsModel()
+    view = QTableView()
+    view.setModel(model)
+    for col, icon_type in ((COL_STOP, QStyle.SP_MediaStop), (COL_UNINSTALL, QStyle.SP_TrashIcon)):
+        view.setItemDelegateForColumn(col, ActionButtonDelegate(icon_type, "#fff0f0", "#ffcdd2", view))
+    view.resize(900, 700)
+    view.show()
+    grown = measure("model: build", lambda: model_build(model, rows))
+    print(f"{'model: per row':<34} {grown * 1024 / len(rows):9.0f} B")
+    measure("model: refresh (upsert)", lambda: model_build(model, rows))
+    measure("model: sort by size", lambda: model.sort(COL_SIZE, Qt.DescendingOrder))
+    view.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,105 @@
+"""
+Compares trimming policies on simulated processes: which processes get
+trimmed, how long the run takes, and how much comes straight back.
+Active processes re-fault most of what they lose, idle ones little of it.
+Run from the project root:
+    python -m benchmarks.bench_trim_policy [process_count]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.memory_opt import MemoryOptimizer
+from core.process_sampler import ProcessSample, ProcessSnapshot
+from core.trim_policy import ActivityTracker, TrimPolicy
+from benchmarks.bench_optimizer import SimulatedMemory, MB
+
+TRIM_MS = 2.0
+ACTIVE_REFAULT = 0.7
+IDLE_REFAULT = 0.1
+
+
+class ActiveSimulatedMemory(SimulatedMemory):
+    """
+    SimulatedMemory where a third of the processes keep using CPU and sizes
+    follow a long tail (most processes small, a few large)
+    """
+
+    def __init__(self, process_count):
+        super().__init__(process_count, trim_ms=TRIM_MS)
+        self.rss_by_pid = {pid: int(min(self.rng.lognormvariate(3.5, 1.3), 4000) * MB)
+                           for pid in self.rss_by_pid}
+        self.active = {pid for pid in self.rss_by_pid if self.rng.random() < 0.33}
+        self.foreground = max(self.active, key=self.rss_by_pid.get)
+        self.cpu = {pid: 1.0 for pid in self.rss_by_pid}
+
+    def tick(self):
+        for pid in self.active:
+            self.cpu[pid] += 0.5
+
+    def snapshot(self):
+        return ProcessSnapshot([ProcessSample(pid, f"proc{pid}.exe", None, rss, 1, self.cpu[pid])
+                                for pid, rss in self.rss_by_pid.items()], time.monotonic(), 0.0)
+
+    def refault_by_activity(self):
+        for pid in self.rss_by_pid:
+            share = ACTIVE_REFAULT if pid in self.active else IDLE_REFAULT
+            full = self.rss_by_pid[pid] / self.keep
+            back = int((full - self.rss_by_pid[pid]) * share)
+            self.rss_by_pid[pid] += back
+            self.free -= back
+
+
+def run(label, process_count, **kwargs):
+    memory = ActiveSimulatedMemory(process_count)
+    clock = [0.0]
+    activity = ActivityTracker(clock=lambda: clock[0])
+    activity.update(memory.snapshot())
+    memory.tick()
+    clock[0] = 120.0
+    activity.update(memory.snapshot())
+
+    policy = kwargs.pop("policy", TrimPolicy())
+    # Protect the simulated foreground app the way foreground_pid() would
+    if policy.exclude_foreground:
+        select = policy.select
+        policy.select = lambda snapshot, activity=None, foreground=None: select(snapshot, activity, memory.foreground)
+
+    report = MemoryOptimizer.optimize(memory.snapshot(), trimmer=memory, probe=memory,
+                                      policy=policy, activity=activity, **kwargs)
+    memory.refault_by_activity()
+    MemoryOptimizer.measure_refault(report, probe=memory)
+    net = (report.trimmed_bytes - report.refaulted_bytes) / MB
+    foreground_hit = any(p.pid == memory.foreground and p.ok for p in report.processes)
+    print(f"{label:<30} {report.duration_ms:8.1f} ms  {report.success_count:4d} trimmed "
+          f"{report.skipped_count:4d} skipped  {report.trimmed_bytes / MB:9,.0f} MB out "
+          f"{report.refaulted_bytes / MB:8,.0f} MB back  {net:9,.0f} MB net"
+          f"{'  (foreground trimmed)' if foreground_hit else ''}")
+    return report
+
+
+def main(process_count=400):
+    print(f"{process_count} simulated processes, {TRIM_MS} ms per trim\n")
+    trim_all = TrimPolicy(min_rss_mb=0, idle_seconds=None, exclude_names=(), exclude_foreground=False)
+    run("legacy: everything, serial", process_count, policy=trim_all, max_workers=1, time_budget_s=60)
+    run("everything, 4 threads", process_count, policy=trim_all, time_budget_s=60)
+    run("policy, serial", process_count, max_workers=1, time_budget_s=60)
+    run("policy, 4 threads", process_count, time_budget_s=60)
+    run("policy, 4 threads, 50 ms", process_count, time_budget_s=0.05)
+    run("policy, top 20 only", process_count, policy=TrimPolicy(max_processes=20))
+
+    cancel = threading.Event()
+    report = run("policy, cancelled at 25%", process_count, cancel=cancel,
+                 progress=lambda done, total: done >= total // 4 and cancel.set())
+    print(f"{'':<30} cancelled={report.cancelled}")
+
+    dry = run("dry run", process_count, dry_run=True)
+    print(f"{'':<30} would trim {len(dry.processes)} processes, expected gain "
+          f"{dry.expected_bytes / MB:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
@@ -0,0 +1,91 @@
+"""
+Counts icon extractions triggered by first paint and by scrolling when icons
+are loaded for the viewport only. Uses a stub decoder.
+Run headless from the project root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_viewport [app_count]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication, QTableView
+from core.app_scanner import AppScanner
+from core.icon_service import IconService
+from ui.app_model import InstalledAppsModel
+from ui.viewport_loader import ViewportIconLoader, SESSION_IDLE_MS
+from benchmarks.bench_inventory import build_registry
+from benchmarks import bench_icon_service
+from benchmarks.bench_icon_service import stub_decoder
+
+# Closer to a cold ExtractIconEx than the default stub latency
+bench_icon_service.DECODE_MS = 15.0
+
+
+def settle(icons, ms=0):
+    deadline = time.perf_counter() + ms / 1000
+    QApplication.processEvents()
+    while icons.stats()["pending"] or time.perf_counter() < deadline:
+        QApplication.processEvents()
+
+
+def main(app_count=2_000):
+    QApplication.instance() or QApplication(sys.argv)
+    apps = AppScanner.get_installed_apps(build_registry(app_count))
+
+    icons = IconService(decoder=stub_decoder, max_threads=2)
+    model = InstalledAppsModel(icons.lookup)
+    view = QTableView()
+    view.setModel(model)
+    view.verticalHeader().setDefaultSectionSize(32)
+    view.resize(900, 32 * 30 + 30)
+    loader = ViewportIconLoader(view, model, icons)
+    view.show()
+
+    start = time.perf_counter()
+    model.upsert([(app, []) for app in apps])
+    settle(icons)
+    print(f"{len(apps)} apps; first paint icons loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"  initial: {loader.stats()['initial']}")
+
+    # Session 1: scroll down a page at a time
+    bar = view.verticalScrollBar()
+    for _ in range(10):
+        bar.setValue(bar.value() + bar.pageStep())
+        settle(icons)
+    settle(icons, SESSION_IDLE_MS + 50)
+
+    # Session 2: fling to the bottom at one step per frame; decodes queued
+    # for rows that flew past are cancelled
+    for step in range(1, 41):
+        bar.setValue(bar.maximum() * step // 40)
+        frame_end = time.perf_counter() + 0.016
+        while time.perf_counter() < frame_end:
+            QApplication.processEvents()
+    settle(icons, SESSION_IDLE_MS + 50)
+
+    for i, session in enumerate(loader.stats()["sessions"], 1):
+        print(f"  session {i}: {session}")
+    print(f"  service: {icons.stats()}")
+
+    # A table filled while hidden (e.g. on another tab) requests nothing
+    # until it is shown
+    hidden_icons = IconService(decoder=stub_decoder, max_threads=2)
+    hidden_model = InstalledAppsModel(hidden_icons.lookup)
+    hidden_view = QTableView()
+    hidden_view.setModel(hidden_model)
+    hidden_loader = ViewportIconLoader(hidden_view, hidden_model, hidden_icons)
+    hidden_model.upsert([(app, []) for app in apps])
+    settle(hidden_icons)
+    requested = hidden_loader.stats()["initial"]["icon_requests"]
+    hidden_view.verticalHeader().setDefaultSectionSize(32)
+    hidden_view.resize(900, 32 * 30 + 30)
+    hidden_view.show()
+    settle(hidden_icons)
+    print(f"  hidden view: {requested} icon requests, "
+          f"{hidden_loader.stats()['initial']['icon_requests']} once shown")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
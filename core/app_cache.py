@@ -0,0 +1,92 @@
+import json
+import os
+import struct
+import zlib
+
+# Bump whenever the payload layout or app dict fields change
+CACHE_VERSION = 3
+CACHE_MAGIC = b"DUSTOFF\x00"
+# magic, version, crc32 of payload, payload length
+CACHE_HEADER = struct.Struct("<8sIII")
+
+
+def default_cache_dir():
+    """Per-user cache directory (%LOCALAPPDATA%\\DustOff, or ~/.cache/dustoff elsewhere)"""
+    base = os.environ.get("LOCALAPPDATA")
+    if base:
+        return os.path.join(base, "DustOff")
+    return os.path.join(os.path.expanduser("~"), ".cache", "dustoff")
+
+
+class AppCache:
+    """
+    Versioned on-disk cache of the last AppInventory snapshot.
+    The file is a fixed header followed by zlib-compressed JSON; a bad magic,
+    version, length or checksum means the file is discarded.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), "app_inventory.cache")
+
+    def load(self):
+        """Returns the cached payload dict, or None if missing or invalid"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        payload = self._decode(data)
+        if payload is None:
+            self.clear()
+        return payload
+
+    def save(self, payload):
+        """Atomically writes payload (a JSON-serializable dict)"""
+        # Only needed on writes; kept out of the headless CLI's startup
+        import tempfile
+
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, zlib.crc32(body), len(body))
+
+        directory = os.path.dirname(self.path)
+        tmp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError:
+            # e.g. the cache is held open by another instance or a scanner
+            # (Windows): don't leave a temp file behind per failed save
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _decode(data):
+        if len(data) < CACHE_HEADER.size:
+            return None
+        magic, version, crc, length = CACHE_HEADER.unpack_from(data)
+        body = data[CACHE_HEADER.size:]
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or length != len(body):
+            return None
+        if zlib.crc32(body) != crc:
+            return None
+        try:
+            payload = json.loads(zlib.decompress(body).decode("utf-8"))
+        except (zlib.error, UnicodeDecodeError, ValueError):
+            return None
+        return payload if isinstance(payload, dict) else None
@@ -1,91 +1,278 @@
-import winreg
-import datetime
+from core.installed_app import InstalledApp, parse_install_date
+
+try:
+    import winreg
+    HAS_WINREG = True
+except ImportError:
+    winreg = None
+    HAS_WINREG = False
+
+# Uninstall hives scanned, in priority order (first DisplayName wins on duplicates)
+UNINSTALL_ROOTS = [
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+]
+
+# Registry value names read for every app entry
+APP_VALUE_NAMES = (
+    "DisplayName", "DisplayVersion", "Publisher", "InstallDate",
+    "UninstallString", "EstimatedSize", "DisplayIcon", "InstallLocation",
+)
+
+
+class WinRegistrySource:
+    """Reads uninstall entries from the real Windows registry."""
+
+    def __init__(self):
+        self._hives = {}
+        if HAS_WINREG:
+            self._hives = {
+                "HKLM": winreg.HKEY_LOCAL_MACHINE,
+                "HKCU": winreg.HKEY_CURRENT_USER,
+            }
+
+    def roots(self):
+        return list(UNINSTALL_ROOTS)
+
+    def list_subkeys(self, root):
+        """
+        Returns {subkey_name: last_write_time} for every subkey of root.
+        last_write_time is the raw FILETIME value from QueryInfoKey.
+        """
+        hive, path = root
+        stamps = {}
+        if hive not in self._hives:
+            return stamps
+        try:
+            with winreg.OpenKey(self._hives[hive], path, 0, winreg.KEY_READ) as key:
+                count = winreg.QueryInfoKey(key)[0]
+                for i in range(count):
+                    try:
+                        name = winreg.EnumKey(key, i)
+                        with winreg.OpenKey(key, name) as sub_key:
+                            stamps[name] = winreg.QueryInfoKey(sub_key)[2]
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return stamps
+
+    def read_values(self, root, subkey_name):
+        """Returns {value_name: data} for the app values present on the subkey."""
+        hive, path = root
+        values = {}
+        try:
+            with winreg.OpenKey(self._hives[hive], path + "\\" + subkey_name, 0, winreg.KEY_READ) as sub_key:
+                for value_name in APP_VALUE_NAMES:
+                    try:
+                        values[value_name] = winreg.QueryValueEx(sub_key, value_name)[0]
+                    except FileNotFoundError:
+                        pass
+        except (OSError, KeyError):
+            pass
+        return values
+
+
+class MemoryRegistrySource:
+    """
+    In-memory registry used for benchmarks and for running the inventory on
+    non-Windows machines.
+    Layout: {root: {subkey_name: (last_write_time, {value_name: data})}}
+    """
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else {root: {} for root in UNINSTALL_ROOTS}
+
+    def roots(self):
+        return list(self.data.keys())
+
+    def list_subkeys(self, root):
+        return {name: entry[0] for name, entry in self.data.get(root, {}).items()}
+
+    def read_values(self, root, subkey_name):
+        entry = self.data.get(root, {}).get(subkey_name)
+        return dict(entry[1]) if entry else {}
+
+    def set_key(self, root, subkey_name, values, last_write=None):
+        """Add or overwrite a subkey, bumping its last-write time"""
+        keys = self.data.setdefault(root, {})
+        if last_write is None:
+            previous = keys.get(subkey_name)
+            last_write = previous[0] + 1 if previous else 1
+        keys[subkey_name] = (last_write, dict(values))
+
+    def delete_key(self, root, subkey_name):
+        self.data.get(root, {}).pop(subkey_name, None)
+
+
+class InventoryDiff:
+    """Result of an incremental refresh: InstalledApps added, removed and updated"""
+
+    def __init__(self, added=None, removed=None, updated=None):
+        self.added = added or []
+        self.removed = removed or []
+        self.updated = updated or []
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.updated)
+
+    def __repr__(self):
+        return (f"InventoryDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"updated={len(self.updated)})")
+
+
+class AppInventory:
+    """
+    Incremental installed-app inventory.
+    Keeps a snapshot keyed by (hive, path, subkey) together with each subkey's
+    last-write time, so a refresh only re-reads added or changed subkeys.
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else WinRegistrySource()
+        # (hive, path, subkey) -> (last_write_time, app dict or None)
+        self._entries = {}
+        # Set when a refresh changed the snapshot; cleared by whoever persists it
+        self.dirty = False
+
+    def refresh(self):
+        """
+        Re-synchronizes the snapshot with the registry source.
+        Returns an InventoryDiff describing what changed since the last refresh.
+        """
+        diff = InventoryDiff()
+        entries = {}
+        for root in self.source.roots():
+            for name, stamp in self.source.list_subkeys(root).items():
+                key = (root[0], root[1], name)
+                previous = self._entries.get(key)
+                if previous is not None and previous[0] == stamp:
+                    entries[key] = previous
+                    continue
+
+                app = AppScanner._parse_values(self.source.read_values(root, name))
+                if app is not None:
+                    app.reg_key = f"{root[0]}\\{root[1]}\\{name}"
+                entries[key] = (stamp, app)
+
+                if previous is None or previous[1] is None:
+                    if app is not None:
+                        diff.added.append(app)
+                elif app is None:
+                    diff.removed.append(previous[1])
+                else:
+                    diff.updated.append(app)
+
+        for key, (stamp, app) in self._entries.items():
+            if key not in entries and app is not None:
+                diff.removed.append(app)
+
+        self._entries = entries
+        if not diff.is_empty():
+            self.dirty = True
+        return diff
+
+    def apps(self):
+        """Returns the current snapshot as a de-duplicated list of InstalledApps"""
+        return AppScanner._dedupe(app for _, app in self._entries.values() if app is not None)
+
+    def export_state(self):
+        """Returns the snapshot as a JSON-serializable list (see AppCache)"""
+        return [[hive, path, name, stamp, app.to_dict() if app is not None else None]
+                for (hive, path, name), (stamp, app) in self._entries.items()]
+
+    def load_state(self, state):
+        """
+        Restores a snapshot produced by export_state().
+        Returns False (leaving the inventory empty) if the state is malformed.
+        """
+        entries = {}
+        try:
+            for hive, path, name, stamp, app in state:
+                entries[(hive, path, name)] = (stamp, InstalledApp.from_dict(app) if app is not None else None)
+        except (TypeError, ValueError):
+            return False
+        self._entries = entries
+        return True
+
+    def __len__(self):
+        return len(self._entries)
+
 
 class AppScanner:
     @staticmethod
-    def get_installed_apps():
+    def get_installed_apps(source=None):
         """
         Scans Windows Registry for installed applications.
-        Returns a list of dictionaries with app details.
+        Returns a list of InstalledApps.
         """
-        apps = []
-        uninstall_paths = [
-            r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
-            r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
-        ]
-        
-        # HKLM scanning
-        for path in uninstall_paths:
-            AppScanner._scan_key(winreg.HKEY_LOCAL_MACHINE, path, apps)
-            
-        # HKCU scanning (for per-user apps)
-        AppScanner._scan_key(winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall", apps)
-        
+        inventory = AppInventory(source)
+        inventory.refresh()
+        return inventory.apps()
+
+    @staticmethod
+    def _dedupe(apps):
         # Remove duplicates based on DisplayName and verify essential data
         unique_apps = {}
         for app in apps:
-            name = app.get("name")
+            name = app.name
             if name and name not in unique_apps:
                 unique_apps[name] = app
-                
+
         return list(unique_apps.values())
 
     @staticmethod
-    def _scan_key(hive, subkey_path, apps_list):
+    def _parse_values(values):
+        """
+        Builds an InstalledApp from raw registry values.
+        Returns None when the entry has no DisplayName.
+        """
+        display_name = values.get("DisplayName")
+        if not display_name:
+            return None  # Name is mandatory
+
+        # EstimatedSize is usually in KB
+        size_kb = values.get("EstimatedSize")
         try:
-            with winreg.OpenKey(hive, subkey_path, 0, winreg.KEY_READ) as key:
-                count = winreg.QueryInfoKey(key)[0]
-                for i in range(count):
-                    try:
-                        sub_key_name = winreg.EnumKey(key, i)
-                        with winreg.OpenKey(key, sub_key_name) as sub_key:
-                            try:
-                                display_name = winreg.QueryValueEx(sub_key, "DisplayName")[0]
-                            except FileNotFoundError:
-                                continue # Name is mandatory
-
-                            app_data = {"name": display_name}
-                            
-                            # Optional fields
-                            try:
-                                app_data["version"] = winreg.QueryValueEx(sub_key, "DisplayVersion")[0]
-                            except FileNotFoundError:
-                                app_data["version"] = "N/A"
-                                
-                            try:
-                                app_data["publisher"] = winreg.QueryValueEx(sub_key, "Publisher")[0]
-                            except FileNotFoundError:
-                                app_data["publisher"] = "Unknown"
-                                
-                            try:
-                                app_data["install_date"] = winreg.QueryValueEx(sub_key, "InstallDate")[0]
-                                # Format YYYYMMDD to YYYY-MM-DD
-                                if len(app_data["install_date"]) == 8:
-                                    d = app_data["install_date"]
-                                    app_data["install_date"] = f"{d[0:4]}-{d[4:6]}-{d[6:8]}"
-                            except FileNotFoundError:
-                                app_data["install_date"] = "Unknown"
-                                
-                            try:
-                                app_data["uninstall_string"] = winreg.QueryValueEx(sub_key, "UninstallString")[0]
-                            except FileNotFoundError:
-                                app_data["uninstall_string"] = ""
-
-                            try:
-                                # EstimatedSize is usually in KB
-                                size_kb = winreg.QueryValueEx(sub_key, "EstimatedSize")[0]
-                                app_data["size_mb"] = round(size_kb / 1024, 2)
-                            except FileNotFoundError:
-                                app_data["size_mb"] = 0
-
-                            try:
-                                # DisplayIcon contains exe path, sometimes with index
-                                app_data["icon_path"] = winreg.QueryValueEx(sub_key, "DisplayIcon")[0]
-                            except FileNotFoundError:
-                                app_data["icon_path"] = ""
-
-                            apps_list.append(app_data)
-                    except OSError:
-                        continue
-        except OSError:
-            pass
+            size_mb = round(size_kb / 1024, 2) if size_kb is not None else None
+        except TypeError:
+            size_mb = None
+
+        # DisplayIcon contains exe path, sometimes with index
+        icon_path = AppScanner._text(values.get("DisplayIcon"))
+        install_location = values.get("InstallLocation")
+        if install_location:
+            install_location = str(install_location).strip().strip('"') or None
+
+        # Positional: this runs once per registry entry on every full scan
+        return InstalledApp(
+            AppScanner._text(display_name),
+            AppScanner._text(values.get("DisplayVersion")),
+            AppScanner._text(values.get("Publisher")),
+            parse_install_date(values.get("InstallDate")),
+            size_mb,
+            AppScanner._text(values.get("UninstallString")),
+            icon_path,
+            # Directories used to attribute running processes by exe path
+            install_location or None,
+            AppScanner._icon_dir(icon_path) or None,
+        )
+
+    @staticmethod
+    def _text(value):
+        """A registry value as a non-empty string, or None"""
+        if not value:
+            return None
+        return value if type(value) is str else (str(value) or None)
+
+    @staticmethod
+    def _icon_dir(display_icon):
+        """Directory of the file referenced by a DisplayIcon value ('' if none)"""
+        path = str(display_icon or "").strip().strip('"')
+        # Drop icon index suffix (e.g., "C:\\path\\app.exe,0")
+        head, sep, tail = path.rpartition(",")
+        if sep and tail.strip().lstrip("-").isdigit():
+            path = head.strip().strip('"')
+        cut = max(path.rfind("\\"), path.rfind("/"))
+        return path[:cut] if cut > 0 else ""
@@ -0,0 +1,75 @@
+import re
+
+# InstalledApp fields matched by the search box
+SEARCH_FIELDS = ("name", "publisher", "version")
+
+_WORD = re.compile(r"\w+")
+_VERSION_PART = re.compile(r"\d+|[a-z]+")
+# Parsed version keys by text: installers share a handful of version
+# strings, so most rows reuse one. Cleared when it outgrows this many entries
+_VERSION_CACHE_SIZE = 4096
+_version_cache = {}
+
+
+def search_text(app):
+    """
+    Precomputed search key of an InstalledApp: the lowercase words of its
+    SEARCH_FIELDS, each preceded by a space, so a word-prefix test is a
+    plain substring test (see matches).
+    """
+    text = " ".join(getattr(app, field) or "" for field in SEARCH_FIELDS)
+    return " " + " ".join(_WORD.findall(text.lower()))
+
+
+def query_tokens(query):
+    """The words of a search query, as matched against search_text()"""
+    return tuple(" " + word for word in _WORD.findall(query.lower()))
+
+
+def matches(text, tokens):
+    """True when every query token starts a word of text"""
+    for token in tokens:
+        if token not in text:
+            return False
+    return True
+
+
+def refines(previous, tokens):
+    """
+    True when every row matching tokens also matches previous, i.e. the
+    query only grew (words extended or added), so filtering can start from
+    the previous result instead of every row.
+    """
+    if previous is None or len(tokens) < len(previous):
+        return False
+    return all(new.startswith(old) for old, new in zip(previous, tokens))
+
+
+def filter_rows(texts, tokens, rows=None):
+    """Indices of texts matching tokens, out of rows (default: all), in order"""
+    if rows is None:
+        rows = range(len(texts))
+    if not tokens:
+        return list(rows)
+    # Test the longest token first: it is usually the most selective
+    first, *rest = sorted(tokens, key=len, reverse=True)
+    found = [r for r in rows if first in texts[r]]
+    for token in rest:
+        found = [r for r in found if token in texts[r]]
+    return found
+
+
+def version_key(version):
+    """
+    Sort key comparing versions by their numeric parts ("10.2" after "9.1").
+    Text parts sort after numbers at the same position; a missing version
+    sorts first.
+    """
+    key = _version_cache.get(version)
+    if key is None:
+        parts = _VERSION_PART.findall((version or "").lower())
+        key = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in parts)
+        if len(_version_cache) >= _VERSION_CACHE_SIZE:
+            _version_cache.clear()
+        _version_cache[version] = key
+    return key
@@ -0,0 +1,279 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from core.process_matcher import APP_PROCESS_MAPPINGS, InstallPathIndex
+from core.process_sampler import default_sampler
+
+# Children of these processes start a new application instead of joining
+# their parent's (a launcher or shell is not part of what it starts)
+DEFAULT_TREE_ROOTS = (
+    "system", "smss.exe", "csrss.exe", "wininit.exe", "winlogon.exe", "services.exe", "svchost.exe",
+    "explorer.exe", "sihost.exe", "runtimebroker.exe", "taskhostw.exe", "cmd.exe", "powershell.exe",
+    "pwsh.exe", "conhost.exe", "windowsterminal.exe", "init", "systemd", "launchd", "sh", "bash", "zsh",
+)
+# Parent links followed at most, which also stops PID-reuse cycles
+MAX_TREE_DEPTH = 32
+
+# Per-application totals. key is ("app", name) for installed apps and
+# ("process", name) for processes no installed app owns; rss is in bytes and
+# cpu_percent is a share of all cores over the last sampling interval.
+AppUsage = namedtuple("AppUsage", ["key", "name", "rss", "cpu_percent", "count", "pids"])
+
+
+class _Group:
+    __slots__ = ("key", "name", "rss", "cpu", "pids")
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.rss = 0  # bytes
+        self.cpu = 0.0  # CPU seconds used during the last interval
+        self.pids = set()
+
+
+class _Proc:
+    __slots__ = ("name", "group", "rss", "cpu_time", "cpu_delta")
+
+    def __init__(self, sample):
+        self.name = sample.name
+        self.group = None
+        self.rss = sample.rss or 0
+        self.cpu_time = sample.cpu_time
+        self.cpu_delta = 0.0
+
+
+class AppUsageAggregator:
+    """
+    Rolling per-application totals (RSS, CPU %, process count) over
+    ProcessSampler passes. Feed it every pass (sampler.subscribe(usage.update)).
+    A process belongs to the installed app owning it (the attribution from
+    set_apps(), else its exe path, else its process name as the attribution
+    or APP_PROCESS_MAPPINGS named it); otherwise to the app of its parent, so
+    helper and renderer processes count towards the program that started
+    them; a process whose parent is a tree root (DEFAULT_TREE_ROOTS) or gone
+    forms a group named after itself. Only PIDs that appeared since the
+    previous pass are placed; known PIDs keep their group and adjust its
+    totals by their change, and vanished PIDs are subtracted.
+
+    Thread-safe: updates usually arrive on the sampling thread.
+    """
+
+    def __init__(self, tree_roots=DEFAULT_TREE_ROOTS, cpu_count=None):
+        self.tree_roots = {name.lower() for name in tree_roots}
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._procs = {}  # pid -> _Proc
+        self._groups = {}  # key -> _Group
+        self._index = InstallPathIndex()
+        self._owners = {}  # pid -> app name, from the last attribution
+        self._name_owners = {}  # process name (lower, no .exe) -> app name
+        self._snapshot = None
+        self._interval = 0.0
+        self.updates = 0
+        self.last_update_ms = 0.0
+        self.last_added = 0
+        self.last_removed = 0
+
+    def update(self, snapshot):
+        """Applies one pass: places new PIDs, adjusts known ones, drops vanished ones"""
+        start = time.perf_counter()
+        with self._lock:
+            previous = self._snapshot
+            self._interval = snapshot.taken_at - previous.taken_at if previous is not None else 0.0
+            self._snapshot = snapshot
+
+            procs = self._procs
+            removed = [pid for pid in procs if snapshot.get(pid) is None]
+            for pid in removed:
+                self._drop(pid)
+
+            added = []
+            for p in snapshot:
+                proc = procs.get(p.pid)
+                if proc is None:
+                    added.append(p)
+                    continue
+                if proc.name != p.name:
+                    # PID reused by another program
+                    self._drop(p.pid)
+                    removed.append(p.pid)
+                    added.append(p)
+                    continue
+                group = proc.group
+                rss = p.rss or 0
+                if rss != proc.rss:
+                    group.rss += rss - proc.rss
+                    proc.rss = rss
+                delta = 0.0
+                if p.cpu_time is not None and proc.cpu_time is not None:
+                    delta = max(0.0, p.cpu_time - proc.cpu_time)
+                proc.cpu_time = p.cpu_time
+                if delta != proc.cpu_delta:
+                    group.cpu += delta - proc.cpu_delta
+                    proc.cpu_delta = delta
+
+            for p in added:
+                if p.pid not in procs:
+                    self._place(p, snapshot)
+
+            self.updates += 1
+            self.last_added = len(added)
+            self.last_removed = len(removed)
+            self.last_update_ms = (time.perf_counter() - start) * 1000
+
+    def set_apps(self, apps, matches=None):
+        """
+        Installed apps whose install directories claim processes by exe path.
+        matches: {app_name: [pid, ...]} from ProcessMatcher.attribute_apps,
+        which also covers processes only matched by name.
+        Every known PID is regrouped. Processes started later are claimed by
+        exe path or by the process names attributed now, so a restarted app
+        is recognised without another attribution.
+        """
+        owners = {}
+        for name, pids in (matches or {}).items():
+            for pid in pids:
+                owners.setdefault(pid, name)
+        name_owners = {}
+        for app in apps:
+            lowered = app.name.lower()
+            for key, process_name in APP_PROCESS_MAPPINGS.items():
+                if key in lowered:
+                    name_owners.setdefault(process_name, app.name)
+        index = InstallPathIndex(apps)
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                for pid, name in owners.items():
+                    p = snapshot.get(pid)
+                    if p is not None and p.name:
+                        name_owners.setdefault(p.name.lower().replace('.exe', ''), name)
+            self._index = index
+            self._owners = owners
+            self._name_owners = name_owners
+            if snapshot is None:
+                return
+            procs = self._procs
+            self._procs = {}
+            self._groups = {}
+            for p in snapshot:
+                proc = procs.get(p.pid)
+                if proc is not None and p.pid not in self._procs:
+                    self._place(p, snapshot, procs)
+
+    def top(self, n=None, min_rss=0):
+        """The n groups using the most memory (all if n is None), largest first"""
+        with self._lock:
+            groups = sorted((g for g in self._groups.values() if g.rss >= min_rss),
+                            key=lambda g: g.rss, reverse=True)
+            return [self._usage(g) for g in groups[:n]]
+
+    def usage(self, app_name):
+        """Totals of an installed app, or None if none of its processes run"""
+        with self._lock:
+            group = self._groups.get(("app", app_name))
+            return self._usage(group) if group is not None else None
+
+    def installed_usage(self):
+        """{app_name: AppUsage} for every installed app with running processes"""
+        with self._lock:
+            return {key[1]: self._usage(g) for key, g in self._groups.items() if key[0] == "app"}
+
+    def group_of(self, pid):
+        """Key of the group pid is counted in, or None"""
+        with self._lock:
+            proc = self._procs.get(pid)
+            return proc.group.key if proc is not None else None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "updates": self.updates,
+                "processes": len(self._procs),
+                "groups": len(self._groups),
+                "last_added": self.last_added,
+                "last_removed": self.last_removed,
+                "last_update_ms": self.last_update_ms,
+            }
+
+    # --- internals ----------------------------------------------------------
+
+    def _usage(self, group):
+        interval = self._interval
+        cpu = max(0.0, group.cpu) / interval / self.cpu_count * 100 if interval > 0 else 0.0
+        return AppUsage(group.key, group.name, group.rss, cpu, len(group.pids), tuple(group.pids))
+
+    def _owner(self, p):
+        name = self._owners.get(p.pid)
+        if name is None and p.exe:
+            name = self._index.lookup(p.exe)
+        if name is None and p.name:
+            name = self._name_owners.get(p.name.lower().replace('.exe', ''))
+        return name
+
+    def _place(self, sample, snapshot, previous=None):
+        """
+        Groups sample and any not yet placed ancestors it is grouped through.
+        previous: {pid: _Proc} whose counters carry over (used when regrouping).
+        """
+        chain = []
+        group = None
+        p = sample
+        while group is None:
+            known = self._procs.get(p.pid)
+            if known is not None:
+                group = known.group
+                break
+            chain.append(p)
+            owner = self._owner(p)
+            if owner is not None:
+                group = self._group(("app", owner), owner)
+                break
+            parent = snapshot.get(p.ppid) if p.ppid is not None and p.ppid != p.pid else None
+            if (parent is None or not parent.name or parent.name.lower() in self.tree_roots
+                    or len(chain) >= MAX_TREE_DEPTH):
+                name = p.name or str(p.pid)
+                group = self._group(("process", name.lower()), name)
+                break
+            p = parent
+
+        for p in chain:
+            proc = previous.get(p.pid) if previous is not None else None
+            if proc is None:
+                proc = _Proc(p)
+            proc.group = group
+            self._procs[p.pid] = proc
+            group.pids.add(p.pid)
+            group.rss += proc.rss
+            group.cpu += proc.cpu_delta
+
+    def _group(self, key, name):
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group(key, name)
+        return group
+
+    def _drop(self, pid):
+        proc = self._procs.pop(pid)
+        group = proc.group
+        group.pids.discard(pid)
+        if not group.pids:
+            del self._groups[group.key]
+        else:
+            group.rss -= proc.rss
+            group.cpu -= proc.cpu_delta
+
+
+_default_usage = None
+_default_lock = threading.Lock()
+
+
+def default_usage():
+    """The process-wide aggregator, fed by every default_sampler() pass"""
+    global _default_usage
+    with _default_lock:
+        if _default_usage is None:
+            _default_usage = AppUsageAggregator()
+            default_sampler().subscribe(_default_usage.update)
+        return _default_usage
@@ -0,0 +1,193 @@
+"""
+Pressure-triggered memory optimization, without Qt.
+Run headless as a long-lived process:
+    python -m core.auto_optimizer --low-mb 1024
+"""
+import argparse
+import logging
+import threading
+import time
+from collections import deque
+from core.memory_opt import MemoryOptimizer, REFAULT_DELAY_MS
+from core.process_sampler import default_sampler
+from core.system_info import SystemInfo
+from core.trim_policy import ActivityTracker
+
+log = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Trigger below this much available memory...
+DEFAULT_LOW_WATERMARK_MB = 1024
+# ...and only again once available memory recovered above low * this
+DEFAULT_REARM_RATIO = 1.5
+# Minimum time between two runs, and at most MAX_RUNS per RATE_WINDOW
+DEFAULT_COOLDOWN_S = 300
+DEFAULT_MAX_RUNS = 4
+DEFAULT_RATE_WINDOW_S = 3600
+DEFAULT_INTERVAL_S = 5.0
+# Under sustained pressure, re-arm only once this long (and the cooldown)
+# passed since the last run, and only if its trimmed memory mostly stayed out
+DEFAULT_REARM_AFTER_S = 120
+MAX_REFAULT_RATE = 0.5
+
+# step() outcomes
+IDLE = "idle"            # armed, memory fine
+TRIGGERED = "triggered"  # ran an optimize
+DISARMED = "disarmed"    # low memory, but not recovered since the last run
+COOLDOWN = "cooldown"    # low memory, last run too recent
+RATE_LIMITED = "rate_limited"
+REARMED = "rearmed"      # recovered above the high watermark
+
+
+class AutoOptimizer:
+    """
+    Control loop that runs an optimize when available memory drops below
+    low_watermark_mb.
+    Guards against thrashing three ways. After a run it stays disarmed until
+    available memory climbs back above the high watermark (hysteresis) or,
+    under sustained pressure, until max(cooldown_s, rearm_after_s) passed
+    and the run proved worthwhile (re-fault rate at most MAX_REFAULT_RATE).
+    It never runs twice within cooldown_s, and at most max_runs times per
+    rate_window_s. Every run is logged with its
+    before/after figures, and its re-fault rate once REFAULT_DELAY_MS passed.
+
+    memory_source: callable returning SystemInfo.get_memory_info()-style
+    dicts; optimize: callable returning an OptimizeReport; clock: seconds.
+    All three are replaceable so the loop can be driven by a simulation.
+    """
+
+    def __init__(self, low_watermark_mb=DEFAULT_LOW_WATERMARK_MB, high_watermark_mb=None,
+                 cooldown_s=DEFAULT_COOLDOWN_S, max_runs=DEFAULT_MAX_RUNS,
+                 rate_window_s=DEFAULT_RATE_WINDOW_S, rearm_after_s=DEFAULT_REARM_AFTER_S,
+                 memory_source=None, optimize=None, measure_refault=None, clock=time.monotonic):
+        self.low = low_watermark_mb * MB
+        self.high = (high_watermark_mb if high_watermark_mb is not None
+                     else low_watermark_mb * DEFAULT_REARM_RATIO) * MB
+        if self.high <= self.low:
+            raise ValueError("high watermark must be above the low watermark")
+        self.cooldown_s = cooldown_s
+        self.max_runs = max_runs
+        self.rate_window_s = rate_window_s
+        self.rearm_after_s = rearm_after_s
+        self.memory_source = memory_source or SystemInfo.get_memory_info
+        self.activity = None
+        if optimize is None:
+            # Real runs: feed the trim policy's idle rule from the shared sampler
+            self.activity = ActivityTracker()
+            default_sampler().subscribe(self.activity.update)
+            optimize = lambda: MemoryOptimizer.optimize(activity=self.activity)
+        self.optimize = optimize
+        self.measure_refault = measure_refault or MemoryOptimizer.measure_refault
+        self.clock = clock
+
+        self.armed = True
+        self._runs = deque()  # start times inside the rate window
+        self._last_run = None
+        self._pending_refault = None  # (due, report)
+        self.reports = deque(maxlen=20)
+        self.counts = {outcome: 0 for outcome in (IDLE, TRIGGERED, DISARMED, COOLDOWN, RATE_LIMITED, REARMED)}
+
+    def step(self):
+        """One control-loop iteration; returns the outcome"""
+        now = self.clock()
+        self._check_refault(now)
+        available = self.memory_source()['available']
+
+        if not self.armed:
+            if available >= self.high:
+                self.armed = True
+                log.info("re-armed: %.0f MB available (high watermark %.0f MB)", available / MB, self.high / MB)
+                return self._count(REARMED)
+            if available < self.low and not self._worth_repeating(now):
+                return self._count(DISARMED)
+            if available >= self.low:
+                return self._count(IDLE)
+            self.armed = True
+            log.info("re-armed under sustained pressure: last run kept %.0f%% of its gain",
+                     (1 - self.reports[-1].refault_rate) * 100)
+
+        if available >= self.low:
+            return self._count(IDLE)
+
+        if self._last_run is not None and now - self._last_run < self.cooldown_s:
+            return self._count(COOLDOWN)
+        while self._runs and now - self._runs[0] >= self.rate_window_s:
+            self._runs.popleft()
+        if len(self._runs) >= self.max_runs:
+            log.warning("rate limited: %d runs in the last %.0f s", len(self._runs), self.rate_window_s)
+            return self._count(RATE_LIMITED)
+
+        log.info("triggered: %.0f MB available (low watermark %.0f MB)", available / MB, self.low / MB)
+        report = self.optimize()
+        self._last_run = now
+        self._runs.append(now)
+        self.armed = False
+        self.reports.append(report)
+        self._pending_refault = (now + REFAULT_DELAY_MS / 1000, report)
+        log.info("optimized: trimmed %.0f MB from %d processes (%d denied, %d skipped) in %.0f ms; "
+                 "available %.0f -> %.0f MB (%+.0f MB)",
+                 report.trimmed_bytes / MB, report.success_count, report.fail_count, report.skipped_count,
+                 report.duration_ms, report.available_before / MB, report.available_after / MB,
+                 report.reclaimed_bytes / MB)
+        return self._count(TRIGGERED)
+
+    def run(self, interval_s=DEFAULT_INTERVAL_S, stop=None):
+        """Steps every interval_s until the stop Event is set"""
+        stop = stop or threading.Event()
+        log.info("watching: low %.0f MB, high %.0f MB, cooldown %.0f s, at most %d runs per %.0f s",
+                 self.low / MB, self.high / MB, self.cooldown_s, self.max_runs, self.rate_window_s)
+        while not stop.is_set():
+            if self.activity is not None:
+                default_sampler().snapshot(max_age=interval_s / 2)
+            self.step()
+            stop.wait(interval_s)
+
+    def stats(self):
+        return dict(self.counts, armed=self.armed, runs_in_window=len(self._runs))
+
+    def _worth_repeating(self, now):
+        # Without its own delay a zero cooldown would re-arm on the next poll
+        if self._last_run is None or now - self._last_run < max(self.cooldown_s, self.rearm_after_s):
+            return False
+        rate = self.reports[-1].refault_rate if self.reports else None
+        return rate is not None and rate <= MAX_REFAULT_RATE
+
+    def _check_refault(self, now):
+        if self._pending_refault is None or now < self._pending_refault[0]:
+            return
+        report = self.measure_refault(self._pending_refault[1])
+        self._pending_refault = None
+        log.info("re-fault after %d s: %.0f of %.0f MB paged back in (%.0f%%)",
+                 REFAULT_DELAY_MS // 1000, report.refaulted_bytes / MB, report.trimmed_bytes / MB,
+                 (report.refault_rate or 0) * 100)
+
+    def _count(self, outcome):
+        self.counts[outcome] += 1
+        return outcome
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trim working sets automatically under memory pressure")
+    parser.add_argument("--low-mb", type=float, default=DEFAULT_LOW_WATERMARK_MB,
+                        help="trigger below this much available memory")
+    parser.add_argument("--high-mb", type=float, default=None,
+                        help=f"re-arm above this much (default: low x {DEFAULT_REARM_RATIO})")
+    parser.add_argument("--cooldown", type=float, default=DEFAULT_COOLDOWN_S, help="seconds between runs")
+    parser.add_argument("--max-runs", type=int, default=DEFAULT_MAX_RUNS, help="runs per --window")
+    parser.add_argument("--window", type=float, default=DEFAULT_RATE_WINDOW_S, help="rate-limit window (s)")
+    parser.add_argument("--rearm-after", type=float, default=DEFAULT_REARM_AFTER_S,
+                        help="seconds before re-arming under sustained pressure (at least --cooldown)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_S, help="poll interval (s)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    optimizer = AutoOptimizer(args.low_mb, args.high_mb, args.cooldown, args.max_runs, args.window,
+                              args.rearm_after)
+    try:
+        optimizer.run(args.interval)
+    except KeyboardInterrupt:
+        log.info("stopped: %s", optimizer.stats())
+
+
+if __name__ == "__main__":
+    main()
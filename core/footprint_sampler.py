@@ -0,0 +1,243 @@
+import bisect
+import heapq
+import sys
+import threading
+import time
+from collections import namedtuple
+import psutil
+from core.process_sampler import default_sampler
+
+# Time spent reading per pass (ms); at least one process is read per pass
+DEFAULT_BUDGET_MS = 40
+# The largest processes by RSS are read ahead of the rotation...
+DEFAULT_TOP_N = 20
+# ...whenever their reading is older than this (seconds)
+DEFAULT_TOP_MAX_AGE = 6.0
+# Rotation readings are not refreshed before they are this old (seconds)
+DEFAULT_MIN_AGE = 2.0
+# Processes that could not be read at all are retried after this long (seconds)
+DENIED_RETRY_S = 300.0
+
+# Expensive per-process figures, each None when unavailable on this platform
+# or denied: uss/pss in bytes (PSS is Linux only), open handles (Windows) or
+# file descriptors, and bytes read plus written since start. age is seconds
+# since the reading was taken.
+Footprint = namedtuple("Footprint", ["pid", "uss", "pss", "handles", "io_bytes", "age"])
+
+
+class AppFootprint(namedtuple("AppFootprint", ["uss", "pss", "measured", "count", "max_age"])):
+    """
+    Footprint sums over a group of processes. Only the measured processes
+    (out of count) contribute; pss is None unless each of them has one, and
+    max_age is the age of the oldest reading used (None if none).
+    """
+    __slots__ = ()
+
+    def describe(self):
+        if not self.measured:
+            return "Private memory not measured yet"
+        mb = 1024 * 1024
+        text = f"Private (USS): {self.uss / mb:,.0f} MB"
+        if self.pss is not None:
+            text += f"  |  Proportional (PSS): {self.pss / mb:,.0f} MB"
+        return text + f"\n{self.measured} of {self.count} processes measured, up to {self.max_age:.0f} s old"
+
+
+def read_footprint(proc):
+    """(uss, pss, handles, io_bytes) of a psutil.Process; raises psutil errors"""
+    with proc.oneshot():
+        try:
+            mem = proc.memory_full_info()
+            uss, pss = mem.uss, getattr(mem, "pss", None)
+        except psutil.AccessDenied:
+            uss = pss = None
+        try:
+            handles = proc.num_handles() if sys.platform == "win32" else proc.num_fds()
+        except (psutil.AccessDenied, AttributeError):
+            handles = None
+        try:
+            io = proc.io_counters()
+            io_bytes = io.read_bytes + io.write_bytes
+        except (psutil.AccessDenied, AttributeError):  # no io_counters on macOS
+            io_bytes = None
+    return uss, pss, handles, io_bytes
+
+
+class FootprintSampler:
+    """
+    Keeps USS/PSS, handle counts and I/O totals for every process without
+    reading them all on every pass: memory_full_info() walks the whole
+    address space and costs far more than memory_info().
+    Feed it every ProcessSampler pass (sampler.subscribe(footprint.update)).
+    Each pass spends at most budget_ms: first on the top_n largest processes
+    whose reading is older than top_max_age, then on a rotation through all
+    PIDs that resumes where the previous pass stopped and skips readings
+    younger than min_age, so every process is eventually refreshed and each
+    value carries its age.
+
+    Thread-safe; reads happen outside the lock, so lookups never wait on them.
+    """
+
+    def __init__(self, budget_ms=DEFAULT_BUDGET_MS, top_n=DEFAULT_TOP_N, top_max_age=DEFAULT_TOP_MAX_AGE,
+                 min_age=DEFAULT_MIN_AGE, reader=None, clock=time.monotonic):
+        self.budget_ms = budget_ms
+        self.top_n = top_n
+        self.top_max_age = top_max_age
+        self.min_age = min_age
+        # reader(pid) -> (uss, pss, handles, io_bytes), or None once the process is gone
+        self.reader = reader if reader is not None else self._read_psutil
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._readings = {}  # pid -> (name, values, taken_at)
+        self._procs = {}  # pid -> psutil.Process, for the default reader
+        self._cursor = -1  # last PID read by the rotation
+        self.passes = 0
+        self.reads = 0
+        self.last_reads = 0
+        self.last_ms = 0.0
+        self.total_ms = 0.0
+
+    def update(self, snapshot):
+        """Refreshes as many readings as fit in the budget, most needed first"""
+        # Passes finishing together on two threads: the later one is skipped
+        if not self._update_lock.acquire(blocking=False):
+            return
+        try:
+            self._update(snapshot)
+        finally:
+            self._update_lock.release()
+
+    def _update(self, snapshot):
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        now = self.clock()
+        with self._lock:
+            readings = self._readings
+            gone = []
+            for pid, (name, _, _) in readings.items():
+                p = snapshot.get(pid)
+                if p is None or p.name != name:
+                    gone.append(pid)
+            for pid in gone:
+                del readings[pid]
+                self._procs.pop(pid, None)
+            taken = {pid: entry[2] for pid, entry in readings.items()}
+            denied = {pid for pid, entry in readings.items() if not any(v is not None for v in entry[1])}
+
+        def due(pid, max_age):
+            taken_at = taken.get(pid)
+            if taken_at is None:
+                return True
+            return now - taken_at >= (DENIED_RETRY_S if pid in denied else max_age)
+
+        names = {p.pid: p.name for p in snapshot}
+        results = {}
+
+        def read(pid):
+            values = self.reader(pid)
+            results[pid] = values
+            return time.perf_counter() < deadline
+
+        top = heapq.nlargest(self.top_n, (p for p in snapshot if p.rss), key=lambda p: p.rss)
+        budget_left = True
+        for p in top:
+            if due(p.pid, self.top_max_age):
+                budget_left = read(p.pid)
+                if not budget_left:
+                    break
+
+        if budget_left:
+            # Oldest first: the rotation visits PIDs in order from the cursor
+            pids = sorted(names)
+            first = bisect.bisect_right(pids, self._cursor)
+            for pid in pids[first:] + pids[:first]:
+                if pid in results or not due(pid, self.min_age):
+                    continue
+                self._cursor = pid
+                if not read(pid):
+                    break
+
+        with self._lock:
+            for pid, values in results.items():
+                if values is None:
+                    self._readings.pop(pid, None)
+                    self._procs.pop(pid, None)
+                else:
+                    self._readings[pid] = (names[pid], values, now)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.passes += 1
+            self.reads += len(results)
+            self.last_reads = len(results)
+            self.last_ms = elapsed
+            self.total_ms += elapsed
+
+    def get(self, pid):
+        """Footprint of pid, or None if it has not been read yet"""
+        with self._lock:
+            entry = self._readings.get(pid)
+        if entry is None:
+            return None
+        _, values, taken_at = entry
+        return Footprint(pid, *values, self.clock() - taken_at)
+
+    def summarize(self, pids):
+        """AppFootprint over pids (e.g. AppUsage.pids)"""
+        now = self.clock()
+        uss = pss = 0
+        measured = 0
+        oldest = None
+        with self._lock:
+            entries = [self._readings.get(pid) for pid in pids]
+        for entry in entries:
+            if entry is None or entry[1][0] is None:
+                continue
+            values, taken_at = entry[1], entry[2]
+            measured += 1
+            uss += values[0]
+            pss = pss + values[1] if pss is not None and values[1] is not None else None
+            oldest = taken_at if oldest is None else min(oldest, taken_at)
+        return AppFootprint(uss, pss if measured else None, measured, len(entries),
+                            now - oldest if oldest is not None else None)
+
+    def stats(self):
+        now = self.clock()
+        with self._lock:
+            ages = [now - entry[2] for entry in self._readings.values()]
+            denied = sum(1 for entry in self._readings.values() if entry[1][0] is None)
+        return {
+            "passes": self.passes,
+            "reads": self.reads,
+            "last_reads": self.last_reads,
+            "last_ms": self.last_ms,
+            "avg_ms": self.total_ms / self.passes if self.passes else 0.0,
+            "readings": len(ages),
+            "denied": denied,
+            "max_age": max(ages) if ages else None,
+        }
+
+    def _read_psutil(self, pid):
+        proc = self._procs.get(pid)
+        try:
+            if proc is None:
+                proc = self._procs[pid] = psutil.Process(pid)
+            return read_footprint(proc)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._procs.pop(pid, None)
+            return None
+        except psutil.AccessDenied:
+            return (None, None, None, None)
+
+
+_default_footprint = None
+_default_lock = threading.Lock()
+
+
+def default_footprint():
+    """The process-wide footprint sampler, fed by every default_sampler() pass"""
+    global _default_footprint
+    with _default_lock:
+        if _default_footprint is None:
+            _default_footprint = FootprintSampler()
+            default_sampler().subscribe(_default_footprint.update)
+        return _default_footprint
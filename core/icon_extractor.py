@@ -1,20 +1,29 @@
 import os
-import tempfile
 from PySide6.QtGui import QIcon, QPixmap, QImage
 from PySide6.QtCore import QSize
 from PySide6.QtWidgets import QStyle, QApplication
+from core.lru_cache import LRUCache
 
-try:
-    import win32gui
-    import win32ui
-    import win32con
-    import win32api
-    HAS_WIN32 = True
-except ImportError:
-    HAS_WIN32 = False
+# pywin32 is imported on the first extraction, not at startup (see has_win32)
+win32gui = None
+win32ui = None
+_win32_checked = False
+
+
+def has_win32():
+    """Imports pywin32 on first call; False when it is not installed"""
+    global win32gui, win32ui, _win32_checked
+    if not _win32_checked:
+        try:
+            import win32gui
+            import win32ui
+        except ImportError:
+            win32gui = win32ui = None
+        _win32_checked = True
+    return win32gui is not None
 
 class IconExtractor:
-    _cache = {}  # Cache extracted icons
+    _cache = LRUCache(512)  # Cache extracted icons (bounded, least recently used evicted)
     _fallback_icon = None  # Cached fallback icon
     
     @staticmethod
@@ -27,6 +36,48 @@ class IconExtractor:
                 IconExtractor._fallback_icon = app.style().standardIcon(QStyle.SP_ComputerIcon)
         return IconExtractor._fallback_icon or QIcon()
     
+    @staticmethod
+    def parse_icon_path(exe_path: str):
+        """
+        Splits a DisplayIcon value into (path, icon_index).
+        e.g. '"C:\\path\\app.exe",1' -> ('C:\\path\\app.exe', 1)
+        """
+        # Clean path
+        exe_path = exe_path.strip('"').strip()
+        
+        # Remove icon index if present (e.g., "C:\path\app.exe,0")
+        icon_index = 0
+        if ',' in exe_path:
+            parts = exe_path.rsplit(',', 1)
+            exe_path = parts[0].strip('"')
+            try:
+                icon_index = int(parts[1])
+            except ValueError:
+                icon_index = 0
+        return exe_path, icon_index
+
+    @staticmethod
+    def cached_icon(exe_path: str):
+        """Returns the cached QIcon for a DisplayIcon value, or None if not extracted yet"""
+        if not exe_path:
+            return None
+        path, icon_index = IconExtractor.parse_icon_path(exe_path)
+        return IconExtractor._cache.get(f"{path}:{icon_index}")
+
+    @staticmethod
+    def store_image(exe_path: str, image: QImage, use_fallback: bool = True) -> QIcon:
+        """
+        Converts an image produced by get_image_for_exe into a cached QIcon.
+        Must be called on the GUI thread.
+        """
+        path, icon_index = IconExtractor.parse_icon_path(exe_path)
+        if image is None or image.isNull():
+            result = IconExtractor.get_fallback_icon() if use_fallback else QIcon()
+        else:
+            result = QIcon(QPixmap.fromImage(image))
+        IconExtractor._cache[f"{path}:{icon_index}"] = result
+        return result
+
     @staticmethod
     def get_icon_for_exe(exe_path: str, use_fallback: bool = True) -> QIcon:
         """
@@ -42,82 +93,60 @@ class IconExtractor:
         if not exe_path:
             return IconExtractor.get_fallback_icon() if use_fallback else QIcon()
         
-        if not HAS_WIN32:
+        if not has_win32():
             return IconExtractor.get_fallback_icon() if use_fallback else QIcon()
         
-        # Clean path
-        exe_path = exe_path.strip('"').strip()
-        
-        # Remove icon index if present (e.g., "C:\path\app.exe,0")
-        icon_index = 0
-        if ',' in exe_path:
-            parts = exe_path.rsplit(',', 1)
-            exe_path = parts[0]
-            try:
-                icon_index = int(parts[1])
-            except ValueError:
-                icon_index = 0
-        
         # Check cache
-        cache_key = f"{exe_path}:{icon_index}"
-        if cache_key in IconExtractor._cache:
-            return IconExtractor._cache[cache_key]
+        cached = IconExtractor.cached_icon(exe_path)
+        if cached is not None:
+            return cached
+        
+        return IconExtractor.store_image(exe_path, IconExtractor.get_image_for_exe(exe_path), use_fallback)
+
+    @staticmethod
+    def get_image_for_exe(exe_path: str) -> QImage:
+        """
+        Extract the icon of an executable as a QImage.
+        Unlike QPixmap/QIcon, QImage is safe to build off the GUI thread.
+        Returns a null QImage if extraction fails.
+        """
+        if not exe_path or not has_win32():
+            return QImage()
         
+        exe_path, icon_index = IconExtractor.parse_icon_path(exe_path)
         if not os.path.exists(exe_path):
-            result = IconExtractor.get_fallback_icon() if use_fallback else QIcon()
-            IconExtractor._cache[cache_key] = result
-            return result
+            return QImage()
         
         try:
-            # Extract icon at specified index
-            large_icons, small_icons = win32gui.ExtractIconEx(exe_path, icon_index, 1)
-            
-            if large_icons and large_icons[0]:
-                icon_handle = large_icons[0]
-                
-                # Convert to QIcon via QPixmap
-                qicon = IconExtractor._hicon_to_qicon(icon_handle)
+            # Extract icon at specified index, then try index 0 as fallback
+            for index in ((icon_index, 0) if icon_index != 0 else (0,)):
+                large_icons, small_icons = win32gui.ExtractIconEx(exe_path, index, 1)
+                image = QImage()
+                if large_icons and large_icons[0]:
+                    image = IconExtractor._hicon_to_qimage(large_icons[0])
                 
                 # Destroy icon handles
-                for ico in large_icons:
-                    if ico:
-                        win32gui.DestroyIcon(ico)
-                for ico in small_icons:
+                for ico in list(large_icons or []) + list(small_icons or []):
                     if ico:
                         win32gui.DestroyIcon(ico)
                 
-                if not qicon.isNull():
-                    IconExtractor._cache[cache_key] = qicon
-                    return qicon
+                if not image.isNull():
+                    return image
             
-            # If extraction failed, try index 0 as fallback
-            if icon_index != 0:
-                large_icons, small_icons = win32gui.ExtractIconEx(exe_path, 0, 1)
-                if large_icons and large_icons[0]:
-                    qicon = IconExtractor._hicon_to_qicon(large_icons[0])
-                    for ico in large_icons:
-                        if ico:
-                            win32gui.DestroyIcon(ico)
-                    for ico in small_icons:
-                        if ico:
-                            win32gui.DestroyIcon(ico)
-                    if not qicon.isNull():
-                        IconExtractor._cache[cache_key] = qicon
-                        return qicon
-            
-            # Fallback
-            result = IconExtractor.get_fallback_icon() if use_fallback else QIcon()
-            IconExtractor._cache[cache_key] = result
-            return result
+            return QImage()
             
         except Exception:
-            result = IconExtractor.get_fallback_icon() if use_fallback else QIcon()
-            IconExtractor._cache[cache_key] = result
-            return result
+            return QImage()
     
     @staticmethod
     def _hicon_to_qicon(hicon) -> QIcon:
         """Convert Windows HICON to QIcon"""
+        image = IconExtractor._hicon_to_qimage(hicon)
+        return QIcon() if image.isNull() else QIcon(QPixmap.fromImage(image))
+
+    @staticmethod
+    def _hicon_to_qimage(hicon) -> QImage:
+        """Convert Windows HICON to QImage"""
         try:
             # Get icon info
             icon_info = win32gui.GetIconInfo(hicon)
@@ -145,8 +174,8 @@ class IconExtractor:
             # Get bitmap bits
             bmpstr = bitmap.GetBitmapBits(True)
             
-            # Create QImage from bitmap data
-            qimage = QImage(bmpstr, width, height, QImage.Format_ARGB32)
+            # Create QImage from bitmap data (copy so it owns its buffer)
+            qimage = QImage(bmpstr, width, height, QImage.Format_ARGB32).copy()
             qimage = qimage.mirrored(False, True)  # Flip vertically
             
             # Clean up
@@ -155,10 +184,10 @@ class IconExtractor:
             win32gui.DeleteObject(icon_info[3])  # hbmMask
             win32gui.DeleteObject(hbmColor)
             
-            return QIcon(QPixmap.fromImage(qimage))
+            return qimage
             
         except Exception:
-            return QIcon()
+            return QImage()
     
     @staticmethod
     def _get_shell_icon(path: str) -> QIcon:
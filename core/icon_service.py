@@ -0,0 +1,140 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from core.icon_extractor import IconExtractor
+from core.lru_cache import LRUCache
+
+# Decoded icon memory kept in the LRU (bytes of pixel data)
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+# Cost charged for a remembered failure, so failures can be evicted too
+FAILURE_COST = 64
+
+
+class _DecodeSignals(QObject):
+    # icon_path, QImage (null on failure)
+    decoded = Signal(str, QImage)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, icon_path, decoder, signals):
+        super().__init__()
+        # Owned by IconService._pending rather than the pool, so the Python
+        # wrapper stays valid for tryTake() until the result is delivered
+        self.setAutoDelete(False)
+        self.icon_path = icon_path
+        self.decoder = decoder
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = self.decoder(self.icon_path)
+        except Exception:
+            image = None
+        self.signals.decoded.emit(self.icon_path, image if image is not None else QImage())
+
+
+class IconService(QObject):
+    """
+    Asynchronous icon loader for DisplayIcon paths.
+    Icons are decoded into QImages on a worker pool (QImage, unlike QPixmap,
+    may be built off the GUI thread), converted to QIcons on the GUI thread and
+    kept in a byte-bounded LRU. Concurrent requests for one path share a
+    single decode.
+
+    decoder: callable(icon_path) -> QImage; defaults to the Win32 extractor and
+    can be replaced by a stub for testing.
+    """
+    icon_ready = Signal(str, QIcon)
+
+    def __init__(self, decoder=None, max_bytes=DEFAULT_CACHE_BYTES, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.decoder = decoder or IconExtractor.get_image_for_exe
+        self.cache = LRUCache(max_bytes)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = {}  # icon_path -> queued or running _DecodeTask
+        self.scheduled = 0
+        self.cancelled = 0
+        self.decodes = 0
+        self.failures = 0
+        self.deduplicated = 0
+        self._signals = _DecodeSignals()
+        self._signals.decoded.connect(self._on_decoded)
+
+    def icon(self, icon_path):
+        """
+        Returns the QIcon for icon_path if it is cached, the fallback icon if
+        extraction is known to fail, or None after scheduling a decode
+        (icon_ready fires when it finishes).
+        """
+        icon = self.lookup(icon_path)
+        if icon is None:
+            self.request(icon_path)
+        return icon
+
+    def lookup(self, icon_path):
+        """Like icon(), but never schedules a decode"""
+        if not icon_path:
+            return IconExtractor.get_fallback_icon()
+        entry = self.cache.get(icon_path)
+        if entry is None:
+            return None
+        return entry if not entry.isNull() else IconExtractor.get_fallback_icon()
+
+    def peek(self, icon_path):
+        """Returns the cached QIcon (or None) without counting or scheduling anything"""
+        return self.cache.peek(icon_path)
+
+    def request(self, icon_path):
+        """
+        Schedules a decode unless one is already cached or in flight.
+        Returns True if a new decode was scheduled.
+        """
+        if not icon_path or icon_path in self.cache:
+            return False
+        if icon_path in self._pending:
+            self.deduplicated += 1
+            return False
+        task = _DecodeTask(icon_path, self.decoder, self._signals)
+        self._pending[icon_path] = task
+        self.scheduled += 1
+        self.pool.start(task)
+        return True
+
+    def retain(self, icon_paths):
+        """
+        Cancels queued decodes whose path is not in icon_paths (decodes that
+        already started are left to finish). Returns the number cancelled.
+        """
+        cancelled = 0
+        for icon_path, task in list(self._pending.items()):
+            if icon_path not in icon_paths and self.pool.tryTake(task):
+                del self._pending[icon_path]
+                cancelled += 1
+        self.cancelled += cancelled
+        return cancelled
+
+    def cancel_pending(self):
+        """Drops decodes that have not started yet"""
+        self.retain(())
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats.update(scheduled=self.scheduled, cancelled=self.cancelled, decodes=self.decodes,
+                     failures=self.failures, deduplicated=self.deduplicated, pending=len(self._pending))
+        return stats
+
+    def _on_decoded(self, icon_path, image):
+        self._pending.pop(icon_path, None)
+        self.decodes += 1
+        if image.isNull():
+            self.failures += 1
+            # Remember the failure with a null icon instead of pinning a real one
+            self.cache.put(icon_path, QIcon(), FAILURE_COST)
+            self.icon_ready.emit(icon_path, IconExtractor.get_fallback_icon())
+            return
+        icon = QIcon(QPixmap.fromImage(image))
+        self.cache.put(icon_path, icon, max(image.sizeInBytes(), FAILURE_COST))
+        self.icon_ready.emit(icon_path, icon)
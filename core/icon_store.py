@@ -0,0 +1,264 @@
+import json
+import mmap
+import os
+import threading
+import time
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage
+from core.app_cache import default_cache_dir
+from core.icon_extractor import IconExtractor
+
+# Bump whenever the record encoding or index layout changes
+STORE_VERSION = 1
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Rewrite the pack once more than this fraction of it is unreachable
+GARBAGE_RATIO = 0.5
+# Index is written after this many new records (and on flush())
+FLUSH_EVERY = 32
+
+
+class IconStore:
+    """
+    On-disk icon thumbnail store shared across runs.
+    PNG records are appended to a single pack file that is read through mmap;
+    a small JSON index maps "path|icon_index" to the file identity (size,
+    mtime) the record was extracted from plus its offset and length. A changed
+    executable no longer matches its record, so it is re-extracted once and the
+    old bytes become garbage for the next compaction.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        directory = directory or os.path.join(default_cache_dir(), "icons")
+        self.pack_path = os.path.join(directory, "icons.pack")
+        self.index_path = os.path.join(directory, "icons.idx")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # ident -> [size, mtime_ns, offset, length, last_used]
+        self._index = {}
+        self._pack_size = 0
+        self._live_bytes = 0
+        self._map = None
+        self._unflushed = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.compactions = 0
+        self._load()
+
+    # --- public API ---------------------------------------------------------
+
+    @staticmethod
+    def identity(icon_path):
+        """
+        Returns (ident, size, mtime_ns) for a DisplayIcon value, or None if the
+        file cannot be stat'ed (such icons are never stored).
+        """
+        path, icon_index = IconExtractor.parse_icon_path(icon_path)
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return f"{os.path.normcase(os.path.abspath(path)).lower()}|{icon_index}", st.st_size, st.st_mtime_ns
+
+    def get(self, icon_path):
+        """Returns the stored QImage for icon_path, or None"""
+        identity = self.identity(icon_path)
+        if identity is None:
+            return None
+        ident, size, mtime = identity
+        with self._lock:
+            entry = self._index.get(ident)
+            if entry is None or entry[0] != size or entry[1] != mtime:
+                self.misses += 1
+                return None
+            data = self._read(entry[2], entry[3])
+            if data is None:
+                self.misses += 1
+                return None
+            entry[4] = time.time()
+            self.hits += 1
+        image = QImage.fromData(data, "PNG")
+        return None if image.isNull() else image
+
+    def put(self, icon_path, image):
+        """Stores image for icon_path (no-op for null images or unreadable files)"""
+        if image is None or image.isNull():
+            return
+        identity = self.identity(icon_path)
+        if identity is None:
+            return
+        ident, size, mtime = identity
+        data = self._encode(image)
+        if not data:
+            return
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.pack_path), exist_ok=True)
+                with open(self.pack_path, "ab") as f:
+                    offset = f.tell()
+                    f.write(data)
+            except OSError:
+                return
+            self._pack_size = offset + len(data)
+            old = self._index.get(ident)
+            if old is not None:
+                self._live_bytes -= old[3]
+            self._index[ident] = [size, mtime, offset, len(data), time.time()]
+            self._live_bytes += len(data)
+            self.writes += 1
+            self._unflushed += 1
+            garbage = self._pack_size - self._live_bytes
+            if self._pack_size > self.max_bytes or garbage > self._pack_size * GARBAGE_RATIO:
+                self._compact()
+            elif self._unflushed >= FLUSH_EVERY:
+                self._write_index()
+
+    def cached_decoder(self, decoder):
+        """
+        Wraps decoder(icon_path) -> QImage so results come from the store when
+        the executable is unchanged and new extractions are written back.
+        """
+        def decode(icon_path):
+            image = self.get(icon_path)
+            if image is None:
+                image = decoder(icon_path)
+                self.put(icon_path, image)
+            return image
+        return decode
+
+    def flush(self):
+        with self._lock:
+            if self._unflushed:
+                self._write_index()
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "pack_bytes": self._pack_size,
+                "live_bytes": self._live_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "compactions": self.compactions,
+            }
+
+    # --- internals ----------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            self._pack_size = os.path.getsize(self.pack_path)
+        except (OSError, ValueError):
+            self._reset()
+            return
+        if not isinstance(payload, dict) or payload.get("version") != STORE_VERSION:
+            self._reset()
+            return
+        entries = payload.get("entries")
+        if not isinstance(entries, dict):
+            self._reset()
+            return
+        # Malformed records and records past the end of the pack (e.g. a
+        # truncated file) are dropped
+        self._index = {ident: list(entry) for ident, entry in entries.items()
+                       if self._valid_entry(entry) and entry[2] + entry[3] <= self._pack_size}
+        self._live_bytes = sum(entry[3] for entry in self._index.values())
+
+    @staticmethod
+    def _valid_entry(entry):
+        """[size, mtime, offset, length, last_used] with numbers where they belong"""
+        if not isinstance(entry, list) or len(entry) != 5:
+            return False
+        if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in entry):
+            return False
+        return isinstance(entry[2], int) and isinstance(entry[3], int) and entry[2] >= 0 and entry[3] >= 0
+
+    def _reset(self):
+        """Discards both files (missing, corrupted or from another version)"""
+        self._close_map()
+        self._index = {}
+        self._pack_size = 0
+        self._live_bytes = 0
+        for path in (self.pack_path, self.index_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _read(self, offset, length):
+        if offset + length > self._pack_size:
+            return None
+        if self._map is None or len(self._map) < offset + length:
+            self._close_map()
+            try:
+                with open(self.pack_path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+            if len(self._map) < offset + length:
+                return None
+        return bytes(self._map[offset:offset + length])
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _compact(self):
+        """
+        Rewrites the pack with live records only, most recently used first,
+        dropping the least recently used ones to get back under 3/4 of the cap.
+        """
+        budget = self.max_bytes * 3 // 4
+        keep = []
+        used = 0
+        for ident, entry in sorted(self._index.items(), key=lambda item: item[1][4], reverse=True):
+            if used + entry[3] > budget:
+                continue
+            data = self._read(entry[2], entry[3])
+            if data is not None:
+                keep.append((ident, entry, data))
+                used += entry[3]
+
+        tmp_path = self.pack_path + ".tmp"
+        index = {}
+        try:
+            with open(tmp_path, "wb") as f:
+                for ident, entry, data in keep:
+                    index[ident] = [entry[0], entry[1], f.tell(), len(data), entry[4]]
+                    f.write(data)
+            self._close_map()
+            os.replace(tmp_path, self.pack_path)
+        except OSError:
+            return
+        self._index = index
+        self._pack_size = used
+        self._live_bytes = used
+        self.compactions += 1
+        self._write_index()
+
+    def _write_index(self):
+        payload = {"version": STORE_VERSION, "entries": self._index}
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+            self._unflushed = 0
+        except OSError:
+            pass
+
+    @staticmethod
+    def _encode(image):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        ok = image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data.data()) if ok else b""
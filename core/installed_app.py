@@ -0,0 +1,101 @@
+import datetime
+import re
+import sys
+
+# InstallDate forms other than the documented YYYYMMDD
+_DATE_FORMATS = (
+    (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})$"), (0, 1, 2)),  # 2024-01-31
+    (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})$"), (2, 0, 1)),  # 1/31/2024, written by some installers
+)
+# Parsed YYYYMMDD dates by text: an inventory has far fewer distinct
+# install dates than apps. Cleared when it outgrows this many entries
+_DATE_CACHE_SIZE = 4096
+_date_cache = {}
+
+
+def parse_install_date(value):
+    """datetime.date from an InstallDate value, or None if missing or unreadable"""
+    if value is None:
+        return None
+    text = (value if type(value) is str else str(value)).strip()
+    if len(text) == 8 and text.isdigit():
+        # The documented YYYYMMDD form, without the regex
+        date = _date_cache.get(text)
+        if date is None:
+            try:
+                date = datetime.date(int(text[:4]), int(text[4:6]), int(text[6:]))
+            except ValueError:
+                return None
+            if len(_date_cache) >= _DATE_CACHE_SIZE:
+                _date_cache.clear()
+            _date_cache[text] = date
+        return date
+    for pattern, (y, m, d) in _DATE_FORMATS:
+        match = pattern.match(text)
+        if match:
+            parts = match.groups()
+            try:
+                return datetime.date(int(parts[y]), int(parts[m]), int(parts[d]))
+            except ValueError:
+                return None
+    return None
+
+
+class InstalledApp:
+    """
+    One installed application, shared by the scanner, the process matcher,
+    the app table and the CLI.
+    Missing values are None rather than placeholder strings ("N/A",
+    "Unknown", ""); only name is required. install_date is a datetime.date
+    and size_mb a float. Publishers are interned, since a few vendors own
+    most entries. Treat records as immutable once built; a changed registry
+    key produces a new record.
+    """
+    __slots__ = ("name", "version", "publisher", "install_date", "size_mb", "uninstall_string",
+                 "icon_path", "install_location", "icon_dir", "reg_key")
+
+    def __init__(self, name, version=None, publisher=None, install_date=None, size_mb=None,
+                 uninstall_string=None, icon_path=None, install_location=None, icon_dir=None,
+                 reg_key=None):
+        self.name = name
+        self.version = version
+        self.publisher = sys.intern(publisher) if publisher else None
+        self.install_date = install_date
+        self.size_mb = size_mb
+        self.uninstall_string = uninstall_string
+        self.icon_path = icon_path
+        self.install_location = install_location
+        self.icon_dir = icon_dir
+        self.reg_key = reg_key
+
+    def _values(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, InstalledApp):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"InstalledApp({self.name!r}, version={self.version!r}, publisher={self.publisher!r})"
+
+    def to_dict(self):
+        """JSON-serializable form (install_date as YYYY-MM-DD), see from_dict"""
+        data = {field: getattr(self, field) for field in self.__slots__}
+        if self.install_date is not None:
+            data["install_date"] = self.install_date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict; raises TypeError/ValueError on malformed data"""
+        if not isinstance(data, dict) or not isinstance(data.get("name"), str):
+            raise ValueError("app record needs a name")
+        values = {field: data.get(field) for field in cls.__slots__}
+        if values["install_date"] is not None:
+            values["install_date"] = datetime.date.fromisoformat(values["install_date"])
+        if values["size_mb"] is not None:
+            values["size_mb"] = float(values["size_mb"])
+        return cls(**values)
@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import namedtuple
+
+# Sustained growth above this rate (MB per minute) counts as a leak
+DEFAULT_RATE_MB_MIN = 5.0
+# Weight of a sample halves every this many seconds, so the trend follows
+# the recent past rather than the whole lifetime
+DEFAULT_HALF_LIFE_S = 180.0
+# The fitted line must explain this share of the variance (R²), which
+# separates steady growth from one-off jumps and sawtooth patterns
+DEFAULT_MIN_R2 = 0.8
+# ...and the rate must hold this long before a series is flagged
+DEFAULT_SUSTAIN_S = 300.0
+# Growth in the first minutes of a process is startup, not a leak (counted
+# from when the process started, or else from when it was first seen)
+DEFAULT_GRACE_S = 600.0
+# Series kept at most; the smallest processes give way beyond this
+DEFAULT_MAX_TRACKED = 4096
+# Samples needed before a series is judged at all
+MIN_SAMPLES = 6
+# A flagged series is cleared once its rate or fit falls below this share
+# of the thresholds
+CLEAR_RATIO = 0.5
+# Time origin of a series is moved forward once samples are this far from it,
+# keeping the sums small enough for float precision
+REBASE_S = 3600.0
+
+# Growth of one series: rss in bytes, rate in MB per minute, r2 the fit of
+# the weighted regression line, growing_s how long the rate has held
+Trend = namedtuple("Trend", ["key", "name", "rss", "rate_mb_min", "r2", "samples", "span_s",
+                             "growing_s", "leaking"])
+
+
+class _Series:
+    """Exponentially weighted least-squares sums of (time, MB) for one key"""
+    __slots__ = ("name", "first", "started", "origin", "last", "rss", "samples", "sw", "sx", "sy", "sxx", "sxy",
+                 "syy", "growing_since", "leaking", "generation")
+
+    def __init__(self, name, now, started=None):
+        self.name = name
+        self.first = now
+        self.started = min(started, now) if started is not None else now
+        self.origin = now
+        self.last = None
+        self.rss = 0
+        self.samples = 0
+        self.sw = self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+        self.growing_since = None
+        self.leaking = False
+        self.generation = 0
+
+    def add(self, now, rss, half_life):
+        if self.last is not None:
+            dt = now - self.last
+            if dt <= 0:
+                return
+            decay = 0.5 ** (dt / half_life)
+            self.sw *= decay
+            self.sx *= decay
+            self.sy *= decay
+            self.sxx *= decay
+            self.sxy *= decay
+            self.syy *= decay
+        if now - self.origin > REBASE_S:
+            self._rebase(now)
+        x = now - self.origin
+        y = rss / (1024 * 1024)
+        self.sw += 1.0
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        self.syy += y * y
+        self.last = now
+        self.rss = rss
+        self.samples += 1
+
+    def fit(self):
+        """(slope in MB per second, R²) of the weighted regression line"""
+        var_x = self.sw * self.sxx - self.sx * self.sx
+        if var_x <= 1e-9:
+            return 0.0, 0.0
+        cov = self.sw * self.sxy - self.sx * self.sy
+        var_y = self.sw * self.syy - self.sy * self.sy
+        r2 = cov * cov / (var_x * var_y) if var_y > 1e-12 else 0.0
+        return cov / var_x, min(r2, 1.0)
+
+    def _rebase(self, now):
+        shift = now - self.origin
+        self.sxx += -2 * shift * self.sx + shift * shift * self.sw
+        self.sxy -= shift * self.sy
+        self.sx -= shift * self.sw
+        self.origin = now
+
+
+class LeakDetector:
+    """
+    Flags processes (or applications) whose memory keeps growing.
+    Each series keeps O(1) state: exponentially weighted sums for an online
+    linear regression of RSS over time, so an update costs the same however
+    long a process has run. A series is flagged once its rate stays above
+    rate_mb_min, with a good enough fit (min_r2), for sustain_s; it is
+    cleared with hysteresis (CLEAR_RATIO). Processes younger than grace_s
+    are not judged; their age counts from their start time when the samples
+    carry one, so a process that was already old when observation began is
+    judged as soon as its growth has held for sustain_s.
+    Series absent from an observe() batch are evicted (the process exited),
+    and at most max_tracked are kept, so thousands of short-lived PIDs
+    cannot grow the state.
+
+    Thread-safe.
+    """
+
+    def __init__(self, rate_mb_min=DEFAULT_RATE_MB_MIN, half_life_s=DEFAULT_HALF_LIFE_S,
+                 min_r2=DEFAULT_MIN_R2, sustain_s=DEFAULT_SUSTAIN_S, grace_s=DEFAULT_GRACE_S,
+                 max_tracked=DEFAULT_MAX_TRACKED):
+        self.rate_mb_min = rate_mb_min
+        self.half_life_s = half_life_s
+        self.min_r2 = min_r2
+        self.sustain_s = sustain_s
+        self.grace_s = grace_s
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._series = {}  # key -> _Series
+        self._generation = 0
+        self._now = None
+        self.observes = 0
+        self.evicted = 0
+        self.last_ms = 0.0
+
+    def observe(self, now, samples):
+        """
+        One sampling pass at time now (seconds): samples is an iterable of
+        (key, name, rss_bytes) or (key, name, rss_bytes, started) covering
+        every live process or app; started is when it started, on the clock
+        of now (None if unknown). Tracked keys missing from it are evicted.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._now = now
+            series = self._series
+            for sample in samples:
+                key, name, rss = sample[:3]
+                if rss is None:
+                    continue
+                s = series.get(key)
+                if s is None or s.name != name:
+                    # New, or a reused PID now running another program
+                    s = series[key] = _Series(name, now, sample[3] if len(sample) > 3 else None)
+                s.generation = generation
+                s.add(now, rss, self.half_life_s)
+                self._judge(s, now)
+
+            gone = [key for key, s in series.items() if s.generation != generation]
+            for key in gone:
+                del series[key]
+            self.evicted += len(gone)
+            if len(series) > self.max_tracked:
+                keep = sorted(series, key=lambda k: series[k].rss, reverse=True)[:self.max_tracked]
+                self.evicted += len(series) - len(keep)
+                self._series = {key: series[key] for key in keep}
+
+            self.observes += 1
+            self.last_ms = (time.perf_counter() - start) * 1000
+
+    def update(self, snapshot):
+        """Per-PID growth from a ProcessSampler pass (for sampler.subscribe)"""
+        offset = time.time() - time.monotonic()  # create_time is wall-clock
+        self.observe(snapshot.taken_at, ((p.pid, p.name, p.rss, p.create_time - offset if p.create_time else None)
+                                         for p in snapshot))
+
+    def trend(self, key):
+        """Trend of key, or None if it is not tracked"""
+        with self._lock:
+            s = self._series.get(key)
+            return self._trend(key, s) if s is not None else None
+
+    def trends(self):
+        """Every tracked series, fastest growing first"""
+        with self._lock:
+            trends = [self._trend(key, s) for key, s in self._series.items()]
+        return sorted(trends, key=lambda t: t.rate_mb_min, reverse=True)
+
+    def leaks(self):
+        """The flagged series, fastest growing first"""
+        with self._lock:
+            trends = [self._trend(key, s) for key, s in self._series.items() if s.leaking]
+        return sorted(trends, key=lambda t: t.rate_mb_min, reverse=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "observes": self.observes,
+                "tracked": len(self._series),
+                "leaking": sum(1 for s in self._series.values() if s.leaking),
+                "evicted": self.evicted,
+                "last_ms": self.last_ms,
+            }
+
+    # --- internals ----------------------------------------------------------
+
+    def _judge(self, s, now):
+        if s.samples < MIN_SAMPLES or now - s.started < self.grace_s:
+            return
+        slope, r2 = s.fit()
+        rate = slope * 60
+        if rate >= self.rate_mb_min and r2 >= self.min_r2:
+            if s.growing_since is None:
+                s.growing_since = now
+        elif rate < self.rate_mb_min * CLEAR_RATIO or r2 < self.min_r2 * CLEAR_RATIO:
+            s.growing_since = None
+        s.leaking = s.growing_since is not None and now - s.growing_since >= self.sustain_s
+
+    def _trend(self, key, s):
+        slope, r2 = s.fit()
+        growing = self._now - s.growing_since if s.growing_since is not None else 0.0
+        return Trend(key, s.name, s.rss, slope * 60, r2, s.samples, (s.last or s.first) - s.first,
+                     growing, s.leaking)
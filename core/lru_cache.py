@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by total cost.
+    Each entry has a cost (1 by default, or e.g. bytes of pixel data); the
+    oldest entries are evicted once the sum exceeds max_cost.
+    """
+
+    def __init__(self, max_cost):
+        self.max_cost = max_cost
+        self._data = OrderedDict()  # key -> (value, cost)
+        self._cost = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key, default=None):
+        """Like get() but without touching recency or the hit/miss counters"""
+        with self._lock:
+            entry = self._data.get(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key, value, cost=1):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._cost -= old[1]
+            if cost > self.max_cost:
+                return  # would evict everything else and still not fit
+            self._data[key] = (value, cost)
+            self._cost += cost
+            while self._cost > self.max_cost:
+                _, (_, evicted_cost) = self._data.popitem(last=False)
+                self._cost -= evicted_cost
+                self.evictions += 1
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._cost = 0
+
+    @property
+    def cost(self):
+        return self._cost
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "cost": self._cost,
+            "max_cost": self.max_cost,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,207 @@
+import heapq
+from array import array
+from collections import OrderedDict
+
+# Samples kept per series. Capacity is counted in samples, not time: at the
+# Dashboard's 3 s refresh this is 3 hours, at its 1 s boost 1 hour, and
+# nothing is recorded while the window is hidden
+DEFAULT_CAPACITY = 3600
+# Downsampled levels kept next to the raw samples (samples per bucket)
+DEFAULT_LEVELS = (5, 15, 60)
+# Series kept for processes, as a multiple of the top-N recorded per sample
+TRACKED_FACTOR = 2
+
+
+class RingBuffer:
+    """Fixed-capacity ring of floats backed by an array('d')"""
+    __slots__ = ("capacity", "total", "_data", "_start", "_len")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.total = 0  # values ever appended
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._len = 0
+
+    def append(self, value):
+        if self._len < self.capacity:
+            self._data[(self._start + self._len) % self.capacity] = value
+            self._len += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+        self.total += 1
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self._start + i) % self.capacity]
+
+    def last(self, n):
+        """The newest n values (fewer if not that many), oldest first"""
+        n = min(n, self._len)
+        begin = (self._start + self._len - n) % self.capacity
+        end = begin + n
+        if end <= self.capacity:
+            return self._data[begin:end].tolist()
+        return self._data[begin:].tolist() + self._data[:end - self.capacity].tolist()
+
+    @property
+    def nbytes(self):
+        return self._data.itemsize * self.capacity
+
+
+class _Level:
+    """min/max/avg buckets of `factor` consecutive samples"""
+    __slots__ = ("factor", "mins", "maxs", "avgs", "_min", "_max", "_sum", "_count")
+
+    def __init__(self, factor, capacity):
+        self.factor = factor
+        self.mins = RingBuffer(capacity)
+        self.maxs = RingBuffer(capacity)
+        self.avgs = RingBuffer(capacity)
+        self._count = 0
+
+    def add(self, value):
+        if self._count == 0:
+            self._min = self._max = self._sum = value
+        else:
+            self._min = min(self._min, value)
+            self._max = max(self._max, value)
+            self._sum += value
+        self._count += 1
+        if self._count == self.factor:
+            self.mins.append(self._min)
+            self.maxs.append(self._max)
+            self.avgs.append(self._sum / self._count)
+            self._count = 0
+
+    def partial(self):
+        """(min, max, avg) of the bucket being filled, or None"""
+        if self._count == 0:
+            return None
+        return self._min, self._max, self._sum / self._count
+
+    @property
+    def nbytes(self):
+        return self.mins.nbytes * 3
+
+
+class SeriesHistory:
+    """
+    Bounded history of one metric: the newest `capacity` raw samples plus
+    min/max/avg levels covering the same span at coarser resolution, all
+    updated in O(levels) per append. downsample() reads at most max_points
+    buckets from the coarsest level it needs, so drawing every kept sample
+    costs the same as drawing the last few dozen. Samples are taken as they
+    come: nothing assumes they are evenly spaced in time (times keeps the
+    timestamp of each raw sample).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, levels=DEFAULT_LEVELS):
+        self.capacity = capacity
+        self.times = RingBuffer(capacity)
+        self.values = RingBuffer(capacity)
+        self.levels = [_Level(factor, max(1, capacity // factor)) for factor in sorted(levels)]
+
+    def append(self, timestamp, value):
+        self.times.append(timestamp)
+        self.values.append(value)
+        for level in self.levels:
+            level.add(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def latest(self):
+        return self.values[-1] if len(self.values) else None
+
+    def downsample(self, max_points, span=None):
+        """
+        Covers the newest `span` samples (default: everything kept) with at
+        most max_points points. Returns (factor, end, mins, maxs, avgs):
+        factor is the samples per point and end the number of points ever
+        produced at that level, counting a partially filled newest bucket
+        (so a caller can tell how far the series moved since its last call).
+        """
+        span = min(len(self.values) if span is None else span, self.capacity)
+        if span <= max_points or not self.levels:
+            values = self.values.last(min(span, max_points))
+            return 1, self.values.total, values, values, values
+
+        level = self.levels[-1]
+        for candidate in self.levels:
+            if -(-span // candidate.factor) <= max_points:
+                level = candidate
+                break
+        n = min(-(-span // level.factor), max_points)
+        partial = level.partial()
+        complete = n - 1 if partial is not None else n
+        mins = level.mins.last(complete)
+        maxs = level.maxs.last(complete)
+        avgs = level.avgs.last(complete)
+        if partial is not None:
+            mins.append(partial[0])
+            maxs.append(partial[1])
+            avgs.append(partial[2])
+        return level.factor, level.mins.total + (partial is not None), mins, maxs, avgs
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.values.nbytes + sum(level.nbytes for level in self.levels)
+
+
+class MemoryHistory:
+    """
+    Rolling memory history for the Dashboard: system memory in use (percent
+    and available MB) and RSS of the top-N processes of each sample.
+    Process series are kept for at most TRACKED_FACTOR * top_n PIDs; the
+    one that left the top-N longest ago is dropped first, so memory stays
+    bounded however many processes come and go.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, top_n=10, levels=DEFAULT_LEVELS):
+        self.capacity = capacity
+        self.top_n = top_n
+        self.levels = levels
+        self.max_tracked = top_n * TRACKED_FACTOR
+        self.percent = SeriesHistory(capacity, levels)
+        self.available_mb = SeriesHistory(capacity, levels)
+        self._processes = OrderedDict()  # pid -> (name, SeriesHistory), least recently in top-N first
+
+    def record(self, timestamp, memory, processes):
+        """
+        memory: SystemInfo.get_memory_info() dict
+        processes: [(pid, name, mb), ...]
+        """
+        self.percent.append(timestamp, memory['percent'])
+        self.available_mb.append(timestamp, memory['available'] / (1024 * 1024))
+
+        top = heapq.nlargest(self.top_n, processes, key=lambda p: p[2])
+        for pid, name, mb in top:
+            entry = self._processes.get(pid)
+            if entry is None or entry[0] != name:
+                entry = (name, SeriesHistory(self.capacity, self.levels))
+                self._processes[pid] = entry
+            entry[1].append(timestamp, mb)
+            self._processes.move_to_end(pid)
+        while len(self._processes) > self.max_tracked:
+            self._processes.popitem(last=False)
+
+    def process(self, pid):
+        """(name, SeriesHistory) for a tracked PID, or None"""
+        return self._processes.get(pid)
+
+    def processes(self):
+        """{pid: (name, SeriesHistory)} for every tracked PID"""
+        return dict(self._processes)
+
+    @property
+    def nbytes(self):
+        return (self.percent.nbytes + self.available_mb.nbytes
+                + sum(series.nbytes for _, series in self._processes.values()))
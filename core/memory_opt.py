@@ -1,52 +1,279 @@
-import psutil
 import ctypes
-from ctypes import wintypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+from core.process_sampler import default_sampler
+from core.trim_policy import TrimPolicy
 
 # Define necessary Windows API structures and constants
 PROCESS_SET_QUOTA = 0x0100
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_READ = 0x0010
 
+# Trims run in parallel on this many threads, and stop once the budget is spent
+DEFAULT_WORKERS = 4
+DEFAULT_TIME_BUDGET_S = 5.0
+# How long after a trim the working sets are read again to see what came back
+REFAULT_DELAY_MS = 5000
+
+
+class Win32Trimmer:
+    """Empties a process working set with EmptyWorkingSet (Windows only)"""
+
+    def trim(self, pid):
+        """Returns True if the working set was emptied"""
+        try:
+            handle = ctypes.windll.kernel32.OpenProcess(
+                PROCESS_SET_QUOTA | PROCESS_QUERY_INFORMATION, False, pid
+            )
+            if not handle:
+                return False
+
+            result = ctypes.windll.psapi.EmptyWorkingSet(handle)
+            ctypes.windll.kernel32.CloseHandle(handle)
+            return result != 0
+        except Exception:
+            return False
+
+
+class PsutilMemoryProbe:
+    """
+    Reads the figures an optimize report is built from: a process's resident
+    set (its working set on Windows) and system available memory.
+    """
+
+    def rss(self, pid, name=None):
+        """
+        Resident bytes of pid, or None if it is gone or not readable; also
+        None when name is given and the PID now runs another program (reused)
+        """
+        try:
+            proc = psutil.Process(pid)
+            if name is not None and proc.name() != name:
+                return None
+            return proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def available(self):
+        return psutil.virtual_memory().available
+
+
+class ProcessTrim:
+    """
+    Outcome for one candidate in an OptimizeReport.
+    status: "trimmed", "failed" (access denied or gone), "skipped" (budget
+    ran out or the run was cancelled first) or "planned" (dry run).
+    """
+    __slots__ = ("pid", "name", "status", "before", "after", "expected_gain", "later")
+
+    def __init__(self, pid, name, status, before, after, expected_gain=0):
+        self.pid = pid
+        self.name = name
+        self.status = status
+        self.before = before
+        self.after = after
+        self.expected_gain = expected_gain
+        self.later = None  # filled in by measure_refault()
+
+    @property
+    def ok(self):
+        return self.status == "trimmed"
+
+    @property
+    def trimmed(self):
+        if not self.ok or self.before is None or self.after is None:
+            return 0
+        return max(0, self.before - self.after)
+
+    @property
+    def refaulted(self):
+        if self.later is None or self.after is None:
+            return 0
+        return min(max(0, self.later - self.after), self.trimmed)
+
+    def to_dict(self):
+        return {"pid": self.pid, "name": self.name, "status": self.status, "before": self.before,
+                "after": self.after, "later": self.later, "trimmed": self.trimmed,
+                "expected_gain": self.expected_gain}
+
+
+class OptimizeReport:
+    """
+    Measured result of one optimize run.
+    trimmed_bytes sums the per-process working-set drops; reclaimed_bytes is
+    the change in system available memory, which also reflects everything
+    else the machine did meanwhile. refault_rate is the share of the trimmed
+    bytes that was paged back in by the time measure_refault() ran.
+    """
+
+    def __init__(self, processes, available_before, available_after, duration_ms,
+                 dry_run=False, cancelled=False, timed_out=False):
+        self.processes = processes
+        self.available_before = available_before
+        self.available_after = available_after
+        self.duration_ms = duration_ms
+        self.dry_run = dry_run
+        self.cancelled = cancelled
+        self.timed_out = timed_out
+        self.refault_measured = False
+
+    def _count(self, status):
+        return sum(1 for p in self.processes if p.status == status)
+
+    @property
+    def success_count(self):
+        return self._count("trimmed")
+
+    @property
+    def fail_count(self):
+        return self._count("failed")
+
+    @property
+    def skipped_count(self):
+        return self._count("skipped")
+
+    @property
+    def expected_bytes(self):
+        """Policy estimate of the gain over every candidate"""
+        return sum(p.expected_gain for p in self.processes)
+
+    @property
+    def trimmed_bytes(self):
+        return sum(p.trimmed for p in self.processes)
+
+    @property
+    def reclaimed_bytes(self):
+        return self.available_after - self.available_before
+
+    @property
+    def refaulted_bytes(self):
+        return sum(p.refaulted for p in self.processes)
+
+    @property
+    def refault_rate(self):
+        """None until measure_refault() has run"""
+        if not self.refault_measured:
+            return None
+        trimmed = self.trimmed_bytes
+        return self.refaulted_bytes / trimmed if trimmed else 0.0
+
+    def top(self, n=10):
+        """Processes that gave back the most, largest first"""
+        return sorted((p for p in self.processes if p.trimmed), key=lambda p: p.trimmed, reverse=True)[:n]
+
+    def to_dict(self):
+        return {
+            "duration_ms": self.duration_ms,
+            "dry_run": self.dry_run,
+            "cancelled": self.cancelled,
+            "timed_out": self.timed_out,
+            "success_count": self.success_count,
+            "fail_count": self.fail_count,
+            "skipped_count": self.skipped_count,
+            "expected_bytes": self.expected_bytes,
+            "trimmed_bytes": self.trimmed_bytes,
+            "available_before": self.available_before,
+            "available_after": self.available_after,
+            "reclaimed_bytes": self.reclaimed_bytes,
+            "refaulted_bytes": self.refaulted_bytes if self.refault_measured else None,
+            "refault_rate": self.refault_rate,
+            "processes": [p.to_dict() for p in self.processes],
+        }
+
+
 class MemoryOptimizer:
     @staticmethod
-    def optimize_memory():
+    def optimize(snapshot=None, trimmer=None, probe=None, policy=None, activity=None,
+                 dry_run=False, cancel=None, max_workers=DEFAULT_WORKERS,
+                 time_budget_s=DEFAULT_TIME_BUDGET_S, progress=None):
         """
-        Attempts to reduce memory usage by emptying the working set 
-        for all accessible processes.
-        Returns a tuple: (freed_memory_estimate_mb, success_count, fail_count)
-        Note: Exact freed memory is hard to calculate without snapshots, 
-        so we'll return the number of processes optimized.
+        Empties the working sets of the processes chosen by policy and
+        measures the result.
+        snapshot: ProcessSnapshot to choose from; defaults to the shared
+        sampler's most recent pass (at most DEFAULT_MAX_AGE old).
+        trimmer / probe: default to Win32Trimmer / PsutilMemoryProbe and can
+        be replaced to exercise the engine elsewhere.
+        policy / activity: TrimPolicy (defaults apply) and an optional
+        ActivityTracker for its idle rule.
+        Candidates are trimmed largest expected gain first on max_workers
+        threads. Workers stop taking new ones once time_budget_s is spent or
+        the cancel Event is set; the rest are reported as skipped. dry_run
+        reads the working sets but trims nothing. progress(done, total) is
+        called from the worker threads.
+        Returns an OptimizeReport; call measure_refault() on it a few seconds
+        later (REFAULT_DELAY_MS) to see how much memory came straight back.
         """
-        success_count = 0
-        fail_count = 0
-        
-        # Helper to call EmptyWorkingSet
-        def empty_working_set(pid):
-            try:
-                handle = ctypes.windll.kernel32.OpenProcess(
-                    PROCESS_SET_QUOTA | PROCESS_QUERY_INFORMATION, False, pid
-                )
-                if not handle:
-                    return False
-                
-                result = ctypes.windll.psapi.EmptyWorkingSet(handle)
-                ctypes.windll.kernel32.CloseHandle(handle)
-                return result != 0
-            except Exception:
-                return False
+        trimmer = trimmer or Win32Trimmer()
+        probe = probe or PsutilMemoryProbe()
+        policy = policy or TrimPolicy()
+        if snapshot is None:
+            snapshot = default_sampler().snapshot()
+
+        start = time.perf_counter()
+        deadline = start + time_budget_s
+        candidates = policy.select(snapshot, activity)
+        results = [None] * len(candidates)
+        remaining = iter(range(len(candidates)))
+        lock = threading.Lock()
+        done = [0]
 
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                pid = proc.info['pid']
-                if pid == 0 or pid == 4: # Skip System Idle and System
-                    continue
-                
-                if empty_working_set(pid):
-                    success_count += 1
+        def worker():
+            while not (cancel is not None and cancel.is_set()) and time.perf_counter() < deadline:
+                with lock:
+                    i = next(remaining, None)
+                if i is None:
+                    return
+                c = candidates[i]
+                before = probe.rss(c.pid, c.name)
+                if dry_run:
+                    results[i] = ProcessTrim(c.pid, c.name, "planned", before, before, c.expected_gain)
                 else:
-                    fail_count += 1
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                fail_count += 1
-                continue
-                
-        return success_count, fail_count
+                    try:
+                        ok = trimmer.trim(c.pid)
+                    except Exception:
+                        ok = False
+                    after = probe.rss(c.pid, c.name) if ok else before
+                    results[i] = ProcessTrim(c.pid, c.name, "trimmed" if ok else "failed",
+                                             before, after, c.expected_gain)
+                if progress is not None:
+                    with lock:
+                        done[0] += 1
+                        count = done[0]
+                    progress(count, len(candidates))
+
+        available_before = probe.available()
+        workers = max(1, min(max_workers, len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trim") as pool:
+            for future in [pool.submit(worker) for _ in range(workers)]:
+                future.result()
+        available_after = probe.available()
+
+        processes = [r if r is not None else ProcessTrim(c.pid, c.name, "skipped", c.rss, c.rss, c.expected_gain)
+                     for c, r in zip(candidates, results)]
+        cancelled = cancel is not None and cancel.is_set()
+        timed_out = not cancelled and any(r is None for r in results)
+        return OptimizeReport(processes, available_before, available_after,
+                              (time.perf_counter() - start) * 1000, dry_run, cancelled, timed_out)
+
+    @staticmethod
+    def measure_refault(report, probe=None):
+        """Re-reads the trimmed processes' working sets into the report"""
+        probe = probe or PsutilMemoryProbe()
+        for p in report.processes:
+            if p.trimmed:
+                p.later = probe.rss(p.pid, p.name)
+        report.refault_measured = True
+        return report
+
+    @staticmethod
+    def optimize_memory(snapshot=None):
+        """
+        Attempts to reduce memory usage by emptying the working set
+        of the processes the default TrimPolicy selects.
+        Returns a tuple: (success_count, fail_count); use optimize() for the
+        measured report.
+        """
+        report = MemoryOptimizer.optimize(snapshot)
+        return report.success_count, report.fail_count
@@ -1,5 +1,143 @@
+import os
 import psutil
 
+# Common mappings (manual overrides for popular apps): app name substring -> process name
+APP_PROCESS_MAPPINGS = {
+    'google chrome': 'chrome',
+    'microsoft edge': 'msedge',
+    'firefox': 'firefox',
+    'discord': 'discord',
+    'spotify': 'spotify',
+    'notepad': 'notepad',
+    'calculator': 'calculator',
+    'visual studio code': 'code',
+    'vlc media player': 'vlc',
+}
+
+
+def normalize_dir(path):
+    """
+    Normalizes a directory or file path for prefix comparison:
+    lower case, forward slashes, trailing slash.
+    """
+    path = str(path or "").strip().strip('"').replace("\\", "/").lower()
+    return path.rstrip("/") + "/" if path else ""
+
+
+def _generic_dirs():
+    """Shared directories that must never identify a single app"""
+    env = os.environ
+    windir = env.get("WINDIR", r"C:\Windows")
+    dirs = [
+        windir, os.path.join(windir, "System32"), os.path.join(windir, "SysWOW64"),
+        os.path.join(windir, "Installer"),
+        env.get("ProgramFiles", r"C:\Program Files"),
+        env.get("ProgramFiles(x86)", r"C:\Program Files (x86)"),
+        env.get("CommonProgramFiles", r"C:\Program Files\Common Files"),
+        env.get("CommonProgramFiles(x86)", r"C:\Program Files (x86)\Common Files"),
+        env.get("ProgramData", r"C:\ProgramData"),
+        env.get("APPDATA", ""), env.get("LOCALAPPDATA", ""),
+        os.path.join(env.get("LOCALAPPDATA", ""), "Programs") if env.get("LOCALAPPDATA") else "",
+        # POSIX equivalents, so the index behaves the same when exercised on Linux
+        "/usr/bin", "/usr/sbin", "/bin", "/sbin", "/usr/lib", "/usr/local/bin", "/opt",
+    ]
+    return {normalize_dir(d) for d in dirs if d}
+
+
+GENERIC_DIRS = _generic_dirs()
+
+
+class InstallPathIndex:
+    """
+    Maps executable paths to installed apps by install directory.
+    Directories are kept in a dict keyed by normalized path; a lookup walks the
+    exe's ancestor directories from the deepest up, so the longest matching
+    install directory wins in O(path depth).
+    """
+
+    def __init__(self, apps=()):
+        self._dirs = {}  # normalized dir -> app name
+        for app in apps:
+            self.add_app(app)
+
+    def add_app(self, app):
+        for directory in (app.install_location, app.icon_dir):
+            self.add(app.name, directory)
+
+    def add(self, app_name, directory):
+        key = normalize_dir(directory)
+        # Drive roots and shared system dirs are too broad
+        if not key or key in GENERIC_DIRS or key.strip("/").count("/") < 1:
+            return
+        self._dirs.setdefault(key, app_name)
+
+    def lookup(self, exe_path):
+        """Returns the app name owning exe_path, or None"""
+        path = normalize_dir(exe_path)
+        cut = path.rfind("/", 0, len(path) - 1)
+        while cut > 0:
+            path = path[:cut + 1]
+            app_name = self._dirs.get(path)
+            if app_name is not None:
+                return app_name
+            cut = path.rfind("/", 0, len(path) - 1)
+        return None
+
+    def attribute(self, process_exes):
+        """
+        Groups processes by owning app.
+        process_exes: {pid: exe_path}; returns {app_name: [pid, ...]}
+        """
+        owned = {}
+        for pid, exe in process_exes.items():
+            if not exe:
+                continue
+            app_name = self.lookup(exe)
+            if app_name is not None:
+                owned.setdefault(app_name, []).append(pid)
+        return owned
+
+    def __len__(self):
+        return len(self._dirs)
+
+
+class MatchIndex:
+    """
+    Precomputed lookup structure for matching many apps against one process
+    snapshot. Gives the same results as ProcessMatcher.find_pids_for_app but
+    costs O(words in app name) per app instead of O(running processes).
+    """
+
+    def __init__(self, running_procs, mappings=None):
+        self.running_procs = running_procs
+        mappings = APP_PROCESS_MAPPINGS if mappings is None else mappings
+        # Only mapping rules whose target process is running can ever match
+        self._rules = [(key, running_procs[val]) for key, val in mappings.items() if val in running_procs]
+
+    def match(self, app_name):
+        """Returns the list of pids attributed to app_name"""
+        app_name_clean = app_name.lower()
+
+        # Check explicit mapping first
+        matched = set()
+        for key, pids in self._rules:
+            if key in app_name_clean:
+                matched.update(pids)
+        if matched:
+            return list(matched)
+
+        # Fallback: exact word match, or process name == app name minus spaces.
+        # Process names are the keys of running_procs, so both checks are hash lookups.
+        for word in set(app_name_clean.split()):
+            pids = self.running_procs.get(word)
+            if pids:
+                matched.update(pids)
+        pids = self.running_procs.get(app_name_clean.replace(" ", ""))
+        if pids:
+            matched.update(pids)
+        return list(matched)
+
+
 class ProcessMatcher:
     @staticmethod
     def get_running_processes():
@@ -19,30 +157,63 @@ class ProcessMatcher:
                 pass
         return procs
 
+    @staticmethod
+    def get_process_exes():
+        """
+        Returns a dictionary of {pid: exe_path} for processes whose
+        executable path is readable.
+        """
+        exes = {}
+        for p in psutil.process_iter(['pid', 'exe'], ad_value=None):
+            try:
+                if p.info['exe']:
+                    exes[p.info['pid']] = p.info['exe']
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        return exes
+
+    @staticmethod
+    def attribute_apps(apps, running_procs, process_exes):
+        """
+        Attributes running processes to installed apps.
+        Processes are first matched by exe path against each app's install
+        directories; apps that own no process that way fall back to the name
+        heuristics, minus pids already claimed by another app's path.
+        Returns {app_name: [pid, ...]}.
+        """
+        owned = InstallPathIndex(apps).attribute(process_exes)
+        claimed = {pid for pids in owned.values() for pid in pids}
+        index = MatchIndex(running_procs)
+        result = {}
+        for app in apps:
+            name = app.name
+            if name in owned:
+                result[name] = owned[name]
+            else:
+                result[name] = [pid for pid in index.match(name) if pid not in claimed]
+        return result
+
+    @staticmethod
+    def match_all(app_names, running_procs):
+        """
+        Batch version of find_pids_for_app.
+        Returns {app_name: [pid, ...]} for every name in app_names.
+        """
+        index = MatchIndex(running_procs)
+        return {name: index.match(name) for name in app_names}
+
     @staticmethod
     def find_pids_for_app(app_name, running_procs):
         """
         Tries to find pids for a given app name (registry display name).
         Simple heuristic: check if process name is part of app name or vice versa.
+        Prefer match_all / MatchIndex when matching a whole inventory.
         """
         app_name_clean = app_name.lower()
         matched_pids = []
         
-        # Common mappings (manual overrides for popular apps)
-        mappings = {
-            'google chrome': 'chrome',
-            'microsoft edge': 'msedge',
-            'firefox': 'firefox',
-            'discord': 'discord',
-            'spotify': 'spotify',
-            'notepad': 'notepad',
-            'calculator': 'calculator',
-            'visual studio code': 'code',
-            'vlc media player': 'vlc',
-        }
-        
         # Check explicit mapping first
-        for key, val in mappings.items():
+        for key, val in APP_PROCESS_MAPPINGS.items():
             if key in app_name_clean:
                 if val in running_procs:
                     matched_pids.extend(running_procs[val])
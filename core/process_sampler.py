@@ -0,0 +1,238 @@
+import threading
+import time
+from collections import namedtuple
+import psutil
+
+# One process as seen by a sampling pass; rss and cpu_time (user + system
+# seconds) are None when access is denied, create_time (epoch seconds) when
+# it could not be read
+ProcessSample = namedtuple("ProcessSample", ["pid", "name", "exe", "rss", "ppid", "cpu_time", "create_time"],
+                           defaults=(None, None))
+
+# Consumers asking for a snapshot accept one at most this old (seconds)
+DEFAULT_MAX_AGE = 1.0
+
+
+class ProcessSnapshot:
+    """
+    Immutable result of one pass over the process table.
+    The helpers return the shapes the older per-consumer walks produced, so
+    callers can switch to a shared snapshot without changing their logic.
+    """
+    __slots__ = ("processes", "taken_at", "duration_ms", "_by_pid")
+
+    def __init__(self, processes, taken_at, duration_ms):
+        self.processes = tuple(processes)
+        self.taken_at = taken_at
+        self.duration_ms = duration_ms
+        self._by_pid = {p.pid: p for p in self.processes}
+
+    def __len__(self):
+        return len(self.processes)
+
+    def __iter__(self):
+        return iter(self.processes)
+
+    def get(self, pid):
+        return self._by_pid.get(pid)
+
+    def pids(self):
+        return [p.pid for p in self.processes]
+
+    def age(self):
+        return time.monotonic() - self.taken_at
+
+    def started_at(self, pids):
+        """
+        When the earliest of pids started, on the clock of taken_at
+        (time.monotonic()); None if no start time is known
+        """
+        times = [p.create_time for p in map(self._by_pid.get, pids) if p is not None and p.create_time is not None]
+        return min(times) - (time.time() - time.monotonic()) if times else None
+
+    def running_processes(self):
+        """{process_name_lower: [pid, ...]}, as ProcessMatcher.get_running_processes"""
+        procs = {}
+        for p in self.processes:
+            if p.name:
+                procs.setdefault(p.name.lower().replace('.exe', ''), []).append(p.pid)
+        return procs
+
+    def process_exes(self):
+        """{pid: exe_path}, as ProcessMatcher.get_process_exes"""
+        return {p.pid: p.exe for p in self.processes if p.exe}
+
+
+class _Handle:
+    """A cached psutil.Process plus the attributes that do not change per tick"""
+    __slots__ = ("proc", "name", "exe", "ppid", "create_time")
+
+    def __init__(self, proc):
+        self.proc = proc
+        self.name = None
+        self.exe = None
+        self.ppid = None
+        self.create_time = None
+
+
+class ProcessSampler:
+    """
+    Shared process-table sampler.
+    A pass lists the PIDs once and reads each live process through a cached
+    psutil.Process handle: memory and CPU time every time; name, exe and
+    parent only when the PID is first seen. Handles of PIDs missing from a
+    pass are pruned, so a PID reused between two passes is the only case
+    that reads stale names. Each pass produces an immutable ProcessSnapshot
+    that is handed to subscribers and reused by snapshot() callers until it
+    is older than their max_age.
+
+    Thread-safe: passes are serialized, so concurrent callers share one,
+    and subscribers see the snapshots in the order they were taken.
+    """
+
+    def __init__(self):
+        self._handles = {}  # pid -> _Handle
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._subscribers = []
+        # Reentrant: a subscriber may itself ask for a new pass
+        self._deliver_lock = threading.RLock()
+        self._delivered = None
+        self.dropped_deliveries = 0
+        self.passes = 0
+        self.last_pass_ms = 0.0
+        self.total_pass_ms = 0.0
+        self.handles_created = 0
+        self.handles_pruned = 0
+
+    def sample(self):
+        """Takes a new pass, publishes it and returns the snapshot"""
+        return self.snapshot(max_age=-1)
+
+    def snapshot(self, max_age=DEFAULT_MAX_AGE):
+        """Returns the latest snapshot, taking a new pass if it is older than max_age seconds"""
+        with self._lock:
+            # Callers that waited on another thread's pass reuse its result
+            if self._snapshot is not None and self._snapshot.age() <= max_age:
+                return self._snapshot
+            snapshot = self._pass()
+            self._snapshot = snapshot
+        self._deliver(snapshot)
+        return snapshot
+
+    def latest(self):
+        """The last published snapshot (None before the first pass)"""
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """
+        callback(snapshot) runs on the sampling thread after every pass,
+        in pass order
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _deliver(self, snapshot):
+        """
+        Hands snapshot to the subscribers, outside the pass lock so a slow
+        subscriber does not hold up snapshot() callers. Deliveries are
+        serialized and never go backwards: a snapshot older than the last one
+        delivered (its thread lost the race to the delivery lock) is dropped,
+        and a delivery stops once a subscriber has caused a newer one.
+        """
+        with self._deliver_lock:
+            if self._delivered is not None and snapshot.taken_at <= self._delivered.taken_at:
+                self.dropped_deliveries += 1
+                return
+            self._delivered = snapshot
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for callback in subscribers:
+                if self._delivered is not snapshot:
+                    break
+                callback(snapshot)
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            "passes": self.passes,
+            "last_pass_ms": self.last_pass_ms,
+            "avg_pass_ms": self.total_pass_ms / self.passes if self.passes else 0.0,
+            "process_count": len(snapshot) if snapshot is not None else 0,
+            "handles": len(self._handles),
+            "handles_created": self.handles_created,
+            "handles_pruned": self.handles_pruned,
+            "dropped_deliveries": self.dropped_deliveries,
+        }
+
+    def _pass(self):
+        start = time.perf_counter()
+        pids = psutil.pids()
+        live = set(pids)
+        for pid in [pid for pid in self._handles if pid not in live]:
+            del self._handles[pid]
+            self.handles_pruned += 1
+
+        samples = []
+        for pid in pids:
+            sample = self._read(pid)
+            if sample is not None:
+                samples.append(sample)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.passes += 1
+        self.last_pass_ms = elapsed
+        self.total_pass_ms += elapsed
+        return ProcessSnapshot(samples, time.monotonic(), elapsed)
+
+    def _read(self, pid):
+        handle = self._handles.get(pid)
+        try:
+            if handle is None:
+                handle = _Handle(psutil.Process(pid))
+                self._handles[pid] = handle
+                self.handles_created += 1
+            proc = handle.proc
+            if handle.name is None:
+                with proc.oneshot():
+                    handle.name = proc.name()
+                    handle.ppid = proc.ppid()
+                    try:
+                        handle.create_time = proc.create_time()
+                    except (psutil.AccessDenied, OSError):
+                        handle.create_time = None
+                    try:
+                        handle.exe = proc.exe() or None
+                    except (psutil.AccessDenied, OSError):
+                        handle.exe = None
+            with proc.oneshot():
+                try:
+                    rss = proc.memory_info().rss
+                    cpu = proc.cpu_times()
+                    cpu_time = cpu.user + cpu.system
+                except psutil.AccessDenied:
+                    rss = cpu_time = None
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self._handles.pop(pid, None)
+            return None
+        except psutil.AccessDenied:
+            return ProcessSample(pid, handle.name if handle else None, None, None, None)
+        return ProcessSample(pid, handle.name, handle.exe, rss, handle.ppid, cpu_time, handle.create_time)
+
+
+_default_sampler = None
+_default_lock = threading.Lock()
+
+
+def default_sampler():
+    """The process-wide sampler shared by the Dashboard, AppList and MemoryOptimizer"""
+    global _default_sampler
+    with _default_lock:
+        if _default_sampler is None:
+            _default_sampler = ProcessSampler()
+        return _default_sampler
@@ -0,0 +1,262 @@
+import os
+import time
+import psutil
+from core.trim_policy import PROTECTED_PIDS
+
+# How long processes get to exit after the terminate request...
+DEFAULT_TIMEOUT_S = 3.0
+# ...and after the kill sent to the survivors
+DEFAULT_KILL_TIMEOUT_S = 2.0
+# Zombies are looked for this often while waiting
+WAIT_SLICE_S = 0.1
+
+
+class ProcessExit:
+    """
+    Outcome for one process in a TerminationReport.
+    status: "terminated" (exited after the terminate request), "killed"
+    (exited only after kill), "gone" (had already exited, or its PID now
+    belongs to another program), "denied" (no permission), "survived"
+    (still running after kill) or "protected" (DustOff itself or one of its
+    parents, never signalled).
+    """
+    __slots__ = ("pid", "name", "parent", "status", "returncode", "exit_ms", "error")
+
+    def __init__(self, pid, name, parent, status=None):
+        self.pid = pid
+        self.name = name
+        self.parent = parent  # PID it was collected under, None for the PIDs asked for
+        self.status = status
+        self.returncode = None
+        self.exit_ms = None  # time from the first signal to the exit being seen
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.status in ("terminated", "killed", "gone")
+
+    def to_dict(self):
+        return {"pid": self.pid, "name": self.name, "parent": self.parent, "status": self.status,
+                "returncode": self.returncode, "exit_ms": self.exit_ms, "error": self.error}
+
+
+class TerminationReport:
+    """
+    Result of one terminate() run, in collection order: the PIDs asked for
+    first, then their descendants.
+    """
+
+    def __init__(self, processes, duration_ms):
+        self.processes = processes
+        self.duration_ms = duration_ms
+
+    def _count(self, *statuses):
+        return sum(1 for p in self.processes if p.status in statuses)
+
+    @property
+    def stopped_count(self):
+        """Processes that are no longer running, whether or not they needed kill"""
+        return self._count("terminated", "killed", "gone")
+
+    @property
+    def killed_count(self):
+        return self._count("killed")
+
+    @property
+    def failed(self):
+        """Processes still running: denied, survived or protected"""
+        return [p for p in self.processes if not p.ok]
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def to_dict(self):
+        return {
+            "duration_ms": self.duration_ms,
+            "stopped_count": self.stopped_count,
+            "killed_count": self.killed_count,
+            "failed_count": len(self.failed),
+            "processes": [p.to_dict() for p in self.processes],
+        }
+
+
+class ProcessTerminator:
+    @staticmethod
+    def protected_pids():
+        """System processes, DustOff and its parents (e.g. the terminal it runs in)"""
+        pids = {*PROTECTED_PIDS, os.getpid()}
+        try:
+            pids.update(p.pid for p in psutil.Process().parents())
+        except psutil.Error:
+            pass
+        return pids
+
+    @staticmethod
+    def collect_tree(pids, names=None, include_children=True):
+        """
+        ([(psutil.Process, ProcessExit), ...] to signal, [ProcessExit, ...]
+        for every process in collection order) for pids and, with
+        include_children, all their descendants, each once. names:
+        {pid: process name} as seen when the PIDs were chosen; a PID now
+        running under another name was reused and is reported "gone"
+        instead of being signalled.
+        """
+        names = names or {}
+        protected = ProcessTerminator.protected_pids()
+        targets = []
+        entries = []
+        seen = set()
+
+        def add(proc, parent, name):
+            seen.add(proc.pid)
+            entry = ProcessExit(proc.pid, name, parent)
+            entries.append(entry)
+            if proc.pid in protected:
+                entry.status = "protected"
+            else:
+                targets.append((proc, entry))
+
+        for pid in pids:
+            if pid in seen:
+                continue
+            expected = names.get(pid)
+            proc = name = None
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name()
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                proc = None
+            except psutil.AccessDenied as e:
+                if proc is None:
+                    seen.add(pid)
+                    entry = ProcessExit(pid, expected, None, "denied")
+                    entry.error = str(e) or "access denied"
+                    entries.append(entry)
+                    continue
+                name = expected
+            if proc is None or (expected is not None and name != expected):
+                seen.add(pid)
+                entries.append(ProcessExit(pid, expected or name, None, "gone"))
+                continue
+            add(proc, None, name)
+
+        if include_children:
+            # Descendants come after every PID asked for, so parents are
+            # signalled first and cannot respawn children already stopped
+            for proc, entry in list(targets):
+                for child in ProcessTerminator._children(proc):
+                    if child.pid not in seen:
+                        add(child, entry.pid, ProcessTerminator._name(child))
+        return targets, entries
+
+    @staticmethod
+    def terminate(pids, names=None, include_children=True, timeout_s=DEFAULT_TIMEOUT_S,
+                  kill_timeout_s=DEFAULT_KILL_TIMEOUT_S, progress=None):
+        """
+        Stops pids together with their process trees.
+        Every process is asked to terminate at once (SIGTERM; on Windows
+        terminate() already ends the process), then psutil.wait_procs()
+        waits up to timeout_s for all of them together. Children that
+        survivors started meanwhile are added, and whatever is still running
+        is killed and waited for up to kill_timeout_s.
+        progress(done, total) is called as processes exit, from the calling
+        thread.
+        Returns a TerminationReport with a ProcessExit per PID.
+        """
+        start = time.perf_counter()
+        targets, processes = ProcessTerminator.collect_tree(pids, names, include_children)
+        entries = {proc.pid: entry for proc, entry in targets}
+        total = len(processes)
+        done = [total - len(targets)]
+
+        def report_exit(proc, status):
+            entry = entries[proc.pid]
+            entry.status = status
+            entry.returncode = getattr(proc, "returncode", None)  # set by wait_procs()
+            entry.exit_ms = (time.perf_counter() - start) * 1000
+            done[0] += 1
+            if progress is not None:
+                progress(done[0], total)
+
+        waiting = ProcessTerminator._signal(targets, "terminate", report_exit)
+        alive = ProcessTerminator._wait(waiting, timeout_s, lambda p: report_exit(p, "terminated"))
+
+        if alive:
+            if include_children:
+                # Helpers started after the tree was collected (e.g. respawned)
+                for proc in list(alive):
+                    for child in ProcessTerminator._children(proc):
+                        if child.pid not in entries:
+                            entry = entries[child.pid] = ProcessExit(child.pid, ProcessTerminator._name(child),
+                                                                     proc.pid)
+                            processes.append(entry)
+                            alive.append(child)
+                            total += 1
+            waiting = ProcessTerminator._signal([(proc, entries[proc.pid]) for proc in alive], "kill", report_exit)
+            alive = ProcessTerminator._wait(waiting, kill_timeout_s, lambda p: report_exit(p, "killed"))
+        for proc in alive:
+            entries[proc.pid].status = "survived"
+        return TerminationReport(processes, (time.perf_counter() - start) * 1000)
+
+    # --- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _name(proc):
+        try:
+            return proc.name()
+        except psutil.Error:
+            return None
+
+    @staticmethod
+    def _children(proc):
+        try:
+            return proc.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    @staticmethod
+    def _wait(procs, timeout_s, on_exit):
+        """
+        Waits up to timeout_s for procs to exit, calling on_exit(proc) for
+        each; returns the ones still running. Zombies (exited, but not
+        reaped by their parent yet) count as exited: wait_procs() alone
+        would wait for them until the timeout.
+        """
+        alive = list(procs)
+        deadline = time.monotonic() + timeout_s
+        while alive:
+            _, alive = psutil.wait_procs(alive, timeout=max(0.0, min(WAIT_SLICE_S, deadline - time.monotonic())),
+                                         callback=on_exit)
+            still = []
+            for proc in alive:
+                try:
+                    zombie = proc.status() == psutil.STATUS_ZOMBIE
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    zombie = True
+                except psutil.AccessDenied:
+                    zombie = False
+                if zombie:
+                    on_exit(proc)
+                else:
+                    still.append(proc)
+            alive = still
+            if time.monotonic() >= deadline:
+                break
+        return alive
+
+    @staticmethod
+    def _signal(targets, method, report_exit):
+        """Sends terminate or kill to every target; returns those to wait for"""
+        waiting = []
+        for proc, entry in targets:
+            try:
+                getattr(proc, method)()
+                waiting.append(proc)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                # Exited before the signal, e.g. as part of its parent's shutdown
+                report_exit(proc, "gone" if method == "terminate" else "terminated")
+            except psutil.AccessDenied as e:
+                entry.status = "denied"
+                entry.error = str(e) or "access denied"
+        return waiting
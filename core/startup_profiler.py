@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Records named startup phases as (start, end) offsets in milliseconds
+    from the profiler's creation, which main.py does before importing Qt.
+    Phases may overlap (e.g. the first scan runs while the window paints);
+    mark() records an instant. Thread-safe, so background work can report.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.origin = clock()
+        self._lock = threading.Lock()
+        self._phases = []  # [name, start_ms, end_ms or None], in start order
+        self._open = {}  # name -> index into _phases
+
+    def _now_ms(self):
+        return (self.clock() - self.origin) * 1000
+
+    def begin(self, name):
+        with self._lock:
+            self._open[name] = len(self._phases)
+            self._phases.append([name, self._now_ms(), None])
+
+    def end(self, name):
+        """Closes the phase; ignored if it was never begun (or already ended)"""
+        with self._lock:
+            index = self._open.pop(name, None)
+            if index is not None:
+                self._phases[index][2] = self._now_ms()
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name):
+        """Records an instant, e.g. the first paint"""
+        with self._lock:
+            now = self._now_ms()
+            self._phases.append([name, now, now])
+
+    def has(self, name):
+        with self._lock:
+            return any(entry[0] == name for entry in self._phases)
+
+    def elapsed_ms(self):
+        return self._now_ms()
+
+    def to_dict(self):
+        """JSON-serializable phases; unfinished ones have end_ms None"""
+        with self._lock:
+            phases = [{"name": name, "start_ms": round(start, 2),
+                       "end_ms": None if end is None else round(end, 2),
+                       "duration_ms": None if end is None else round(end - start, 2)}
+                      for name, start, end in self._phases]
+        return {"phases": phases, "elapsed_ms": round(self._now_ms(), 2)}
+
+    def report(self):
+        """Human-readable table, one phase per line"""
+        lines = [f"{'phase':<26} {'start':>9} {'end':>9} {'took':>9}"]
+        for p in self.to_dict()["phases"]:
+            end = "..." if p["end_ms"] is None else f"{p['end_ms']:.1f}"
+            took = "" if p["duration_ms"] is None else f"{p['duration_ms']:.1f}"
+            lines.append(f"{p['name']:<26} {p['start_ms']:>9.1f} {end:>9} {took:>9}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Writes to_dict() as JSON; returns False if the file cannot be written"""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            return True
+        except OSError:
+            return False
+
+
+_default_profiler = None
+
+
+def default_profiler():
+    """Process-wide profiler; created on first use, so import this first"""
+    global _default_profiler
+    if _default_profiler is None:
+        _default_profiler = StartupProfiler()
+    return _default_profiler
@@ -0,0 +1,130 @@
+import ctypes
+import os
+import threading
+import time
+
+# System Idle and System are never trimmed
+PROTECTED_PIDS = (0, 4)
+# Processes below this resident size are only trimmed once idle
+DEFAULT_MIN_RSS_MB = 100
+# A process whose CPU time has not moved for this long counts as idle
+DEFAULT_IDLE_SECONDS = 60
+# Never trimmed: latency-sensitive system processes that fault straight back in
+DEFAULT_EXCLUDED_NAMES = (
+    "system", "registry", "memory compression", "csrss.exe", "wininit.exe", "winlogon.exe",
+    "lsass.exe", "services.exe", "smss.exe", "dwm.exe", "audiodg.exe", "fontdrvhost.exe",
+    "msmpeng.exe",
+)
+# Share of a trimmed working set expected to fault back in soon
+IDLE_REFAULT_ESTIMATE = 0.2
+ACTIVE_REFAULT_ESTIMATE = 0.6
+
+
+def foreground_pid():
+    """PID owning the foreground window, or None (non-Windows or no window)"""
+    try:
+        user32 = ctypes.windll.user32
+    except AttributeError:
+        return None
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = ctypes.c_ulong()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return pid.value or None
+
+
+class ActivityTracker:
+    """
+    Remembers when each process last used CPU, from successive snapshots.
+    Feed it every ProcessSampler pass (e.g. sampler.subscribe(tracker.update)).
+    A process counts as idle only for as long as it has been watched, so a
+    newly seen PID starts at 0.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._seen = {}  # pid -> (cpu_time, last_active)
+
+    def update(self, snapshot):
+        now = self.clock()
+        with self._lock:
+            seen = {}
+            for p in snapshot:
+                if p.cpu_time is None:
+                    continue
+                prev = self._seen.get(p.pid)
+                if prev is None or p.cpu_time != prev[0]:
+                    seen[p.pid] = (p.cpu_time, now)
+                else:
+                    seen[p.pid] = prev
+            # Dead PIDs drop out here
+            self._seen = seen
+
+    def idle_seconds(self, pid):
+        """Seconds since pid last used CPU (0 if unknown)"""
+        with self._lock:
+            entry = self._seen.get(pid)
+        return 0.0 if entry is None else self.clock() - entry[1]
+
+
+class TrimCandidate:
+    """A process selected by a TrimPolicy, with the gain expected from trimming it"""
+    __slots__ = ("pid", "name", "rss", "idle_seconds", "expected_gain")
+
+    def __init__(self, pid, name, rss, idle_seconds, expected_gain):
+        self.pid = pid
+        self.name = name
+        self.rss = rss
+        self.idle_seconds = idle_seconds
+        self.expected_gain = expected_gain
+
+
+class TrimPolicy:
+    """
+    Chooses which processes an optimize run trims, and in which order.
+    A process qualifies when its working set is at least min_rss_mb or it
+    has been idle for idle_seconds (needs an ActivityTracker); the foreground
+    process, DustOff itself and anything in exclude_names never qualify.
+    Candidates are ordered by expected gain: the working set minus the part
+    likely to fault straight back in, which is larger for active processes.
+    """
+
+    def __init__(self, min_rss_mb=DEFAULT_MIN_RSS_MB, idle_seconds=DEFAULT_IDLE_SECONDS,
+                 exclude_names=DEFAULT_EXCLUDED_NAMES, exclude_foreground=True, max_processes=None):
+        self.min_rss = min_rss_mb * 1024 * 1024
+        self.idle_seconds = idle_seconds
+        self.exclude_names = {name.lower() for name in exclude_names}
+        self.exclude_foreground = exclude_foreground
+        self.max_processes = max_processes
+
+    def select(self, snapshot, activity=None, foreground=None):
+        """
+        Returns [TrimCandidate, ...], largest expected gain first.
+        foreground: PID to protect; looked up when exclude_foreground is set
+        and no PID is given.
+        """
+        excluded_pids = {*PROTECTED_PIDS, os.getpid()}
+        if self.exclude_foreground:
+            foreground = foreground if foreground is not None else foreground_pid()
+            if foreground is not None:
+                excluded_pids.add(foreground)
+
+        candidates = []
+        for p in snapshot:
+            if p.pid in excluded_pids or p.rss is None or not p.name:
+                continue
+            if p.name.lower() in self.exclude_names:
+                continue
+            idle = activity.idle_seconds(p.pid) if activity is not None else 0.0
+            is_idle = self.idle_seconds is not None and idle >= self.idle_seconds
+            if p.rss < self.min_rss and not is_idle:
+                continue
+            refault = IDLE_REFAULT_ESTIMATE if is_idle else ACTIVE_REFAULT_ESTIMATE
+            candidates.append(TrimCandidate(p.pid, p.name, p.rss, idle, int(p.rss * (1 - refault))))
+
+        candidates.sort(key=lambda c: c.expected_gain, reverse=True)
+        if self.max_processes is not None:
+            del candidates[self.max_processes:]
+        return candidates
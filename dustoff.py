@@ -0,0 +1,291 @@
+"""
+Headless DustOff for collecting inventories from many machines.
+Writes JSON Lines to stdout and never imports Qt:
+    python dustoff.py inventory [--cached] [--since previous.jsonl]
+    python dustoff.py apps [--since previous.jsonl]
+    python dustoff.py memory [--top N]
+    python dustoff.py growth [--duration S] [--by-app] [--replay trace.jsonl]
+    python dustoff.py auto [--low-mb 1024 ...]
+--since takes an earlier output of the same subcommand and writes only the
+records that were added, updated or removed, each with a "change" field.
+Each subcommand imports only the modules it needs (inventory never loads
+psutil); --timings writes import and run times to stderr.
+"""
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+
+# Ensure project root is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+class UsageError(Exception):
+    """Reported on stderr with exit status 1"""
+
+
+def _load_inventory(cache_path, cached_only):
+    """
+    AppInventory restored from the GUI's cache, then refreshed against the
+    registry (only changed subkeys are re-read) and persisted again.
+    """
+    from core.app_cache import AppCache
+    from core.app_scanner import AppInventory
+
+    cache = AppCache(cache_path)
+    inventory = AppInventory()
+    payload = cache.load()
+    restored = bool(payload) and inventory.load_state(payload.get("inventory"))
+    if cached_only:
+        if not restored:
+            raise UsageError(f"no usable inventory cache at {cache.path}")
+        return inventory
+    inventory.refresh()
+    if inventory.dirty and cache.save({"inventory": inventory.export_state()}):
+        inventory.dirty = False
+    return inventory
+
+
+def inventory_records(args):
+    inventory = _load_inventory(args.cache, args.cached)
+    for app in inventory.apps():
+        yield dict(app.to_dict(), type="app")
+
+
+def apps_records(args):
+    """Installed apps that own running processes, with their combined RSS"""
+    from core.process_matcher import ProcessMatcher
+    from core.process_sampler import ProcessSampler
+
+    apps = _load_inventory(args.cache, args.cached).apps()
+    snapshot = ProcessSampler().sample()
+    matches = ProcessMatcher.attribute_apps(apps, snapshot.running_processes(), snapshot.process_exes())
+    for app in apps:
+        pids = sorted(matches.get(app.name, ()))
+        if not pids:
+            continue
+        procs = [snapshot.get(pid) for pid in pids]
+        yield {"type": "running", "name": app.name, "pids": pids,
+               "rss": sum(p.rss for p in procs if p is not None and p.rss is not None)}
+
+
+def memory_records(args):
+    """System memory, then the --top largest processes by RSS"""
+    from core.system_info import SystemInfo
+
+    yield dict(SystemInfo.get_memory_info(), type="memory")
+    if args.top:
+        import heapq
+        from core.process_sampler import ProcessSampler
+
+        snapshot = ProcessSampler().sample()
+        for p in heapq.nlargest(args.top, (p for p in snapshot if p.rss is not None), key=lambda p: p.rss):
+            yield {"type": "process", "pid": p.pid, "name": p.name, "rss": p.rss}
+
+
+def _read_trace(path):
+    """
+    Yields (t, [(key, name, rss, started), ...]) per sampling pass of a trace: JSON
+    Lines of {"t": seconds, "key": ..., "name": ..., "rss": bytes}, in time
+    order; an optional "started" gives when the process started, in seconds
+    on the same clock as "t"
+    """
+    batch, batch_t = [], None
+    try:
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    t = float(record["t"])
+                    sample = (record["key"], record.get("name"), record["rss"], record.get("started"))
+                except (ValueError, KeyError, TypeError):
+                    raise UsageError(f"{path}:{number}: not a trace record") from None
+                if batch and t != batch_t:
+                    yield batch_t, batch
+                    batch = []
+                batch_t = t
+                batch.append(sample)
+    except OSError as e:
+        raise UsageError(f"cannot read {path}: {e.strerror}") from None
+    if batch:
+        yield batch_t, batch
+
+
+def growth_records(args):
+    """
+    Processes (or applications, with --by-app) whose memory keeps growing:
+    sampled every --interval seconds for --duration seconds, or replayed
+    from a --replay trace. Only flagged ones unless --all.
+    """
+    from core.leak_detector import LeakDetector
+
+    detector = LeakDetector(rate_mb_min=args.rate)
+    if args.replay:
+        for now, batch in _read_trace(args.replay):
+            detector.observe(now, batch)
+    else:
+        from core.process_sampler import ProcessSampler
+
+        sampler = ProcessSampler()
+        if args.by_app:
+            from core.app_usage import AppUsageAggregator
+
+            usage = AppUsageAggregator()
+            try:
+                usage.set_apps(_load_inventory(args.cache, cached_only=True).apps())
+            except UsageError:
+                pass  # no GUI cache: group by process tree only
+            sampler.subscribe(usage.update)
+            sampler.subscribe(lambda snapshot: detector.observe(
+                snapshot.taken_at, ((":".join(u.key), u.name, u.rss, snapshot.started_at(u.pids))
+                                    for u in usage.top())))
+        else:
+            sampler.subscribe(detector.update)
+        end = time.monotonic() + args.duration
+        while True:
+            sampler.sample()
+            if time.monotonic() + args.interval > end:
+                break
+            time.sleep(args.interval)
+
+    for trend in detector.trends() if args.all else detector.leaks():
+        yield {"type": "growth", "key": trend.key, "name": trend.name, "rss": trend.rss,
+               "rate_mb_min": round(trend.rate_mb_min, 2), "r2": round(trend.r2, 3),
+               "samples": trend.samples, "span_s": round(trend.span_s, 1),
+               "growing_s": round(trend.growing_s, 1), "leaking": trend.leaking}
+
+
+# Field identifying a record across runs, per record type
+RECORD_KEYS = {"app": "name", "running": "name", "memory": "type", "process": "pid", "growth": "key"}
+
+
+def _record_key(record):
+    field = RECORD_KEYS.get(record.get("type"))
+    return None if field is None else (record["type"], record.get(field))
+
+
+def load_snapshot(path):
+    """{record key: record} from an earlier JSON Lines output"""
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    raise UsageError(f"{path}:{number}: not a JSON record") from None
+                if record.get("change") == "removed":
+                    continue
+                record.pop("change", None)
+                key = _record_key(record)
+                if key is not None:
+                    records[key] = record
+    except OSError as e:
+        raise UsageError(f"cannot read {path}: {e.strerror}") from None
+    return records
+
+
+def diff_records(records, previous):
+    """
+    Streams the records that differ from previous (consumed as it goes):
+    added and updated ones as they come, removed ones at the end.
+    """
+    for record in records:
+        old = previous.pop(_record_key(record), None)
+        if old is None:
+            yield dict(record, change="added")
+        elif old != record:
+            yield dict(record, change="updated")
+    for old in previous.values():
+        yield dict(old, change="removed")
+
+
+COMMANDS = {
+    "inventory": inventory_records,
+    "apps": apps_records,
+    "memory": memory_records,
+    "growth": growth_records,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="dustoff", description=__doc__.split("\n")[1])
+    parser.add_argument("--timings", action="store_true", help="write import/run times to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("inventory", "installed apps"),
+                            ("apps", "installed apps with running processes")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--since", metavar="SNAPSHOT", help="only changes since this earlier output")
+        command.add_argument("--cache", metavar="PATH", help="inventory cache (default: the GUI's)")
+        command.add_argument("--cached", action="store_true", help="use the cache without reading the registry")
+
+    command = commands.add_parser("memory", help="system memory and largest processes")
+    command.add_argument("--since", metavar="SNAPSHOT", help="only changes since this earlier output")
+    command.add_argument("--top", type=int, default=0, metavar="N", help="also list the N largest processes")
+
+    command = commands.add_parser("growth", help="processes whose memory keeps growing (leaks)")
+    command.add_argument("--since", metavar="SNAPSHOT", help="only changes since this earlier output")
+    command.add_argument("--duration", type=float, default=600, metavar="S",
+                         help="seconds to sample (default: 600; growth must hold about 300, "
+                              "and processes younger than 600 are not judged)")
+    command.add_argument("--interval", type=float, default=5, metavar="S", help="seconds between samples")
+    command.add_argument("--rate", type=float, default=5.0, metavar="MB_MIN",
+                         help="growth rate that counts as a leak, in MB per minute")
+    command.add_argument("--by-app", action="store_true", help="per application (process trees) instead of per process")
+    command.add_argument("--cache", metavar="PATH", help="inventory cache naming the apps for --by-app")
+    command.add_argument("--replay", metavar="TRACE", help="replay a JSON Lines RSS trace instead of sampling")
+    command.add_argument("--all", action="store_true", help="list every tracked series, not only flagged ones")
+
+    # Its options are parsed by core.auto_optimizer
+    commands.add_parser("auto", help="trim automatically under memory pressure", add_help=False)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "auto":
+        from core.auto_optimizer import main as auto_main
+        return auto_main(extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    out = sys.stdout
+    count = 0
+    started = time.perf_counter()
+    try:
+        records = COMMANDS[args.command](args)
+        if args.since:
+            records = diff_records(records, load_snapshot(args.since))
+        for record in records:
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            count += 1
+        out.flush()
+    except UsageError as e:
+        print(f"dustoff: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); keep the exit flush quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+    if args.timings:
+        now = time.perf_counter()
+        print(json.dumps({"import_ms": round((started - _STARTED) * 1000, 2),
+                          "run_ms": round((now - started) * 1000, 2), "records": count,
+                          "qt_loaded": any(name.startswith("PySide6") for name in sys.modules)}),
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
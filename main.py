@@ -1,15 +1,51 @@
+import argparse
 import sys
 import os
 
 # Ensure project root is in path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from ui.main_window import MainWindow, QApplication
+# Created first so every later phase is measured from here
+from core.startup_profiler import default_profiler
+
+profiler = default_profiler()
+
+
+def parse_args(argv):
+    """Our options; anything else is passed on to Qt"""
+    parser = argparse.ArgumentParser(description="DustOff - Windows Manager")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the startup phases once the first scan finished")
+    parser.add_argument("--profile-out", metavar="PATH", help="write the startup phases to PATH as JSON")
+    parser.add_argument("--eager", action="store_true", help="build the app list before showing the window")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="quit once started (for timing startup)")
+    return parser.parse_known_args(argv)
+
+
+def report_startup(args, app):
+    if args.profile_startup:
+        print(profiler.report(), file=sys.stderr)
+    if args.profile_out and not profiler.export(args.profile_out):
+        print(f"Could not write startup profile to {args.profile_out}", file=sys.stderr)
+    if args.exit_after_startup:
+        app.quit()
+
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    args, qt_args = parse_args(sys.argv[1:])
+    with profiler.phase("import qt"):
+        from PySide6.QtWidgets import QApplication
+    with profiler.phase("import ui"):
+        from ui.main_window import MainWindow
+
+    with profiler.phase("qapplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+    with profiler.phase("main window"):
+        window = MainWindow(defer_app_list=not args.eager, profiler=profiler)
+    window.startup_finished.connect(lambda: report_startup(args, app))
+    with profiler.phase("show"):
+        window.show()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -1,21 +1,73 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, 
-                                 QHeaderView, QPushButton, QLabel, QHBoxLayout, QMessageBox, QFrame, QStyle)
-from PySide6.QtCore import Qt, QTimer, QFileInfo
-from PySide6.QtGui import QIcon
-import os
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QTableView, QLineEdit,
+                                 QHeaderView, QPushButton, QLabel, QHBoxLayout, QMessageBox, QStyle)
+from PySide6.QtCore import Qt, QTimer
 import subprocess
-import psutil
-from core.app_scanner import AppScanner
-from core.process_matcher import ProcessMatcher
+import time
+from core.app_scanner import AppInventory
+from core.app_cache import AppCache
+from core.app_usage import default_usage
+from core.footprint_sampler import default_footprint
 from core.icon_extractor import IconExtractor
+from core.icon_service import IconService
+from core.icon_store import IconStore
+from core.process_sampler import default_sampler
+from ui.app_loader import AppLoadPipeline
+from ui.app_model import (InstalledAppsModel, ActionButtonDelegate, COL_NAME, COL_STATUS,
+                          COL_MEMORY, COL_CPU, COL_STOP, COL_UNINSTALL)
+from ui.process_watcher import ProcessWatcher
+from ui.terminate_runner import TerminateRunner
+from ui.viewport_loader import ViewportIconLoader
 from ui.styles import ModernStyles
 
+# Columns sized to their contents, and how often they are refitted at most (ms)
+FITTED_COLUMNS = (COL_STATUS, COL_MEMORY, COL_CPU)
+FIT_INTERVAL_MS = 250
+
+
 class AppList(QWidget):
-    def __init__(self):
+    def __init__(self, inventory=None, cache=None, icon_store=None):
         super().__init__()
+        # Registry snapshot kept between refreshes so only changed keys are re-read
+        self.inventory = inventory if inventory is not None else AppInventory()
+        self.cache = cache if cache is not None else AppCache()
+        self.timings = {}  # startup phase -> milliseconds
+        self.load_stats = {}  # metrics of the last completed refresh
+        self._seen = set()  # app names delivered by the current refresh
+        self._load_started_at = 0.0
+
+        # Icons are decoded off-thread, only for rows in or near the viewport
+        # (see ViewportIconLoader); the model shows a placeholder until they
+        # arrive. Extracted icons persist across runs in the on-disk store.
+        self.icon_store = icon_store if icon_store is not None else IconStore()
+        self.icons = IconService(self.icon_store.cached_decoder(IconExtractor.get_image_for_exe), parent=self)
+        self.icons.icon_ready.connect(self._on_icon_ready)
+        self._icon_flush = QTimer(self)
+        self._icon_flush.setSingleShot(True)
+        self._icon_flush.setInterval(16)  # coalesce arrivals into one repaint per frame
+        self._icon_flush.timeout.connect(lambda: self.model.refresh_icons())
+
+        self.model = InstalledAppsModel(self.icons.lookup, self, footprint=default_footprint())
+        # Running status, memory and CPU per app, summed over its process
+        # trees and patched into the rows as processes start and exit
+        self.usage = default_usage()
+        self.watcher = ProcessWatcher(default_sampler(), self.usage, parent=self)
+        self.watcher.status_ready.connect(self.model.set_running)
+        self.watcher.usage_ready.connect(self.model.set_usage)
+        # Stop buttons end whole process trees off the GUI thread
+        self.terminator = TerminateRunner(self)
+        self.terminator.progress.connect(self._on_kill_progress)
+        self.terminator.finished.connect(self._on_kill_finished)
+        self.pipeline = AppLoadPipeline(self.inventory, usage=self.usage, parent=self)
+        self.pipeline.rows_ready.connect(self._on_rows_ready)
+        self.pipeline.finished.connect(self._on_load_finished)
+
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.icon_store.flush)
+
         self.init_ui()
-        # Timer to update status potentially? For now manual refresh is safer for perf
-        # But we can update status of existing rows
+        # Render the last known inventory at once, then revalidate in the background
+        self.load_cached_apps()
         self.load_apps()
 
     def init_ui(self):
@@ -34,162 +86,206 @@ class AppList(QWidget):
         header_layout.addWidget(refresh_btn)
         
         layout.addLayout(header_layout)
+
+        # Filter bar: filters the model on every keystroke (see InstalledAppsModel.set_filter)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search by name, publisher or version")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self._on_filter_changed)
+        layout.addWidget(self.search_box)
         
         # Table
-        self.table = QTableWidget()
         # Columns: Name, Status, Version, Size, Date, Stop, Uninstall
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["Name", "Status", "Version", "Size (MB)", "Date", "Stop", "Del"])
+        self.table = QTableView()
+        self.table.setModel(self.model)
         
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Stretch)      # Name
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents) # Status
-        header.setSectionResizeMode(5, QHeaderView.Fixed) # Stop
-        header.setSectionResizeMode(6, QHeaderView.Fixed) # Uninstall
-        self.table.setColumnWidth(5, 50)
-        self.table.setColumnWidth(6, 50)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.Stretch)
+        # Status, Memory and CPU are fitted to their contents by _fit_columns,
+        # throttled and only while the list is on screen: with ResizeToContents
+        # the header re-measures rows on every patch, even while hidden
+        for col in FITTED_COLUMNS:
+            header.setSectionResizeMode(col, QHeaderView.Interactive)
+        header.setSectionResizeMode(COL_STOP, QHeaderView.Fixed)
+        header.setSectionResizeMode(COL_UNINSTALL, QHeaderView.Fixed)
+        # Fit those columns to the rows on screen only: measuring up to 1,000
+        # rows would cost more than the patch that triggered the fit
+        header.setResizeContentsPrecision(0)
+        self._fit_timer = QTimer(self)
+        self._fit_timer.setSingleShot(True)
+        self._fit_timer.setInterval(FIT_INTERVAL_MS)
+        self._fit_timer.timeout.connect(self._fit_columns)
+        for signal in (self.model.dataChanged, self.model.rowsInserted, self.model.modelReset,
+                       self.model.layoutChanged):
+            signal.connect(self._schedule_fit)
+        self.table.setColumnWidth(COL_STOP, 50)
+        self.table.setColumnWidth(COL_UNINSTALL, 50)
+        
+        # Stop / Uninstall buttons are painted by delegates, not per-row widgets
+        self.stop_delegate = ActionButtonDelegate(QStyle.SP_MediaStop, "#fff0f0", "#ffcdd2", self.table)
+        self.uninstall_delegate = ActionButtonDelegate(QStyle.SP_TrashIcon, "transparent", "#eee", self.table)
+        self.stop_delegate.clicked.connect(
+            lambda row, col: self.kill_app(self.model.app_at(row).name, self.model.pids_at(row)))
+        self.uninstall_delegate.clicked.connect(lambda row, col: self.uninstall_app(self.model.app_at(row)))
+        self.table.setItemDelegateForColumn(COL_STOP, self.stop_delegate)
+        self.table.setItemDelegateForColumn(COL_UNINSTALL, self.uninstall_delegate)
+        self.table.setMouseTracking(True)
         
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.setShowGrid(False)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(32)
         self.table.setAlternatingRowColors(True)
         self.table.setSortingEnabled(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
         
         # Remove Context Menu Context
         self.table.setContextMenuPolicy(Qt.NoContextMenu)
         
         layout.addWidget(self.table)
+        self.viewport_loader = ViewportIconLoader(self.table, self.model, self.icons, self)
         
         # Stats Label
         self.stats_label = QLabel("Loading...")
         self.stats_label.setStyleSheet(f"color: {ModernStyles.text_secondary}; margin-top: 10px;")
         layout.addWidget(self.stats_label)
 
+    def load_cached_apps(self):
+        """
+        Renders the inventory persisted by the previous run.
+        Returns False if there is no usable cache.
+        """
+        start = time.perf_counter()
+        payload = self.cache.load()
+        if not payload or not self.inventory.load_state(payload.get("inventory")) or not len(self.inventory):
+            return False
+        self.timings["cache_load_ms"] = (time.perf_counter() - start) * 1000
+
+        self.model.upsert([(app, None) for app in self.inventory.apps()])
+        self._apply_sort()
+        self._update_stats_label()
+        self.timings["first_render_ms"] = (time.perf_counter() - start) * 1000
+        return True
+
+    def save_cache(self):
+        if self.cache.save({"inventory": self.inventory.export_state()}):
+            self.inventory.dirty = False
+
     def load_apps(self):
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(0)
+        """
+        Starts a background refresh (scan -> match).
+        Rows stream in through _on_rows_ready; a refresh already in flight is cancelled.
+        """
+        self._load_started_at = time.perf_counter()
+        self._seen = set()
+        self.load_stats = {"max_batch_ms": 0.0}
         self.stats_label.setText("Scanning apps...")
-        QFrame.repaint(self) # Force update
-        
-        apps = AppScanner.get_installed_apps()
-        running_procs = ProcessMatcher.get_running_processes()
-        
-        self.table.setRowCount(len(apps))
-        
-        total_size = 0
-        
-        for row, app in enumerate(apps):
-            # 0. Name with Icon
-            name_item = QTableWidgetItem(app['name'])
-            name_item.setData(Qt.UserRole, app)
-            
-            # Extract icon from executable or use fallback
-            icon_path = app.get('icon_path', '')
-            if icon_path:
-                icon = IconExtractor.get_icon_for_exe(icon_path, use_fallback=True)
-            else:
-                # No icon path in registry, use fallback
-                icon = IconExtractor.get_fallback_icon()
-            
-            if not icon.isNull():
-                name_item.setIcon(icon)
-            
-            self.table.setItem(row, 0, name_item)
-            
-            # Check if running
-            pids = ProcessMatcher.find_pids_for_app(app['name'], running_procs)
-            is_running = len(pids) > 0
-            
-            # 1. Status
-            status_item = QTableWidgetItem()
-            if is_running:
-                status_text = f"Running ({len(pids)})"
-                status_item.setText("🟢 " + status_text)
-                status_item.setForeground(Qt.darkGreen)
-            else:
-                status_item.setText("")
-            self.table.setItem(row, 1, status_item)
-            
-            # 2. Version
-            self.table.setItem(row, 2, QTableWidgetItem(str(app.get('version', ''))))
-            
-            # 3. Size with comma formatting
-            size = app.get('size_mb', 0)
-            total_size += size
-            size_item = QTableWidgetItem()
-            size_item.setData(Qt.DisplayRole, size)
-            size_item.setText(f"{size:,.2f}" if size > 0 else "-")
-            self.table.setItem(row, 3, size_item)
-            
-            # 4. Date
-            self.table.setItem(row, 4, QTableWidgetItem(str(app.get('install_date', ''))))
-            
-            # Helper for icon buttons
-            def create_icon_btn(icon_type, color_base, color_hover, callback):
-                btn = QPushButton()
-                btn.setIcon(self.style().standardIcon(icon_type))
-                btn.setFixedSize(30, 24)
-                btn.setCursor(Qt.PointingHandCursor)
-                btn.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {color_base};
-                        border: 1px solid #ddd;
-                        border-radius: 4px;
-                        padding-bottom: 2px;
-                    }}
-                    QPushButton:hover {{ background-color: {color_hover}; }}
-                """)
-                btn.clicked.connect(callback)
-                
-                w = QWidget()
-                l = QHBoxLayout(w)
-                l.setContentsMargins(0, 0, 0, 0)
-                l.setAlignment(Qt.AlignCenter)
-                l.addWidget(btn)
-                return w
-
-            # 5. Stop Column
-            if is_running:
-                # SP_MediaStop or SP_DialogCloseButton
-                stop_widget = create_icon_btn(QStyle.SP_MediaStop, "#fff0f0", "#ffcdd2", 
-                                            lambda checked=False, p=pids: self.kill_app(p))
-                self.table.setCellWidget(row, 5, stop_widget)
-            
-            # 6. Uninstall Column
-            # SP_TrashIcon
-            uninstall_widget = create_icon_btn(QStyle.SP_TrashIcon, "transparent", "#eee", 
-                                             lambda checked=False, a=app: self.uninstall_app(a))
-            self.table.setCellWidget(row, 6, uninstall_widget)
-            
-        self.stats_label.setText(f"Total Apps: {len(apps):,} | Estimated Total Size: {int(total_size):,} MB")
-        self.table.setSortingEnabled(True)
+        self.pipeline.start()
+
+    def _on_rows_ready(self, batch):
+        start = time.perf_counter()
+        self.timings.setdefault("first_row_ms", (start - self._load_started_at) * 1000)
+        self.model.upsert(batch)
+        self._seen.update(app.name for app, _ in batch)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.load_stats["max_batch_ms"] = max(self.load_stats.get("max_batch_ms", 0.0), elapsed)
+
+    def _on_icon_ready(self, icon_path, icon):
+        if not self._icon_flush.isActive():
+            self._icon_flush.start()
+
+    def _on_load_finished(self, stats):
+        # Drop rows of apps that disappeared from the registry
+        self.model.retain(self._seen)
+        self._apply_sort()
+        self._update_stats_label()
+
+        # The run regrouped processes by the new attribution
+        self.watcher.publish()
+
+        self.load_stats.update(stats)
+        self.timings.setdefault("first_load_ms", (time.perf_counter() - self._load_started_at) * 1000)
+        # A cancelled run may have refreshed the inventory too, so check the flag
+        if self.inventory.dirty:
+            self.save_cache()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.watcher.set_active(True)
+        # Catch up on the patches that arrived while hidden
+        self._fit_timer.start(0)
 
-    def kill_app(self, pids):
-        confirm = QMessageBox.question(self, "Stop Application", 
-                                     f"Are you sure you want to force stop {len(pids)} process(es)?",
+    def _schedule_fit(self, *args):
+        if self.isVisible() and not self._fit_timer.isActive():
+            self._fit_timer.start(FIT_INTERVAL_MS)
+
+    def _fit_columns(self):
+        if self.isVisible():
+            for col in FITTED_COLUMNS:
+                self.table.resizeColumnToContents(col)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.watcher.set_active(False)
+
+    def _on_filter_changed(self, text):
+        self.model.set_filter(text)
+        self._update_stats_label()
+
+    def _apply_sort(self):
+        # Clicking a header sorts by that column and keeps the previous ones as tie-breakers
+        self.model.resort()
+
+    def _update_stats_label(self):
+        total = self.model.total_count()
+        shown = f"{self.model.rowCount():,} of {total:,}" if self.model.rowCount() != total else f"{total:,}"
+        self.stats_label.setText(f"Total Apps: {shown} | "
+                                 f"Estimated Total Size: {int(self.model.total_size()):,} MB")
+
+    def kill_app(self, name, pids):
+        if self.terminator.is_running(name):
+            return
+        confirm = QMessageBox.question(self, "Stop Application",
+                                     f"Are you sure you want to force stop {name} "
+                                     f"({len(pids)} process(es) and their child processes)?",
                                      QMessageBox.Yes | QMessageBox.No)
         if confirm == QMessageBox.Yes:
-            killed = 0
+            # Names as last sampled, so a PID reused since then is left alone
+            snapshot = default_sampler().latest()
+            names = {}
             for pid in pids:
-                try:
-                    p = psutil.Process(pid)
-                    p.terminate()
-                    killed += 1
-                except:
-                    pass
-            QMessageBox.information(self, "Result", f"Stopped {killed} processes.")
-            # Refresh to update status
-            self.load_apps()
-
-    def uninstall_app(self, app_data):
-        cmd = app_data.get('uninstall_string')
+                p = snapshot.get(pid) if snapshot is not None else None
+                if p is not None and p.name:
+                    names[pid] = p.name
+            self.terminator.start(name, pids, names)
+            self.stats_label.setText(f"Stopping {name}...")
+
+    def _on_kill_progress(self, name, done, total):
+        self.stats_label.setText(f"Stopping {name}: {done} of {total} processes exited...")
+
+    def _on_kill_finished(self, name, report):
+        # The watcher patches the affected row once the processes are gone
+        self.watcher.refresh()
+        self._update_stats_label()
+        forced = f" ({report.killed_count} forced)" if report.killed_count else ""
+        text = f"Stopped {report.stopped_count} of {len(report.processes)} processes of {name}{forced}."
+        box = QMessageBox(QMessageBox.Information if report.ok else QMessageBox.Warning, "Result", text,
+                          QMessageBox.Ok, self)
+        if not report.ok:
+            box.setInformativeText(f"{len(report.failed)} could not be stopped.")
+        box.setDetailedText("\n".join(f"{p.pid:>7}  {p.name or '?':<28} {p.status}"
+                                      + (f" ({p.error})" if p.error else "") for p in report.processes))
+        box.exec()
+
+    def uninstall_app(self, app):
+        cmd = app.uninstall_string
         if not cmd:
             QMessageBox.warning(self, "Error", "No uninstall command found for this app.")
             return
             
         confirm = QMessageBox.question(self, "Confirm Uninstall", 
-                                     f"Are you sure you want to uninstall {app_data['name']}?",
+                                     f"Are you sure you want to uninstall {app.name}?",
                                      QMessageBox.Yes | QMessageBox.No)
         if confirm == QMessageBox.Yes:
             try:
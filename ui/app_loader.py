@@ -0,0 +1,132 @@
+import threading
+import time
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from core.process_matcher import ProcessMatcher
+from core.process_sampler import default_sampler
+
+# Rows handed to the GUI per signal; small enough to insert within a frame
+ROW_BATCH_SIZE = 25
+
+
+class _LoadSignals(QObject):
+    # generation, [(app, pids), ...]
+    rows_ready = Signal(int, list)
+    # generation, stats dict
+    finished = Signal(int, dict)
+
+
+class _LoadTask(QRunnable):
+    """
+    One refresh run: scan -> match, off the GUI thread (icons are loaded
+    separately by IconService).
+    Checks its cancel flag between batches, and before touching the shared
+    usage aggregator, so a newer run can replace it.
+    """
+
+    def __init__(self, generation, inventory, inventory_lock, sampler, usage, signals):
+        super().__init__()
+        self.generation = generation
+        self.inventory = inventory
+        self.sampler = sampler
+        self.usage = usage
+        self.inventory_lock = inventory_lock
+        self.signals = signals
+        self.cancelled = threading.Event()
+
+    def run(self):
+        start = time.perf_counter()
+        stats = {}
+
+        # Stage 1: registry scan (serialized: a cancelled run may still be inside refresh)
+        with self.inventory_lock:
+            if self.cancelled.is_set():
+                return
+            diff = self.inventory.refresh()
+            apps = self.inventory.apps()
+        stats["changed"] = not diff.is_empty()
+        stats["scan_ms"] = (time.perf_counter() - start) * 1000
+
+        # Stage 2: running-process attribution (exe path, then name), streamed in batches
+        match_start = time.perf_counter()
+        snapshot = self.sampler.snapshot()
+        matches = ProcessMatcher.attribute_apps(
+            apps, snapshot.running_processes(), snapshot.process_exes())
+        if self.usage is not None:
+            # Per-app totals group processes by the same attribution; their
+            # PIDs (child processes included) are what ProcessWatcher reports later.
+            # The aggregator is shared, so a superseded run must not overwrite
+            # a newer run's attribution: its flag is set before the newer run
+            # starts, and checking it under the lock the runs share makes
+            # check-and-apply atomic.
+            with self.inventory_lock:
+                if self.cancelled.is_set():
+                    return
+                self.usage.set_apps(apps, matches)
+                running = self.usage.installed_usage()
+            matches = {name: sorted(usage.pids) for name, usage in running.items()}
+        for i in range(0, len(apps), ROW_BATCH_SIZE):
+            if self.cancelled.is_set():
+                return
+            batch = [(app, matches.get(app.name, [])) for app in apps[i:i + ROW_BATCH_SIZE]]
+            self.signals.rows_ready.emit(self.generation, batch)
+        stats["match_ms"] = (time.perf_counter() - match_start) * 1000
+        stats["app_count"] = len(apps)
+
+        self.signals.finished.emit(self.generation, stats)
+
+
+class AppLoadPipeline(QObject):
+    """
+    Runs AppList refreshes on the global QThreadPool.
+    Starting a new run cancels the one in flight; signals from stale runs are
+    dropped so the table only ever sees the latest generation.
+    """
+    rows_ready = Signal(list)
+    finished = Signal(dict)
+
+    def __init__(self, inventory, sampler=None, usage=None, parent=None):
+        super().__init__(parent)
+        self.inventory = inventory
+        self.sampler = sampler if sampler is not None else default_sampler()
+        # AppUsageAggregator fed by sampler, told about every new attribution
+        self.usage = usage
+        self._inventory_lock = threading.Lock()
+        self._generation = 0
+        self._task = None
+        self._started_at = 0.0
+        self._first_row_ms = None
+        self._signals = _LoadSignals()
+        self._signals.rows_ready.connect(self._on_rows_ready)
+        self._signals.finished.connect(self._on_finished)
+
+    def is_running(self):
+        return self._task is not None
+
+    def start(self):
+        self.cancel()
+        self._generation += 1
+        self._started_at = time.perf_counter()
+        self._first_row_ms = None
+        self._task = _LoadTask(self._generation, self.inventory, self._inventory_lock,
+                               self.sampler, self.usage, self._signals)
+        QThreadPool.globalInstance().start(self._task)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancelled.set()
+            self._task = None
+
+    def _on_rows_ready(self, generation, batch):
+        if generation != self._generation or self._task is None:
+            return
+        if self._first_row_ms is None:
+            self._first_row_ms = (time.perf_counter() - self._started_at) * 1000
+        self.rows_ready.emit(batch)
+
+    def _on_finished(self, generation, stats):
+        if generation != self._generation or self._task is None:
+            return
+        self._task = None
+        stats["time_to_first_row_ms"] = self._first_row_ms
+        stats["total_ms"] = (time.perf_counter() - self._started_at) * 1000
+        self.finished.emit(stats)
@@ -0,0 +1,458 @@
+from array import array
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle, QApplication
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, Signal
+from PySide6.QtGui import QColor, QPen
+from core.app_search import filter_rows, matches, query_tokens, refines, search_text, version_key
+from core.icon_extractor import IconExtractor
+
+COLUMNS = ["Name", "Status", "Memory", "CPU", "Version", "Size (MB)", "Date", "Stop", "Del"]
+(COL_NAME, COL_STATUS, COL_MEMORY, COL_CPU, COL_VERSION, COL_SIZE, COL_DATE,
+ COL_STOP, COL_UNINSTALL) = range(len(COLUMNS))
+
+# True when the row offers the action drawn by ActionButtonDelegate
+ActionRole = Qt.UserRole + 1
+
+SORTABLE_COLUMNS = (COL_NAME, COL_STATUS, COL_MEMORY, COL_CPU, COL_VERSION, COL_SIZE, COL_DATE)
+# Sort columns kept as tie-breakers: the one clicked plus the previous two
+MAX_SORT_KEYS = 3
+
+
+class InstalledAppsModel(QAbstractTableModel):
+    """
+    Table model for the installed-apps list.
+    Rows are stored column by column (plain lists plus an array of sizes) and
+    looked up by app name, so refreshes only touch the rows that changed.
+    Rows hold InstalledApp records; display strings are formatted on demand.
+    Sorting and filtering are done here rather than in a proxy model: the
+    view sees the stored rows matching the filter, in sort order. Typed sort
+    keys (numeric size, dates, parsed versions) and the search text are built
+    with the row, so neither compares display strings and the first sort or
+    keystroke is as fast as the rest.
+    Memory and CPU come from AppUsageAggregator totals (set_usage) and are
+    only repainted for rows whose values changed; the Memory tooltip shows
+    the private memory measured by the FootprintSampler, when given.
+    """
+
+    def __init__(self, icon_provider=None, parent=None, footprint=None):
+        super().__init__(parent)
+        # callable(icon_path) -> QIcon, or None while the icon is still loading
+        self.icon_provider = icon_provider
+        self.footprint = footprint
+        self._names = []
+        self._sizes = array('d')
+        self._date_keys = array('l')  # proleptic ordinal, 0 when unknown
+        self._pids = []
+        self._rss_mb = array('d')  # memory of the app's processes, 0 when not running
+        self._cpu = array('d')  # CPU % of the app's processes
+        self._usage = {}  # stored row -> AppUsage, for running apps
+        self._apps = []  # InstalledApp per row
+        self._name_keys = []
+        self._version_keys = []
+        self._search = []  # app_search.search_text() per row
+        self._row_of = {}  # app name -> stored row
+
+        self._order = []  # every stored row, in sort order
+        self._visible = []  # stored rows shown (matching the filter), in sort order
+        self._display_of = None  # stored row -> view row, built on demand
+        self._sort_keys = []  # [(column, order)], primary first
+        self._filter = ()  # app_search.query_tokens() of the filter text
+
+    # --- Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self._visible[index.row()], index.column()
+
+        if role == Qt.DisplayRole:
+            if col == COL_NAME:
+                return self._names[row]
+            if col == COL_STATUS:
+                pids = self._pids[row]
+                return f"🟢 Running ({len(pids)})" if pids else ""
+            if col == COL_MEMORY:
+                mb = self._rss_mb[row]
+                return f"{mb:,.0f} MB" if mb > 0 else ""
+            if col == COL_CPU:
+                return f"{self._cpu[row]:.1f}%" if row in self._usage else ""
+            if col == COL_VERSION:
+                return self._apps[row].version or "N/A"
+            if col == COL_SIZE:
+                size = self._sizes[row]
+                return f"{size:,.2f}" if size > 0 else "-"
+            if col == COL_DATE:
+                install_date = self._apps[row].install_date
+                return install_date.isoformat() if install_date else "Unknown"
+            return None
+
+        if role == Qt.DecorationRole and col == COL_NAME:
+            icon_path = self._apps[row].icon_path
+            icon = self.icon_provider(icon_path) if icon_path and self.icon_provider else None
+            # The fallback icon doubles as a placeholder until the real icon arrives
+            return icon if icon is not None else IconExtractor.get_fallback_icon()
+
+        if role == Qt.ToolTipRole and col == COL_MEMORY:
+            usage = self._usage.get(row)
+            if usage is None or self.footprint is None:
+                return None
+            return f"{usage.count} processes\n{self.footprint.summarize(usage.pids).describe()}"
+
+        if role == Qt.TextAlignmentRole and col in (COL_MEMORY, COL_CPU):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        if role == Qt.ForegroundRole and col == COL_STATUS and self._pids[row]:
+            return QColor(Qt.darkGreen)
+
+        if role == ActionRole:
+            if col == COL_STOP:
+                return bool(self._pids[row])
+            if col == COL_UNINSTALL:
+                return True
+            return False
+
+        if role == Qt.UserRole:
+            return self._apps[row]
+
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sorts by column (as the view's header does); the previous sort
+        columns are kept as tie-breakers, up to MAX_SORT_KEYS in total.
+        """
+        if column not in SORTABLE_COLUMNS:
+            return
+        keys = [(column, order)] + [key for key in self._sort_keys if key[0] != column]
+        self.set_sort_keys(keys[:MAX_SORT_KEYS])
+
+    # --- sorting and filtering ----------------------------------------------
+
+    def sort_keys(self):
+        return list(self._sort_keys)
+
+    def set_sort_keys(self, keys):
+        """keys: [(column, Qt.SortOrder), ...], primary first"""
+        self._sort_keys = [(column, order) for column, order in keys if column in SORTABLE_COLUMNS]
+        self.resort()
+
+    def resort(self):
+        """Re-applies the sort keys, e.g. after rows were added or changed"""
+        if not self._sort_keys:
+            return
+        key_of = {
+            COL_NAME: self._name_keys.__getitem__,
+            COL_STATUS: lambda r: len(self._pids[r]),
+            COL_MEMORY: self._rss_mb.__getitem__,
+            COL_CPU: self._cpu.__getitem__,
+            COL_VERSION: self._version_keys.__getitem__,
+            COL_SIZE: self._sizes.__getitem__,
+            COL_DATE: self._date_keys.__getitem__,
+        }
+        order_rows = list(range(len(self._names)))
+        # Stable sorts, least significant key first
+        for column, order in reversed(self._sort_keys):
+            order_rows.sort(key=key_of[column], reverse=(order == Qt.DescendingOrder))
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_rows = [self._visible[i.row()] for i in old_persistent]
+        self._order = order_rows
+        if self._filter:
+            shown = set(self._visible)
+            self._set_visible([r for r in order_rows if r in shown])
+        else:
+            self._set_visible(list(order_rows))
+        display_of = self._display_rows()
+        self.changePersistentIndexList(
+            old_persistent,
+            [self.index(display_of[r], i.column()) for r, i in zip(old_rows, old_persistent)])
+        self.layoutChanged.emit()
+
+    def filter_text(self):
+        return " ".join(token.strip() for token in self._filter)
+
+    def set_filter(self, text):
+        """
+        Shows only apps whose name, publisher or version has a word starting
+        with each word of text. When the text only grew since the last call,
+        just the rows shown so far are searched.
+        """
+        tokens = query_tokens(text)
+        if tokens == self._filter:
+            return
+        rows = self._visible if refines(self._filter, tokens) else self._order
+        self.beginResetModel()
+        self._filter = tokens
+        self._set_visible(filter_rows(self._search, tokens, rows))
+        self.endResetModel()
+
+    # --- updates ------------------------------------------------------------
+
+    def upsert(self, batch):
+        """
+        Inserts or updates rows from [(app, pids), ...].
+        pids is None when the running status is not known yet.
+        New rows are appended; call resort() to put them in order.
+        """
+        new_rows = []
+        changed = []
+        for app, pids in batch:
+            row = self._row_of.get(app.name)
+            if row is None:
+                new_rows.append((app, pids))
+                continue
+            self._set_row(row, app, pids)
+            shown = self._display_row(row)
+            if shown is not None:
+                changed.append(shown)
+
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), 0),
+                                  self.index(max(changed), len(COLUMNS) - 1))
+
+        if new_rows:
+            shown = []
+            for app, pids in new_rows:
+                row = len(self._names)
+                self._names.append(app.name)
+                self._sizes.append(0.0)
+                self._date_keys.append(0)
+                self._pids.append([])
+                self._rss_mb.append(0.0)
+                self._cpu.append(0.0)
+                self._apps.append(None)
+                self._name_keys.append("")
+                self._version_keys.append(())
+                self._search.append("")
+                self._row_of[app.name] = row
+                self._set_row(row, app, pids)
+                self._order.append(row)
+                if matches(self._search[row], self._filter):
+                    shown.append(row)
+            if shown:
+                start = len(self._visible)
+                self.beginInsertRows(QModelIndex(), start, start + len(shown) - 1)
+                self._visible.extend(shown)
+                if self._display_of is not None:
+                    self._display_of.update((row, start + i) for i, row in enumerate(shown))
+                self.endInsertRows()
+
+    def retain(self, names):
+        """Removes every row whose app name is not in names"""
+        if all(name in names for name in self._names):
+            return
+        self.beginResetModel()
+        keep = [row for row in range(len(self._names)) if self._names[row] in names]
+        self._permute(keep)
+        self.endResetModel()
+
+    def set_pids(self, name, pids):
+        row = self._row_of.get(name)
+        if row is None:
+            return
+        self._pids[row] = list(pids or [])
+        shown = self._display_row(row)
+        if shown is not None:
+            self._emit_status_changed([shown])
+
+    def set_running(self, pids_by_name):
+        """
+        pids_by_name: {app_name: [pid, ...]} for every running app; other
+        rows become stopped. Only rows whose PIDs changed are touched, and
+        only their Status and Stop cells repainted. Returns the names of the
+        apps that changed.
+        """
+        changed = []
+        for name, pids in pids_by_name.items():
+            row = self._row_of.get(name)
+            if row is not None and self._pids[row] != pids:
+                self._pids[row] = list(pids)
+                changed.append(row)
+        for row, pids in enumerate(self._pids):
+            if pids and self._names[row] not in pids_by_name:
+                self._pids[row] = []
+                changed.append(row)
+        shown = [r for r in map(self._display_row, changed) if r is not None]
+        if shown:
+            self._emit_status_changed(shown)
+        return [self._names[row] for row in changed]
+
+    def set_usage(self, usages):
+        """
+        usages: {app_name: AppUsage} for the running apps; every other row
+        is cleared. Emits dataChanged once, over the rows that changed.
+        """
+        mb = 1024 * 1024
+        changed = []
+        using = {}
+        for name, usage in usages.items():
+            row = self._row_of.get(name)
+            if row is None:
+                continue
+            using[row] = usage
+            rss_mb = usage.rss / mb
+            if (row not in self._usage or round(rss_mb) != round(self._rss_mb[row])
+                    or round(usage.cpu_percent, 1) != round(self._cpu[row], 1)):
+                changed.append(row)
+            self._rss_mb[row] = rss_mb
+            self._cpu[row] = usage.cpu_percent
+        for row in self._usage.keys() - using.keys():
+            self._rss_mb[row] = 0.0
+            self._cpu[row] = 0.0
+            changed.append(row)
+        self._usage = using
+
+        shown = [r for r in map(self._display_row, changed) if r is not None]
+        if shown:
+            self.dataChanged.emit(self.index(min(shown), COL_MEMORY), self.index(max(shown), COL_CPU),
+                                  [Qt.DisplayRole])
+
+    def refresh_icons(self):
+        """Repaints the name column after new icons arrived from the provider"""
+        if self._visible:
+            self.dataChanged.emit(self.index(0, COL_NAME), self.index(len(self._visible) - 1, COL_NAME),
+                                  [Qt.DecorationRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self._permute([])
+        self.endResetModel()
+
+    # --- accessors (rows are view rows) ----------------------------------------
+
+    def app_at(self, row):
+        return self._apps[self._visible[row]]
+
+    def icon_path_at(self, row):
+        return self._apps[self._visible[row]].icon_path or ""
+
+    def pids_at(self, row):
+        return self._pids[self._visible[row]]
+
+    def row_of(self, name):
+        """View row of the app, or None if unknown or filtered out"""
+        row = self._row_of.get(name)
+        return None if row is None else self._display_row(row)
+
+    def apps(self):
+        """Every app, including filtered-out ones"""
+        return list(self._apps)
+
+    def total_count(self):
+        """Number of apps, including filtered-out ones"""
+        return len(self._names)
+
+    def total_size(self):
+        return sum(self._sizes)
+
+    # --- internals ----------------------------------------------------------
+
+    def _set_row(self, row, app, pids):
+        if pids is not None:
+            self._pids[row] = list(pids)
+        if app is self._apps[row] or app == self._apps[row]:
+            return  # unchanged by a refresh: keep the computed keys
+        self._sizes[row] = app.size_mb or 0.0
+        self._date_keys[row] = app.install_date.toordinal() if app.install_date else 0
+        self._apps[row] = app
+        self._name_keys[row] = app.name.casefold()
+        self._search[row] = search_text(app)
+        self._version_keys[row] = version_key(app.version)
+
+    def _emit_status_changed(self, view_rows):
+        top, bottom = min(view_rows), max(view_rows)
+        for col in (COL_STATUS, COL_STOP):
+            self.dataChanged.emit(self.index(top, col), self.index(bottom, col))
+
+    def _set_visible(self, rows):
+        self._visible = rows
+        self._display_of = None
+
+    def _display_rows(self):
+        if self._display_of is None:
+            self._display_of = {row: i for i, row in enumerate(self._visible)}
+        return self._display_of
+
+    def _display_row(self, row):
+        return self._display_rows().get(row)
+
+    def _permute(self, rows):
+        """Keeps only the stored rows in rows: new stored row i is old row rows[i]"""
+        self._names = [self._names[r] for r in rows]
+        self._sizes = array('d', (self._sizes[r] for r in rows))
+        self._date_keys = array('l', (self._date_keys[r] for r in rows))
+        self._pids = [self._pids[r] for r in rows]
+        self._rss_mb = array('d', (self._rss_mb[r] for r in rows))
+        self._cpu = array('d', (self._cpu[r] for r in rows))
+        self._apps = [self._apps[r] for r in rows]
+        self._name_keys = [self._name_keys[r] for r in rows]
+        self._version_keys = [self._version_keys[r] for r in rows]
+        self._search = [self._search[r] for r in rows]
+        self._row_of = {name: row for row, name in enumerate(self._names)}
+
+        new_row = {old: new for new, old in enumerate(rows)}
+        self._usage = {new_row[r]: usage for r, usage in self._usage.items() if r in new_row}
+        self._order = [new_row[r] for r in self._order if r in new_row]
+        self._set_visible([new_row[r] for r in self._visible if r in new_row])
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """
+    Paints the Stop / Uninstall buttons and handles clicks by hit-testing,
+    so the table needs no per-row widgets.
+    """
+    clicked = Signal(int, int)  # row, column
+
+    BUTTON_WIDTH = 30
+    BUTTON_HEIGHT = 24
+
+    def __init__(self, icon_type, color_base, color_hover, parent=None):
+        super().__init__(parent)
+        self.icon_type = icon_type
+        self.color_base = QColor(color_base) if color_base != "transparent" else QColor(0, 0, 0, 0)
+        self.color_hover = QColor(color_hover)
+        self._icon = None
+
+    def button_rect(self, cell_rect):
+        return QRect(cell_rect.center().x() - self.BUTTON_WIDTH // 2 + 1,
+                     cell_rect.center().y() - self.BUTTON_HEIGHT // 2 + 1,
+                     self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+
+    def paint(self, painter, option, index):
+        if not index.data(ActionRole):
+            super().paint(painter, option, index)
+            return
+
+        if self._icon is None:
+            self._icon = QApplication.style().standardIcon(self.icon_type)
+
+        rect = self.button_rect(option.rect)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor("#dddddd")))
+        painter.setBrush(self.color_hover if hovered else self.color_base)
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 4, 4)
+        self._icon.paint(painter, rect.adjusted(7, 4, -7, -4))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and index.data(ActionRole)
+                and self.button_rect(option.rect).contains(event.position().toPoint())):
+            self.clicked.emit(index.row(), index.column())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -1,25 +1,58 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QProgressBar, QScrollArea, QSizePolicy
-from PySide6.QtCore import Qt, QTimer
-import psutil
-from core.system_info import SystemInfo
-from core.memory_opt import MemoryOptimizer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFrame, QProgressBar, QScrollArea, QSizePolicy
+from PySide6.QtCore import Qt, QTimer, QEvent
+import time
+from core.memory_history import MemoryHistory
+from core.memory_opt import REFAULT_DELAY_MS
+from core.app_usage import AppUsageAggregator, default_usage
+from core.footprint_sampler import FootprintSampler, default_footprint
+from core.leak_detector import LeakDetector
+from core.process_sampler import default_sampler
+from core.trim_policy import ActivityTracker
+from ui.dashboard_sampler import DashboardSampler
+from ui.optimize_runner import OptimizeRunner
+from ui.sparkline import Sparkline
+from ui.running_apps import RunningAppsPanel, TopProcessTracker, TOP_N
 from ui.styles import ModernStyles
 
 class Dashboard(QWidget):
-    def __init__(self):
+    def __init__(self, sampler=None):
         super().__init__()
+        # Process table pass shared with AppList and MemoryOptimizer
+        self.sampler = sampler if sampler is not None else default_sampler()
+        # Per-application totals, and USS/PSS read a few processes per pass
+        if sampler is None:
+            self.usage = default_usage()
+            self.footprint = default_footprint()
+        else:
+            self.usage = AppUsageAggregator()
+            self.footprint = FootprintSampler()
+            self.sampler.subscribe(self.usage.update)
+            self.sampler.subscribe(self.footprint.update)
         # State for minimizing unnecessary UI updates
         self._current_bar_color = None
         self._last_mem_details = None
-        self._refresh_counter = 0
-        self._top_process_snapshot = ([], 0)
+        self._last_total_text = None
+        self._top_tracker = TopProcessTracker(TOP_N)
+        self._watched_window = None
+        self.last_opt_report = None
+        # CPU activity per process, so the trim policy can prefer idle ones
+        self.activity = ActivityTracker()
+        self.sampler.subscribe(self.activity.update)
+        self.optimizer = OptimizeRunner(self)
+        self.optimizer.progress.connect(self._on_optimize_progress)
+        self.optimizer.finished.connect(self._on_optimize_finished)
+        self.optimizer.refault_measured.connect(self._on_refault_measured)
+        # Bounded history of every sample (system memory and top processes)
+        self.history = MemoryHistory(top_n=TOP_N)
+        # Applications whose memory keeps growing get a badge
+        self.growth = LeakDetector()
 
         self.init_ui()
         
-        # Timer for auto-refresh
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_stats)
-        self.timer.start(3000) # Every 3 seconds
+        # Auto-refresh: sampled on a worker thread, at an adaptive interval
+        self.stats_sampler = DashboardSampler(self.sampler, self.usage, self.footprint, self.growth, self)
+        self.stats_sampler.sample_ready.connect(self._apply_sample)
+        self.stats_sampler.start()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -56,6 +89,11 @@ class Dashboard(QWidget):
         """)
         card_layout.addWidget(self.mem_bar)
         
+        # Memory in use over the kept history
+        self.mem_sparkline = Sparkline(self.history.percent, value_range=(0, 100))
+        self.mem_sparkline.setToolTip(f"Memory in use (%), last {self.history.capacity} samples")
+        card_layout.addWidget(self.mem_sparkline)
+        
         # Details label
         self.mem_details = QLabel("Total: - GB | Available: - GB")
         self.mem_details.setStyleSheet("color: #606060; border: none; font-size: 11px;")
@@ -68,6 +106,13 @@ class Dashboard(QWidget):
         self.opt_btn.clicked.connect(self.run_optimization)
         card_layout.addWidget(self.opt_btn)
         
+        # Measured result of the last optimize run
+        self.opt_report_lbl = QLabel()
+        self.opt_report_lbl.setStyleSheet("color: #606060; border: none; font-size: 11px;")
+        self.opt_report_lbl.setWordWrap(True)
+        self.opt_report_lbl.hide()
+        card_layout.addWidget(self.opt_report_lbl)
+        
         layout.addWidget(mem_card)
         
         # Running Apps Card
@@ -88,10 +133,8 @@ class Dashboard(QWidget):
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("border: none; background: transparent;")
         
-        self.running_list_widget = QWidget()
-        self.running_list_layout = QVBoxLayout(self.running_list_widget)
-        self.running_list_layout.setSpacing(4)
-        self.running_list_layout.setContentsMargins(0, 0, 0, 0)
+        # Recycled row slots; only changed labels are touched on each tick
+        self.running_list_widget = RunningAppsPanel(TOP_N)
         
         scroll.setWidget(self.running_list_widget)
         running_layout.addWidget(scroll)
@@ -103,132 +146,143 @@ class Dashboard(QWidget):
         running_layout.addWidget(self.total_mem_label)
         
         layout.addWidget(running_card)
-        
-        self.refresh_stats()
 
     def refresh_stats(self):
-        # increment tick counter; used to throttle some expensive updates
-        self._refresh_counter += 1
-        try:
-            info = SystemInfo.get_memory_info()
-            percent = int(info['percent'])
-            total_gb = round(info['total'] / (1024**3), 2)
-            avail_gb = round(info['available'] / (1024**3), 2)
-            
-            self.mem_bar.setValue(percent)
-            details_text = f"Total: {total_gb} GB  |  Available: {avail_gb} GB"
-            if details_text != self._last_mem_details:
-                self.mem_details.setText(details_text)
-                self._last_mem_details = details_text
-            
-            # Change color if high usage
-            if percent > 80:
-                color = ModernStyles.danger_color
-            else:
-                color = ModernStyles.accent_color
-                
-            # Only reapply stylesheet when color actually changes (reduce repaints)
-            if color != self._current_bar_color:
-                self.mem_bar.setStyleSheet(f"""
-                    QProgressBar {{
-                        border: 1px solid #e0e0e0;
-                        border-radius: 6px;
-                        text-align: center;
-                        height: 24px;
-                        background-color: #f0f0f0;
-                    }}
-                    QProgressBar::chunk {{
-                        background-color: {color};
-                        border-radius: 5px;
-                    }}
-                """)
-                self._current_bar_color = color
-            
-            # Update running apps list every other tick to reduce overhead.
-            # Intent: update on the 1st tick and then every 2 ticks -> ticks 1,3,5,...
-            if self._refresh_counter % 2 == 1:
-                self._update_running_apps()
-            
-        except Exception:
-            pass
-
-    def _update_running_apps(self):
-        """Update the running apps memory list"""
-        # Clear existing items
-        while self.running_list_layout.count():
-            child = self.running_list_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Get top memory-consuming processes
-        try:
-            procs = []
-            for p in psutil.process_iter(['name', 'memory_info'], ad_value=None):
-                # protect against processes that vanish or deny access while iterating
-                try:
-                    mem_info = p.info.get('memory_info')
-                    name = p.info.get('name')
-                    # mem_info can be None (ad_value) or name can be None/empty
-                    if mem_info is None or not name:
-                        continue
-
-                    mem_mb = mem_info.rss / (1024 * 1024)
-                    if mem_mb > 10:  # Only show apps using > 10 MB
-                        procs.append({
-                            'name': name,
-                            'mem_mb': mem_mb
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    # process disappeared or cannot be accessed — skip it
-                    continue
-            
-            # Sort by memory and take top 10
-            procs.sort(key=lambda x: x['mem_mb'], reverse=True)
-            top_procs = procs[:10]
-            
-            snapshot = ([(p['name'], round(p['mem_mb'], 1)) for p in top_procs],
-                        round(sum(p['mem_mb'] for p in top_procs), 1))
-            if snapshot == self._top_process_snapshot:
-                return
-            self._top_process_snapshot = snapshot
-            
-            for proc in top_procs:
-                row = QWidget()
-                row_layout = QHBoxLayout(row)
-                row_layout.setContentsMargins(4, 2, 4, 2)
-                row_layout.setSpacing(8)
-                
-                name_lbl = QLabel(proc['name'])
-                name_lbl.setStyleSheet("border: none; font-size: 11px;")
-                name_lbl.setFixedWidth(120)
-                name_lbl.setToolTip(proc['name'])
-                row_layout.addWidget(name_lbl)
-                
-                mem_lbl = QLabel(f"{proc['mem_mb']:,.0f} MB")
-                mem_lbl.setStyleSheet(f"border: none; color: {ModernStyles.accent_color}; font-size: 11px; font-weight: bold;")
-                mem_lbl.setAlignment(Qt.AlignRight)
-                row_layout.addWidget(mem_lbl)
-                
-                self.running_list_layout.addWidget(row)
-            
-            # Calculate total memory from top 10
-            total_mem = sum(p['mem_mb'] for p in top_procs)
-            self.total_mem_label.setText(f"Top 10 Total: {total_mem:,.0f} MB")
-            
-            # Add stretch at the end
-            self.running_list_layout.addStretch()
+        """Requests an immediate sample; the UI updates when it arrives"""
+        self.stats_sampler.request()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Minimizing does not hide child widgets, so watch the top-level window too
+        window = self.window()
+        if window is not self._watched_window:
+            if self._watched_window is not None:
+                self._watched_window.removeEventFilter(self)
+            window.installEventFilter(self)
+            self._watched_window = window
+        self.stats_sampler.set_active(not window.isMinimized())
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.stats_sampler.set_active(False)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched_window and event.type() == QEvent.WindowStateChange:
+            self.stats_sampler.set_active(self.isVisible() and not obj.isMinimized())
+        return False
+
+    def _apply_sample(self, sample):
+        info = sample['memory']
+        self.history.record(time.time(), info, sample['processes'])
+        self.mem_sparkline.refresh()
+        percent = int(info['percent'])
+        total_gb = round(info['total'] / (1024**3), 2)
+        avail_gb = round(info['available'] / (1024**3), 2)
+        
+        self.mem_bar.setValue(percent)
+        details_text = f"Total: {total_gb} GB  |  Available: {avail_gb} GB"
+        if details_text != self._last_mem_details:
+            self.mem_details.setText(details_text)
+            self._last_mem_details = details_text
+        
+        # Change color if high usage
+        if percent > 80:
+            color = ModernStyles.danger_color
+        else:
+            color = ModernStyles.accent_color
             
-        except Exception:
-            pass
+        # Only reapply stylesheet when color actually changes (reduce repaints)
+        if color != self._current_bar_color:
+            self.mem_bar.setStyleSheet(f"""
+                QProgressBar {{
+                    border: 1px solid #e0e0e0;
+                    border-radius: 6px;
+                    text-align: center;
+                    height: 24px;
+                    background-color: #f0f0f0;
+                }}
+                QProgressBar::chunk {{
+                    background-color: {color};
+                    border-radius: 5px;
+                }}
+            """)
+            self._current_bar_color = color
+        
+        self._update_running_apps(sample['apps'], sample['footprints'], sample['trends'])
+
+    def _update_running_apps(self, apps, footprints=None, trends=None):
+        """
+        Update the running apps memory list from [AppUsage, ...]; rows get
+        the USS/PSS of footprints ({AppUsage.key: AppFootprint}) as tooltip,
+        and a badge when trends ({AppUsage.key: Trend}) flags a leak.
+        """
+        # Top 10 by memory, with hysteresis so jitter does not rewrite rows.
+        # Groups are keyed by app, so a restarted process keeps its row.
+        labels = {usage.key: f"{usage.name} ({usage.count})" if usage.count > 1 else usage.name
+                  for usage in apps}
+        top_procs = self._top_tracker.update(
+            (usage.key, labels[usage.key], usage.rss / (1024 * 1024)) for usage in apps)
+        tips = {labels[key]: f"{labels[key]}\n{footprint.describe()}"
+                for key, footprint in (footprints or {}).items()}
+        badges = {}
+        for key, trend in (trends or {}).items():
+            if trend is not None and trend.leaking:
+                badges[labels[key]] = f"▲ {trend.rate_mb_min:,.0f} MB/min"
+                tips[labels[key]] = (f"{tips.get(labels[key], labels[key])}\n"
+                                     f"Growing {trend.rate_mb_min:,.1f} MB/min "
+                                     f"for {trend.growing_s / 60:.0f} min")
+        self.running_list_widget.set_rows([(name, mb, tips.get(name), badges.get(name))
+                                           for name, mb in top_procs])
+
+        total_text = f"Top 10 Total: {sum(mb for _, mb in top_procs):,.0f} MB"
+        if total_text != self._last_total_text:
+            self.total_mem_label.setText(total_text)
+            self._last_total_text = total_text
 
     def run_optimization(self):
-        self.opt_btn.setEnabled(False)
-        self.opt_btn.setText("Optimizing...")
-        QTimer.singleShot(100, self._optimize_task)
-        
-    def _optimize_task(self):
-        success, fail = MemoryOptimizer.optimize_memory()
-        self.opt_btn.setText(f"Done! ({success} apps optimized)")
-        self.refresh_stats()
+        # A second click while running cancels the run
+        if self.optimizer.is_running():
+            self.optimizer.cancel()
+            self.opt_btn.setEnabled(False)
+            self.opt_btn.setText("Cancelling...")
+            return
+        self.optimizer.start(self.sampler, self.activity)
+        self.opt_btn.setText("Optimizing... (click to cancel)")
+
+    def _on_optimize_progress(self, done, total):
+        if self.optimizer.is_running() and self.opt_btn.isEnabled():
+            self.opt_btn.setText(f"Optimizing {done}/{total}... (click to cancel)")
+
+    def _on_optimize_finished(self, report):
+        self.last_opt_report = report
+        trimmed_mb = report.trimmed_bytes / (1024 * 1024)
+        self.opt_btn.setText(f"Done! ({trimmed_mb:,.0f} MB trimmed)")
+        self._show_opt_report(report)
+        # Sample faster for a while to show the effect
+        self.stats_sampler.boost()
+        QTimer.singleShot(REFAULT_DELAY_MS, lambda: self._measure_refault(report))
         QTimer.singleShot(2000, lambda: self.opt_btn.setText("🚀 Optimize Memory"))
         self.opt_btn.setEnabled(True)
+
+    def _measure_refault(self, report):
+        if report is self.last_opt_report:
+            self.optimizer.measure_refault(report)
+
+    def _on_refault_measured(self, report):
+        if report is self.last_opt_report:
+            self._show_opt_report(report)
+
+    def _show_opt_report(self, report):
+        mb = 1024 * 1024
+        text = (f"Trimmed {report.trimmed_bytes / mb:,.0f} MB from {report.success_count} processes "
+                f"({report.fail_count} denied, {report.skipped_count} not reached) "
+                f"in {report.duration_ms / 1000:.1f} s; "
+                f"available memory {report.reclaimed_bytes / mb:+,.0f} MB.")
+        if report.cancelled:
+            text += " Cancelled."
+        if report.refault_rate is not None:
+            text += f" {report.refault_rate:.0%} paged back in after {REFAULT_DELAY_MS // 1000} s."
+        self.opt_report_lbl.setText(text)
+        self.opt_report_lbl.setToolTip("\n".join(f"{p.name}: {p.trimmed / mb:,.1f} MB"
+                                                  for p in report.top()))
+        self.opt_report_lbl.show()
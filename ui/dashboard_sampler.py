@@ -0,0 +1,203 @@
+import time
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from core.system_info import SystemInfo
+
+# Refresh intervals (ms): normal, while the window is hidden or minimized,
+# and for a short while after an optimize run
+BASE_INTERVAL_MS = 3000
+HIDDEN_INTERVAL_MS = 15000
+BOOST_INTERVAL_MS = 1000
+BOOST_SECONDS = 10
+# Samples slower than this double the interval (up to MAX_BACKOFF times);
+# samples under half of it halve it again
+SAMPLE_BUDGET_MS = 250
+MAX_BACKOFF = 8
+# Processes below this are left out of the memory history
+MIN_PROCESS_MB = 10
+# Applications handed to the running-apps list per sample (it shows the top
+# ones, with the rest as candidates to rank against), and the least memory
+# an application needs to be among them
+MAX_APPS = 20
+MIN_APP_MB = 10
+
+
+class _SampleSignals(QObject):
+    done = Signal(dict)
+    failed = Signal(str)
+
+
+class _SampleTask(QRunnable):
+    """
+    One sample: system memory plus a process-table pass, off the GUI thread.
+    The pass also updates the per-application totals and USS/PSS readings
+    (its subscribers run before sample() returns), so they are read in the
+    same task, and the totals are fed to the growth (leak) detector.
+    """
+
+    def __init__(self, sampler, usage, footprint, growth, signals):
+        super().__init__()
+        self.sampler = sampler
+        self.usage = usage
+        self.footprint = footprint
+        self.growth = growth
+        self.signals = signals
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            memory = SystemInfo.get_memory_info()
+            snapshot = self.sampler.sample()
+            processes = [(p.pid, p.name, p.rss / (1024 * 1024)) for p in snapshot
+                         if p.name and p.rss is not None and p.rss > MIN_PROCESS_MB * 1024 * 1024]
+            if self.growth is not None:
+                # Every application, so growth is tracked below the top ones too
+                every_app = self.usage.top()
+                # An app's age is that of its oldest process
+                self.growth.observe(snapshot.taken_at, ((u.key, u.name, u.rss, snapshot.started_at(u.pids))
+                                                        for u in every_app))
+                apps = [u for u in every_app[:MAX_APPS] if u.rss >= MIN_APP_MB * 1024 * 1024]
+                trends = {u.key: self.growth.trend(u.key) for u in apps}
+            else:
+                apps = self.usage.top(MAX_APPS, min_rss=MIN_APP_MB * 1024 * 1024)
+                trends = {}
+            footprints = ({usage.key: self.footprint.summarize(usage.pids) for usage in apps}
+                          if self.footprint is not None else {})
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        self.signals.done.emit({
+            "memory": memory,
+            "processes": processes,
+            "apps": apps,
+            "footprints": footprints,
+            "trends": trends,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+        })
+
+
+class DashboardSampler(QObject):
+    """
+    Periodic Dashboard sampling on a worker thread.
+    Only finished samples reach the GUI thread (sample_ready). The interval
+    adapts: slower while the Dashboard is not visible, faster right after an
+    optimize run (boost()), and backed off while samples exceed the budget.
+    A tick that fires while the previous sample is still running is skipped.
+    """
+    sample_ready = Signal(dict)
+    sample_failed = Signal(str)
+
+    def __init__(self, process_sampler, usage, footprint=None, growth=None, parent=None):
+        super().__init__(parent)
+        self.process_sampler = process_sampler
+        # AppUsageAggregator and FootprintSampler subscribed to process_sampler
+        self.usage = usage
+        self.footprint = footprint
+        # LeakDetector fed with the per-application totals of every sample
+        self.growth = growth
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _SampleSignals()
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+        self._in_flight = False
+        self._active = True
+        self._boost_until = 0.0
+        self._backoff = 1
+        self._last_sample_at = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.request)
+        self.timer.setInterval(BASE_INTERVAL_MS)
+
+        self.samples = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def start(self):
+        self.request()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def request(self):
+        """Starts a sample now unless one is still running (counted as skipped)"""
+        if self._in_flight:
+            self.skipped += 1
+            return False
+        self._in_flight = True
+        self.pool.start(_SampleTask(self.process_sampler, self.usage, self.footprint, self.growth, self._signals))
+        return True
+
+    def set_active(self, active):
+        """Called when the Dashboard is shown/hidden or the window (un)minimized"""
+        if active == self._active:
+            return
+        self._active = active
+        self._reschedule()
+        # Coming back: don't show data up to HIDDEN_INTERVAL_MS old
+        if active and time.monotonic() - self._last_sample_at > BASE_INTERVAL_MS / 1000:
+            self.request()
+
+    def boost(self):
+        """Samples faster for BOOST_SECONDS (e.g. to show the effect of an optimize run)"""
+        self._boost_until = time.monotonic() + BOOST_SECONDS
+        self._reschedule()
+        self.request()
+
+    def interval_ms(self):
+        if not self._active:
+            base = HIDDEN_INTERVAL_MS
+        elif time.monotonic() < self._boost_until:
+            base = BOOST_INTERVAL_MS
+        else:
+            base = BASE_INTERVAL_MS
+        return base * self._backoff
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def stats(self):
+        return {
+            "samples": self.samples,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_ms": self.last_ms,
+            "avg_ms": self.total_ms / self.samples if self.samples else 0.0,
+            "max_ms": self.max_ms,
+            "interval_ms": self.timer.interval(),
+            "backoff": self._backoff,
+        }
+
+    def _reschedule(self):
+        interval = self.interval_ms()
+        if interval != self.timer.interval():
+            # setInterval restarts a running timer, so only touch it on change
+            self.timer.setInterval(interval)
+
+    def _on_done(self, sample):
+        self._in_flight = False
+        self._last_sample_at = time.monotonic()
+        duration = sample["duration_ms"]
+        self.samples += 1
+        self.last_ms = duration
+        self.max_ms = max(self.max_ms, duration)
+        self.total_ms += duration
+        if duration > SAMPLE_BUDGET_MS:
+            self._backoff = min(self._backoff * 2, MAX_BACKOFF)
+        elif duration < SAMPLE_BUDGET_MS / 2 and self._backoff > 1:
+            self._backoff //= 2
+        self._reschedule()
+        self.sample_ready.emit(sample)
+
+    def _on_failed(self, message):
+        self._in_flight = False
+        self.errors += 1
+        self.last_error = message
+        self._reschedule()
+        self.sample_failed.emit(message)
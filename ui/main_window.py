@@ -1,13 +1,26 @@
 import sys
 from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Signal
+from core.startup_profiler import default_profiler
 from ui.dashboard import Dashboard
-from ui.app_list import AppList
 from ui.styles import ModernStyles
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    """
+    With defer_app_list (the default) the window shell and Dashboard are
+    shown first; the app list module (psutil, icon machinery) is imported
+    and built right after the first paint. Startup phases are recorded on
+    the profiler; startup_finished fires once the window has painted and
+    the first app scan has completed.
+    """
+    startup_finished = Signal()
+
+    def __init__(self, defer_app_list=True, profiler=None):
         super().__init__()
+        self.profiler = profiler if profiler is not None else default_profiler()
+        self.app_list = None
+        self._painted = False
+        self._scanned = False
         self.setWindowTitle("DustOff - Windows Manager")
         self.resize(1100, 800)
         self.setStyleSheet(ModernStyles.get_main_style())
@@ -32,7 +45,8 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(title)
         
         # Dashboard Component
-        self.dashboard = Dashboard()
+        with self.profiler.phase("dashboard"):
+            self.dashboard = Dashboard()
         left_layout.addWidget(self.dashboard)
         
         left_layout.addStretch()
@@ -47,12 +61,14 @@ class MainWindow(QMainWindow):
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.app_list = AppList()
         # Wrap in card style
         app_list_container = QFrame()
         app_list_container.setStyleSheet(ModernStyles.card_style())
-        cont_layout = QVBoxLayout(app_list_container)
-        cont_layout.addWidget(self.app_list)
+        self.app_list_layout = QVBoxLayout(app_list_container)
+        self.app_list_placeholder = QLabel("Loading applications...")
+        self.app_list_placeholder.setAlignment(Qt.AlignCenter)
+        self.app_list_placeholder.setStyleSheet(f"color: {ModernStyles.text_secondary};")
+        self.app_list_layout.addWidget(self.app_list_placeholder)
         
         right_layout.addWidget(app_list_container)
         
@@ -60,6 +76,45 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(left_panel, 1) # 1/3 width
         main_layout.addWidget(right_panel, 2) # 2/3 width
 
+        if not defer_app_list:
+            self.build_app_list()
+
+    def build_app_list(self):
+        """Imports and builds the AppList (once), which starts the first scan"""
+        if self.app_list is not None:
+            return
+        with self.profiler.phase("import app list"):
+            from ui.app_list import AppList
+        # The scan runs in the background from AppList's constructor on
+        self.profiler.begin("first scan")
+        with self.profiler.phase("app list"):
+            self.app_list = AppList()
+        self.app_list.pipeline.finished.connect(self._on_first_scan)
+        self.app_list_layout.replaceWidget(self.app_list_placeholder, self.app_list)
+        self.app_list_placeholder.deleteLater()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._painted:
+            return
+        self._painted = True
+        self.profiler.mark("first paint")
+        if self.app_list is None:
+            # Let this frame reach the screen before the heavy work starts
+            QTimer.singleShot(0, self.build_app_list)
+        self._check_startup_finished()
+
+    def _on_first_scan(self, stats):
+        if self._scanned:
+            return
+        self._scanned = True
+        self.profiler.end("first scan")
+        self._check_startup_finished()
+
+    def _check_startup_finished(self):
+        if self._painted and self._scanned:
+            self.startup_finished.emit()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
@@ -0,0 +1,82 @@
+import threading
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from core.memory_opt import MemoryOptimizer
+
+
+class _OptimizeSignals(QObject):
+    # done, total
+    progress = Signal(int, int)
+    # OptimizeReport
+    finished = Signal(object)
+    # OptimizeReport, with its re-fault figures filled in
+    refault_measured = Signal(object)
+
+
+class _OptimizeTask(QRunnable):
+    def __init__(self, sampler, activity, dry_run, cancel, signals):
+        super().__init__()
+        self.sampler = sampler
+        self.activity = activity
+        self.dry_run = dry_run
+        self.cancel = cancel
+        self.signals = signals
+
+    def run(self):
+        # Taken here: a fresh pass (and the subscribers it runs) would stall the GUI
+        snapshot = self.sampler.snapshot()
+        report = MemoryOptimizer.optimize(snapshot, activity=self.activity, dry_run=self.dry_run,
+                                          cancel=self.cancel, progress=self.signals.progress.emit)
+        self.signals.finished.emit(report)
+
+
+class _RefaultTask(QRunnable):
+    def __init__(self, report, signals):
+        super().__init__()
+        self.report = report
+        self.signals = signals
+
+    def run(self):
+        self.signals.refault_measured.emit(MemoryOptimizer.measure_refault(self.report))
+
+
+class OptimizeRunner(QObject):
+    """
+    Runs MemoryOptimizer.optimize() and measure_refault() off the GUI thread.
+    progress, finished and refault_measured are delivered on the GUI thread;
+    cancel() stops the run after the trims already in progress.
+    """
+    progress = Signal(int, int)
+    finished = Signal(object)
+    refault_measured = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancel = None
+        self._signals = _OptimizeSignals()
+        self._signals.progress.connect(self.progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.refault_measured.connect(self.refault_measured)
+
+    def is_running(self):
+        return self._cancel is not None
+
+    def start(self, sampler, activity=None, dry_run=False):
+        """Optimizes a snapshot of sampler (a ProcessSampler), taken on the worker thread"""
+        if self.is_running():
+            return False
+        self._cancel = threading.Event()
+        QThreadPool.globalInstance().start(
+            _OptimizeTask(sampler, activity, dry_run, self._cancel, self._signals))
+        return True
+
+    def measure_refault(self, report):
+        """Re-reads the trimmed working sets; refault_measured(report) follows"""
+        QThreadPool.globalInstance().start(_RefaultTask(report, self._signals))
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def _on_finished(self, report):
+        self._cancel = None
+        self.finished.emit(report)
@@ -0,0 +1,133 @@
+import time
+import psutil
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+# How often the PID list is compared while the app list is shown; listing
+# PIDs is cheap, so a full pass is only taken when the set changed...
+PROBE_INTERVAL_MS = 1000
+# ...or the Memory and CPU columns are due for a refresh
+USAGE_INTERVAL_MS = 3000
+
+
+class _ProbeSignals(QObject):
+    done = Signal(object, bool)  # frozenset of PIDs, whether a pass was taken
+
+
+class _ProbeTask(QRunnable):
+    """Lists PIDs and, if they changed or usage is due, takes a pass; off the GUI thread"""
+
+    def __init__(self, sampler, known_pids, usage_due, max_age, signals):
+        super().__init__()
+        self.sampler = sampler
+        self.known_pids = known_pids
+        self.usage_due = usage_due
+        self.max_age = max_age
+        self.signals = signals
+
+    def run(self):
+        pids = self.known_pids
+        sampled = False
+        try:
+            pids = frozenset(psutil.pids())
+            if pids != self.known_pids:
+                # Processes started or exited: a pass from before that is stale
+                self.sampler.snapshot(max_age=0)
+                sampled = True
+            elif self.usage_due:
+                self.sampler.snapshot(max_age=self.max_age)
+                sampled = True
+        finally:
+            self.signals.done.emit(pids, sampled)
+
+
+class ProcessWatcher(QObject):
+    """
+    Keeps the app list's running status and usage columns current without
+    rescanning: every PROBE_INTERVAL_MS it compares the PID set, and only
+    when it changed (or usage is due) the shared sampler takes a pass,
+    which updates the AppUsageAggregator. Then it publishes which installed
+    apps run with which PIDs (status_ready, plus app_started/app_stopped for
+    the apps whose state flipped) and their totals (usage_ready).
+    A pass someone else took recently (e.g. the Dashboard's) is reused for
+    usage. Only runs while active; refresh() probes at once (e.g. after a kill).
+    """
+    status_ready = Signal(dict)  # {app_name: [pid, ...]} for every running app
+    usage_ready = Signal(dict)  # {app_name: AppUsage}
+    app_started = Signal(str)
+    app_stopped = Signal(str)
+
+    def __init__(self, sampler, usage, probe_interval_ms=PROBE_INTERVAL_MS,
+                 usage_interval_ms=USAGE_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        self.usage = usage
+        self.usage_interval_ms = usage_interval_ms
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _ProbeSignals()
+        self._signals.done.connect(self._on_probe)
+        self._in_flight = False
+        self._pending = False
+        self._pids = frozenset()
+        self._running = set()  # app names running at the last publish
+        self._last_pass_at = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(probe_interval_ms)
+        self.timer.timeout.connect(self.request)
+
+        self.probes = 0
+        self.passes = 0
+
+    def set_active(self, active):
+        if active and not self.timer.isActive():
+            self.request()
+            self.timer.start()
+        elif not active:
+            self.timer.stop()
+
+    def request(self):
+        """Probes now unless a probe is still running"""
+        if self._in_flight:
+            return False
+        self._in_flight = True
+        usage_due = time.monotonic() - self._last_pass_at >= self.usage_interval_ms / 1000
+        # Slightly under the interval, so a pass from the previous refresh is not reused
+        max_age = self.usage_interval_ms / 1000 * 0.9
+        self.pool.start(_ProbeTask(self.sampler, self._pids, usage_due, max_age, self._signals))
+        return True
+
+    def refresh(self):
+        """Probes as soon as possible, queued behind a probe in flight"""
+        if not self.request():
+            self._pending = True
+
+    def publish(self):
+        """Emits the current status and totals now, without waiting for a pass"""
+        usages = self.usage.installed_usage()
+        running = set(usages)
+        for name in sorted(running - self._running):
+            self.app_started.emit(name)
+        for name in sorted(self._running - running):
+            self.app_stopped.emit(name)
+        self._running = running
+        self.status_ready.emit({name: sorted(usage.pids) for name, usage in usages.items()})
+        self.usage_ready.emit(usages)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def stats(self):
+        return {"probes": self.probes, "passes": self.passes, "running_apps": len(self._running)}
+
+    def _on_probe(self, pids, sampled):
+        self._in_flight = False
+        self._pids = pids
+        self.probes += 1
+        if sampled:
+            self.passes += 1
+            self._last_pass_at = time.monotonic()
+            self.publish()
+        if self._pending:
+            self._pending = False
+            self.request()
@@ -0,0 +1,148 @@
+import heapq
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PySide6.QtCore import Qt
+from ui.styles import ModernStyles
+
+# Rows shown in the panel; their widgets are created once and recycled
+TOP_N = 10
+# A row keeps its displayed value until it moves by more than
+# max(HYSTERESIS_MB, HYSTERESIS_RATIO * value)
+HYSTERESIS_MB = 2.0
+HYSTERESIS_RATIO = 0.02
+
+
+class TopProcessTracker:
+    """
+    Turns raw (key, name, mb) samples into a stable top-N list; key identifies
+    a row across samples (a PID, or an AppUsage key for application totals).
+    Each row keeps its displayed value until it moves past the hysteresis
+    threshold, and ranking uses the displayed values, so small fluctuations
+    neither rewrite labels nor swap neighbouring rows.
+    """
+
+    def __init__(self, top_n=TOP_N, hysteresis_mb=HYSTERESIS_MB, hysteresis_ratio=HYSTERESIS_RATIO):
+        self.top_n = top_n
+        self.hysteresis_mb = hysteresis_mb
+        self.hysteresis_ratio = hysteresis_ratio
+        self._shown = {}  # app key -> displayed mb
+        self._rank = {}  # app key -> row in the previous result (ties keep their order)
+
+    def update(self, samples):
+        """
+        samples: [(app key, name, mb), ...]; returns [(name, mb), ...] for the
+        top rows, largest first
+        """
+        shown = {}
+        names = {}
+        for key, name, mb in samples:
+            prev = self._shown.get(key)
+            if prev is not None and abs(mb - prev) <= max(self.hysteresis_mb, prev * self.hysteresis_ratio):
+                mb = prev
+            shown[key] = mb
+            names[key] = name
+        self._shown = shown
+
+        last = len(self._rank)
+        top = heapq.nlargest(self.top_n, shown,
+                             key=lambda key: (shown[key], -self._rank.get(key, last)))
+        self._rank = {key: row for row, key in enumerate(top)}
+        return [(names[key], shown[key]) for key in top]
+
+
+class _RowSlot:
+    """One recycled row: a container with a name, a growth badge and a memory label"""
+
+    def __init__(self, parent):
+        self.widget = QWidget(parent)
+        row_layout = QHBoxLayout(self.widget)
+        row_layout.setContentsMargins(4, 2, 4, 2)
+        row_layout.setSpacing(8)
+
+        self.name_lbl = QLabel()
+        self.name_lbl.setStyleSheet("border: none; font-size: 11px;")
+        self.name_lbl.setFixedWidth(120)
+        row_layout.addWidget(self.name_lbl)
+
+        # Shown while the app's memory keeps growing (see LeakDetector)
+        self.badge_lbl = QLabel()
+        self.badge_lbl.setStyleSheet(f"border: none; color: {ModernStyles.danger_color}; font-size: 10px; font-weight: bold;")
+        self.badge_lbl.hide()
+        row_layout.addWidget(self.badge_lbl)
+
+        self.mem_lbl = QLabel()
+        self.mem_lbl.setStyleSheet(f"border: none; color: {ModernStyles.accent_color}; font-size: 11px; font-weight: bold;")
+        self.mem_lbl.setAlignment(Qt.AlignRight)
+        row_layout.addWidget(self.mem_lbl)
+
+        self.name = None
+        self.mem_text = None
+        self.tooltip = None
+        self.badge = None
+        self.widget.hide()
+
+
+class RunningAppsPanel(QWidget):
+    """
+    Fixed pool of process rows. set_rows() only rewrites labels whose text
+    changed and hides slots that are not needed; reordering is a text update,
+    never a widget rebuild.
+    """
+
+    def __init__(self, slots=TOP_N, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(4)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._slots = [_RowSlot(self) for _ in range(slots)]
+        for slot in self._slots:
+            layout.addWidget(slot.widget)
+        layout.addStretch()
+
+        self.widgets_created = slots * 4
+        self.updates = 0
+        self.label_updates = 0
+        self.visibility_changes = 0
+
+    def set_rows(self, rows):
+        """
+        rows: [(name, mb), ...], optionally followed by a tooltip and a badge
+        text per row; extra rows beyond the pool are ignored
+        """
+        self.updates += 1
+        for i, slot in enumerate(self._slots):
+            if i >= len(rows):
+                if not slot.widget.isHidden():
+                    slot.widget.hide()
+                    self.visibility_changes += 1
+                continue
+
+            name, mb, tooltip, badge = (*rows[i], None, None)[:4]
+            tooltip = tooltip or name
+            if name != slot.name:
+                slot.name = name
+                slot.name_lbl.setText(name)
+                self.label_updates += 1
+            if tooltip != slot.tooltip:
+                slot.tooltip = tooltip
+                slot.widget.setToolTip(tooltip)
+            if badge != slot.badge:
+                slot.badge = badge
+                slot.badge_lbl.setText(badge or "")
+                slot.badge_lbl.setVisible(badge is not None)
+                self.label_updates += 1
+            mem_text = f"{mb:,.0f} MB"
+            if mem_text != slot.mem_text:
+                slot.mem_text = mem_text
+                slot.mem_lbl.setText(mem_text)
+                self.label_updates += 1
+            if slot.widget.isHidden():
+                slot.widget.show()
+                self.visibility_changes += 1
+
+    def stats(self):
+        return {
+            "widgets_created": self.widgets_created,
+            "updates": self.updates,
+            "label_updates": self.label_updates,
+            "visibility_changes": self.visibility_changes,
+        }
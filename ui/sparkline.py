@@ -0,0 +1,93 @@
+from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap
+from PySide6.QtCore import Qt, QPointF
+from ui.styles import ModernStyles
+
+
+class Sparkline(QWidget):
+    """
+    Compact chart of a SeriesHistory: one pixel column per downsampled point,
+    a min..max band with the average drawn over it, newest on the right.
+    The x axis is sample order, not time: samples taken faster (boost) take
+    more room, and pauses (window hidden) leave no gap.
+    The chart is kept in a pixmap. When only new points arrived (same size,
+    level and value range) the pixmap is scrolled left and just the new
+    columns are drawn; anything else triggers a full redraw.
+    """
+
+    def __init__(self, series, span=None, value_range=None, color=None, parent=None):
+        super().__init__(parent)
+        self.series = series
+        self.span = span
+        self.value_range = value_range  # fixed (lo, hi), or None to fit the data
+        self.color = QColor(color or ModernStyles.accent_color)
+        self.band_color = QColor(self.color)
+        self.band_color.setAlpha(70)
+        self.setMinimumHeight(36)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self._pixmap = None
+        self._drawn = None  # (factor, end, range) of what the pixmap shows
+        self.full_redraws = 0
+        self.incremental_redraws = 0
+
+    def refresh(self):
+        """Call after appending to the series"""
+        if self.isVisible():
+            self._render()
+            self.update()
+
+    def paintEvent(self, event):
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._render()
+        QPainter(self).drawPixmap(0, 0, self._pixmap)
+
+    def _render(self):
+        width, height = self.width(), self.height()
+        if width <= 0 or height <= 0:
+            return
+        factor, end, mins, maxs, avgs = self.series.downsample(width, self.span)
+        if self.value_range is not None:
+            lo, hi = self.value_range
+        elif avgs:
+            lo, hi = min(mins), max(maxs)
+            pad = (hi - lo) * 0.1 or 1.0
+            lo, hi = lo - pad, hi + pad
+        else:
+            lo, hi = 0.0, 1.0
+
+        new_points = None
+        if (self._pixmap is not None and self._pixmap.size() == self.size()
+                and self._drawn is not None and self._drawn[0] == factor and self._drawn[2] == (lo, hi)):
+            new_points = end - self._drawn[1]
+        self._drawn = (factor, end, (lo, hi))
+
+        if new_points is None or not 0 <= new_points < width - 1:
+            self._pixmap = QPixmap(self.size())
+            first = 0
+            self.full_redraws += 1
+        else:
+            # Shift the old columns left; redraw the new ones plus the
+            # previous newest one, which may have been a partial bucket
+            self._pixmap.scroll(-new_points, 0, self._pixmap.rect())
+            first = max(0, len(avgs) - new_points - 1)
+            self.incremental_redraws += 1
+
+        n = len(avgs)
+        x0 = width - n
+        painter = QPainter(self._pixmap)
+        clear_from = x0 + first if first else 0
+        painter.fillRect(clear_from, 0, width - clear_from, height, self.palette().base())
+        scale = (height - 2) / (hi - lo) if hi > lo else 0.0
+
+        def y(value):
+            return height - 1 - (min(max(value, lo), hi) - lo) * scale
+
+        painter.setPen(QPen(self.band_color, 1))
+        for i in range(first, n):
+            painter.drawLine(QPointF(x0 + i, y(maxs[i])), QPointF(x0 + i, y(mins[i])))
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.color, 1.5))
+        for i in range(max(first, 1), n):
+            painter.drawLine(QPointF(x0 + i - 1, y(avgs[i - 1])), QPointF(x0 + i, y(avgs[i])))
+        painter.end()
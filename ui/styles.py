@@ -48,7 +48,7 @@ class ModernStyles:
                 font-weight: bold;
                 color: {ModernStyles.text_secondary};
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {ModernStyles.card_color};
                 border: 1px solid #e0e0e0;
                 border-radius: 8px;
@@ -56,6 +56,15 @@ class ModernStyles:
                 selection-color: white;
                 gridline-color: #f0f0f0;
             }}
+            QLineEdit {{
+                background-color: {ModernStyles.card_color};
+                border: 1px solid #e0e0e0;
+                border-radius: 6px;
+                padding: 6px 10px;
+            }}
+            QLineEdit:focus {{
+                border-color: {ModernStyles.accent_color};
+            }}
             QScrollArea {{
                 border: none;
                 background-color: transparent;
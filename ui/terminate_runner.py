@@ -0,0 +1,55 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from core.process_terminator import ProcessTerminator
+
+
+class _TerminateSignals(QObject):
+    # label, done, total
+    progress = Signal(str, int, int)
+    # label, TerminationReport
+    finished = Signal(str, object)
+
+
+class _TerminateTask(QRunnable):
+    def __init__(self, label, pids, names, signals):
+        super().__init__()
+        self.label = label
+        self.pids = pids
+        self.names = names
+        self.signals = signals
+
+    def run(self):
+        report = ProcessTerminator.terminate(
+            self.pids, self.names, progress=lambda done, total: self.signals.progress.emit(self.label, done, total))
+        self.signals.finished.emit(self.label, report)
+
+
+class TerminateRunner(QObject):
+    """
+    Runs ProcessTerminator.terminate() off the GUI thread, one run per label
+    (e.g. app name); runs for different labels proceed side by side.
+    progress and finished are delivered on the GUI thread.
+    """
+    progress = Signal(str, int, int)
+    finished = Signal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._running = set()
+        self._signals = _TerminateSignals()
+        self._signals.progress.connect(self.progress)
+        self._signals.finished.connect(self._on_finished)
+
+    def is_running(self, label):
+        return label in self._running
+
+    def start(self, label, pids, names=None):
+        """names: {pid: process name} as shown to the user, so reused PIDs are left alone"""
+        if label in self._running:
+            return False
+        self._running.add(label)
+        QThreadPool.globalInstance().start(_TerminateTask(label, list(pids), names, self._signals))
+        return True
+
+    def _on_finished(self, label, report):
+        self._running.discard(label)
+        self.finished.emit(label, report)
@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from PySide6.QtCore import QEvent, QObject, QTimer
+
+# Rows fetched beyond the viewport in the scroll direction, and behind it
+PREFETCH_ROWS = 30
+TRAILING_ROWS = 5
+# A scroll session ends after this much scroll inactivity
+SESSION_IDLE_MS = 500
+
+
+class ViewportIconLoader(QObject):
+    """
+    Requests icons only for the rows in or near the visible part of a table.
+    Prefetches ahead in the scroll direction and cancels queued decodes for
+    rows that have scrolled far away. Counters are kept per scroll session
+    (a burst of scrolling followed by SESSION_IDLE_MS of rest).
+    """
+
+    def __init__(self, view, model, icons, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.model = model
+        self.icons = icons
+        self._direction = 1
+        self._last_scroll_value = view.verticalScrollBar().value()
+
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self.update)
+        self._session_timer = QTimer(self)
+        self._session_timer.setSingleShot(True)
+        self._session_timer.setInterval(SESSION_IDLE_MS)
+        self._session_timer.timeout.connect(self._end_session)
+
+        # Work triggered before any scrolling (first paint, refreshes)
+        self.initial = self._new_session()
+        del self.initial["_started"]
+        self._session = None
+        self.sessions = deque(maxlen=20)
+
+        view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        # Resizing the view changes the scroll range and the visible rows
+        view.verticalScrollBar().rangeChanged.connect(self.schedule)
+        model.rowsInserted.connect(self.schedule)
+        model.modelReset.connect(self.schedule)
+        model.layoutChanged.connect(self.schedule)
+        # Nothing is loaded while the view is hidden or has no height, so
+        # catch up once it is shown or laid out
+        view.viewport().installEventFilter(self)
+
+    def schedule(self, *args):
+        """Coalesces bursts of model/scroll changes into one update"""
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Resize):
+            self.schedule()
+        return False
+
+    def visible_rows(self):
+        """
+        (first, last) visible rows, or None when the table is empty, hidden
+        or not laid out yet (no rows are visible then)
+        """
+        rows = self.model.rowCount()
+        height = self.view.viewport().height()
+        if rows == 0 or height <= 0 or not self.view.isVisible():
+            return None
+        first = self.view.rowAt(0)
+        last = self.view.rowAt(height - 1)
+        first = 0 if first < 0 else first
+        if last < 0:
+            # No row at the bottom edge: the table ends inside the viewport
+            per_viewport = height // max(1, self.view.verticalHeader().defaultSectionSize())
+            last = first + per_viewport
+        return first, min(last, rows - 1)
+
+    def update(self):
+        visible = self.visible_rows()
+        if visible is None:
+            return
+        first, last = visible
+        rows = self.model.rowCount()
+        if self._direction >= 0:
+            ahead = range(last + 1, min(rows, last + 1 + PREFETCH_ROWS))
+            behind = range(first - 1, max(-1, first - 1 - TRAILING_ROWS), -1)
+        else:
+            ahead = range(first - 1, max(-1, first - 1 - PREFETCH_ROWS), -1)
+            behind = range(last + 1, min(rows, last + 1 + TRAILING_ROWS))
+
+        # Visible rows first, then the prefetch window in scroll order
+        wanted = []
+        for rows_range in (range(first, last + 1), ahead, behind):
+            for row in rows_range:
+                icon_path = self.model.icon_path_at(row)
+                if icon_path:
+                    wanted.append(icon_path)
+
+        scheduled = sum(1 for icon_path in wanted if self.icons.request(icon_path))
+        cancelled = self.icons.retain(set(wanted))
+
+        counters = self._session if self._session is not None else self.initial
+        counters["icon_requests"] += scheduled
+        counters["cancelled"] += cancelled
+        counters["updates"] += 1
+
+    def stats(self):
+        return {"initial": dict(self.initial), "sessions": list(self.sessions),
+                "current": dict(self._session) if self._session else None}
+
+    def _on_scrolled(self, value):
+        if value != self._last_scroll_value:
+            self._direction = 1 if value > self._last_scroll_value else -1
+        self._last_scroll_value = value
+        if self._session is None:
+            self._session = self._new_session()
+        self._session["scroll_events"] += 1
+        self._session_timer.start()
+        self.schedule()
+
+    def _end_session(self):
+        if self._session is not None:
+            self._session["duration_ms"] = (time.perf_counter() - self._session.pop("_started")) * 1000
+            self.sessions.append(self._session)
+            self._session = None
+
+    @staticmethod
+    def _new_session():
+        return {"_started": time.perf_counter(), "scroll_events": 0, "updates": 0,
+                "icon_requests": 0, "cancelled": 0}